@@ -0,0 +1,123 @@
+# backend/app/admission.py
+import asyncio
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+from fastapi import Depends, HTTPException
+
+from .config import app_settings
+
+
+class Overloaded(HTTPException):
+    def __init__(self, route: str, reason: str) -> None:
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({route}: {reason}), retry later",
+            headers={"Retry-After": str(app_settings.admission_retry_after_s)},
+        )
+
+
+class RouteLimiter:
+    """
+    At most `limit` requests of one route run at a time. Up to `max_queue` more
+    wait (without holding a threadpool thread) for at most `timeout_s`; anything
+    beyond that is rejected immediately with 503.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout_s: float) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout_s = timeout_s
+        self._sem = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self._queue_ms = deque(maxlen=1000)   # recent queue times
+
+    async def acquire(self) -> None:
+        if self._sem.locked() and self.waiting >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise Overloaded(self.name, "queue full")
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.timeout_s)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise Overloaded(self.name, "queue timeout")
+        finally:
+            self.waiting -= 1
+
+        self._queue_ms.append((time.perf_counter() - started) * 1000.0)
+        self.active += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self._sem.release()
+
+    def metrics(self) -> Dict[str, float]:
+        queue = np.asarray(self._queue_ms) if self._queue_ms else np.zeros(1)
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "queue_ms_p50": float(np.percentile(queue, 50)),
+            "queue_ms_p95": float(np.percentile(queue, 95)),
+            "queue_ms_max": float(queue.max()),
+        }
+
+
+class AdmissionController:
+    def __init__(self) -> None:
+        self._limiters: Dict[str, RouteLimiter] = {}
+
+    def limiter(self, route: str) -> RouteLimiter:
+        if route not in self._limiters:
+            self._limiters[route] = RouteLimiter(
+                route,
+                limit=app_settings.admission_limits.get(route, app_settings.admission_default_limit),
+                max_queue=app_settings.admission_max_queue,
+                timeout_s=app_settings.admission_queue_timeout_s,
+            )
+        return self._limiters[route]
+
+    def busy(self) -> bool:
+        return any(l.active or l.waiting for l in self._limiters.values())
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        return {name: l.metrics() for name, l in self._limiters.items()}
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    # One controller per process (per event loop)
+    return AdmissionController()
+
+
+def admission(route: str):
+    """
+    Dependency that holds one of `route`'s concurrency slots for the whole request.
+    """
+    async def _admit():
+        if not app_settings.admission_enabled:
+            yield
+            return
+        limiter = get_admission_controller().limiter(route)
+        await limiter.acquire()
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    return Depends(_admit)
@@ -0,0 +1,92 @@
+# backend/app/api/admin.py
+import json
+import os
+from dataclasses import asdict
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from .. import workers
+from ..admission import get_admission_controller
+from ..config import app_settings
+from ..memory import memory_usage
+from ..prefetch import get_prefetcher
+from ..profiling import get_profile_store
+from ...data.client import payload_stats
+from ...data.rate_limit import get_rate_limiter
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/admission")
+def admission_metrics():
+    """
+    Per-route concurrency, queue-time and rejection counters.
+    """
+    return get_admission_controller().metrics()
+
+
+@router.get("/openalex")
+def openalex_throttle_metrics():
+    """
+    This worker's OpenAlex traffic: time spent waiting on the shared rate
+    limit, and response size / JSON decode time.
+    """
+    return {
+        "throttle": get_rate_limiter().stats.as_dict(),
+        "payload": payload_stats.as_dict(),
+    }
+
+
+@router.get("/memory")
+def worker_memory():
+    """
+    RSS / PSS / USS of the worker that serves the request, in bytes.
+    """
+    return {"pid": os.getpid(), **memory_usage()}
+
+
+@router.get("/prefetch")
+def prefetch_metrics():
+    """
+    This worker's background prefetch queue: jobs run, dropped and cancelled,
+    and time spent yielding to foreground requests.
+    """
+    prefetcher = get_prefetcher()
+    return {"running": prefetcher.running, "queued": prefetcher.qsize(), **prefetcher.stats.as_dict()}
+
+
+@router.get("/profiles")
+def list_profiles(request: Request, local: bool = False):
+    """
+    Profiles recorded by every serve.py worker (this one only with `local`),
+    newest first. Workers that cannot be reached are left out.
+    """
+    records = [asdict(r) for r in get_profile_store().list()]
+    if not local:
+        for slot in workers.peer_slots():
+            try:
+                status, body, _ = workers.forward_get(slot, f"{request.url.path}?local=1", app_settings.serve_forward_timeout_s)
+            except OSError:
+                continue
+            if status == 200:
+                records.extend(json.loads(body))
+    return sorted(records, key=lambda r: r["started_at"], reverse=True)
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, request: Request, format: Literal["text", "pstats"] = "text"):
+    """
+    Text summary (cumulative time), or the raw pstats file for snakeviz / pstats.
+    A profile recorded by another serve.py worker is fetched from it.
+    """
+    store = get_profile_store()
+    if store.get(profile_id) is None:
+        owner = workers.owner_of(profile_id)
+        if owner is not None and owner != workers.current_slot():
+            return workers.forward_to_owner(request, owner, what="profile")
+        raise HTTPException(status_code=404, detail="Unknown profile id")
+    if format == "pstats":
+        return FileResponse(store.path(profile_id, "prof"), media_type="application/octet-stream", filename=f"{profile_id}.prof")
+    return PlainTextResponse(store.path(profile_id, "txt").read_text(encoding="utf-8"))
@@ -2,7 +2,9 @@
 from fastapi import APIRouter
 from .works import router as works_router
 from .test_rerank import router as test_rerank_router
+from .admin import router as admin_router
 
 router = APIRouter()
 router.include_router(works_router, prefix="/works", tags=["works"])
-router.include_router(test_rerank_router)
\ No newline at end of file
+router.include_router(test_rerank_router)
+router.include_router(admin_router)
\ No newline at end of file
@@ -1,31 +1,102 @@
 # backend/app/api/test_rerank.py
-from fastapi import APIRouter
-from pydantic import BaseModel
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, model_validator
 
 from ..schemas import WorksSearchRequest, WorksSearchResponse
-from ..services.semantic_rerank_service import (
-    rerank_works_by_query_sentence_transformer,
-    rerank_works_by_query_cross_encoder,
-)
+from ..services.adaptive_rerank_service import rerank_works_within_budget
+from ..services.diversity_service import diversify
+from ..services.session_service import rank_candidates
+from ..wire import decode_payload, encode_response
+from ..admission import admission
+from ..profiling import ProfiledRoute
+from ..work_store import get_work_store
 
-router = APIRouter(prefix="/__test__", tags=["__test__"])
+router = APIRouter(prefix="/__test__", tags=["__test__"], route_class=ProfiledRoute)
 
 class RerankOnlyPayload(BaseModel):
     query: WorksSearchRequest
-    works: WorksSearchResponse
+    works: Optional[WorksSearchResponse] = None
+    work_ids: Optional[List[str]] = None
+
+    @model_validator(mode="after")
+    def _works_or_ids(self):
+        if self.works is None and self.work_ids is None:
+            raise ValueError("Provide either 'works' or 'work_ids'")
+        return self
+
+
+async def read_rerank_payload(request: Request) -> RerankOnlyPayload:
+    """
+    Decode the body by Content-Type (JSON, msgpack or Arrow), then resolve
+    id-only requests against the server-side work store.
+    """
+    data = decode_payload(await request.body(), request.headers.get("content-type"))
+    try:
+        payload = RerankOnlyPayload.model_validate(data)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    if payload.works is None:
+        works, missing = get_work_store().get_many(payload.work_ids)
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Unknown work ids: {missing[:20]}")
+        payload.works = WorksSearchResponse(results=works)
+    return payload
+
+
+@router.put("/works")
+def upsert_works(works: WorksSearchResponse):
+    stored = get_work_store().upsert_many(works.results)
+    return {"stored": stored, "total": len(get_work_store())}
+
+
+@router.post("/rerank_only_sentence_transformer", response_model=WorksSearchResponse, dependencies=[admission("bi_encoder")])
+def rerank_only_sentence_transformer(
+    request: Request,
+    latency_budget_ms: Optional[float] = Query(None, gt=0),
+    mmr_lambda: Optional[float] = Query(None, ge=0, le=1),
+    payload: RerankOnlyPayload = Depends(read_rerank_payload),
+):
+    if latency_budget_ms is not None:
+        result = rerank_works_within_budget(
+            payload.query, payload.works, latency_budget_ms, ceiling="bi_encoder"
+        )
+        scores = None
+    else:
+        result, scores = rank_candidates("bi_encoder", payload.query, payload.works)
+    if mmr_lambda is not None:
+        result = diversify(result, scores, mmr_lambda)
+    return encode_response(result, request.headers.get("accept"))
 
 
-@router.post("/rerank_only_sentence_transformer", response_model=WorksSearchResponse)
-def rerank_only_sentence_transformer(payload: RerankOnlyPayload):
-    return rerank_works_by_query_sentence_transformer(
-        searchRequest=payload.query,
-        workList=payload.works,
-    )
+@router.post("/rerank_only_cross_encoder", response_model=WorksSearchResponse, dependencies=[admission("cross_encoder")])
+def rerank_only_cross_encoder(
+    request: Request,
+    latency_budget_ms: Optional[float] = Query(None, gt=0),
+    mmr_lambda: Optional[float] = Query(None, ge=0, le=1),
+    payload: RerankOnlyPayload = Depends(read_rerank_payload),
+):
+    if latency_budget_ms is not None:
+        result = rerank_works_within_budget(
+            payload.query, payload.works, latency_budget_ms, ceiling="cross_encoder"
+        )
+        scores = None
+    else:
+        result, scores = rank_candidates("cross_encoder", payload.query, payload.works)
+    if mmr_lambda is not None:
+        result = diversify(result, scores, mmr_lambda)
+    return encode_response(result, request.headers.get("accept"))
 
 
-@router.post("/rerank_only_cross_encoder", response_model=WorksSearchResponse)
-def rerank_only_cross_encoder(payload: RerankOnlyPayload):
-    return rerank_works_by_query_cross_encoder(
-        searchRequest=payload.query,
-        workList=payload.works,
-    )
\ No newline at end of file
+@router.post("/rerank_only_hybrid", response_model=WorksSearchResponse, dependencies=[admission("hybrid")])
+def rerank_only_hybrid(
+    request: Request,
+    mmr_lambda: Optional[float] = Query(None, ge=0, le=1),
+    payload: RerankOnlyPayload = Depends(read_rerank_payload),
+):
+    result, scores = rank_candidates("hybrid", payload.query, payload.works)
+    if mmr_lambda is not None:
+        result = diversify(result, scores, mmr_lambda)
+    return encode_response(result, request.headers.get("accept"))
@@ -1,45 +1,150 @@
 #backend/app/api/works.py
-from fastapi import APIRouter, Depends, HTTPException
+import time
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from ..schemas import WorksSearchRequest, WorksSearchResponse
-from ..services.works_service import run_search
-from ..services.semantic_rerank_service import rerank_works_by_query_sentence_transformer, rerank_works_by_query_cross_encoder
+from ..config import app_settings
+from ..admission import admission
+from .. import workers
+from ..profiling import ProfiledRoute
+from ..services.works_service import SearchPlan, plan_search, fetch_candidates
+from ..services.adaptive_rerank_service import rerank_works_within_budget
+from ..services.dedup_service import dedup_works
+from ..services.expansion_service import expand_ranking
+from ..services.diversity_service import diversify
+from ..services.query_cache import get_query_cache
+from ..services.session_service import get_session_store, rank_candidates, session_page
+from ..services.prefetch_service import prefetch_after_response
 from ...data.client import OpenAlexClient, OpenAlexError
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 def get_client():
     return OpenAlexClient()
 
-@router.post("/search", response_model=WorksSearchResponse)
-def search_works(payload: WorksSearchRequest, client: OpenAlexClient = Depends(get_client)):
+def _remaining_ms(budget_ms: float, started: float) -> float:
+    # the budget covers the whole request, so retrieval time is taken out of it
+    return budget_ms - (time.perf_counter() - started) * 1000.0
+
+def _first_page(payload: WorksSearchRequest, plan: SearchPlan, mode: str, ranked: WorksSearchResponse, scores, client: OpenAlexClient, mmr_lambda: Optional[float] = None, background_tasks: Optional[BackgroundTasks] = None) -> WorksSearchResponse:
+    # diversity is per request, so cached rankings stay undiversified
+    if mmr_lambda is not None:
+        ranked = diversify(ranked, scores, mmr_lambda)
+    # keep the whole ranked pool server-side; later pages come from /more
+    session = get_session_store().open(payload, plan, mode, ranked, scores)
+    response = session_page(session, client, page=1)
+    # runs once the response is sent
+    if background_tasks is not None:
+        background_tasks.add_task(prefetch_after_response, session, client, first_page=True)
+    return response
+
+def _search_and_rank(payload: WorksSearchRequest, client: OpenAlexClient, mode: str, latency_budget_ms: Optional[float] = None, mmr_lambda: Optional[float] = None, background_tasks: Optional[BackgroundTasks] = None) -> WorksSearchResponse:
+    started = time.perf_counter()
+    cache = get_query_cache() if app_settings.query_cache_enabled else None
+    if cache is not None:
+        hit = cache.get(payload, mode)
+        if hit is not None:
+            return _first_page(payload, hit.plan, hit.mode, hit.ranked, hit.scores, client, mmr_lambda, background_tasks)
+
+    plan = plan_search(payload, client)
+    candidates = fetch_candidates(client, plan)
+    # kept with the plan (as are next_page and the overflow past target_candidates):
+    # dedup and reranking shorten the pool, not OpenAlex's page
+    plan.more_pages = bool(candidates.has_more)
+    plan.dropped_terms = candidates.dropped_terms or []
+    if app_settings.dedup_enabled:
+        candidates = dedup_works(candidates)
+    if latency_budget_ms is not None:
+        ranked = rerank_works_within_budget(
+            payload, candidates, _remaining_ms(latency_budget_ms, started), ceiling=mode
+        )
+        scores, used_mode = None, ranked.rerank_mode
+    else:
+        ranked, scores = rank_candidates(mode, payload, candidates)
+        used_mode = mode
+
+    # references / related works of the top results, which the keyword filter can miss
+    if app_settings.expansion_enabled and used_mode != "openalex":
+        expansion_ms = app_settings.expansion_max_latency_ms
+        if latency_budget_ms is not None:
+            expansion_ms = min(expansion_ms, _remaining_ms(latency_budget_ms, started))
+        if expansion_ms > 0:
+            ranked, scores = expand_ranking(client, payload, used_mode, ranked, scores, max_latency_ms=expansion_ms)
+
+    # degraded rankings are not cached under the route's mode
+    if cache is not None and used_mode == mode:
+        cache.put(payload, mode, plan, ranked, scores)
+    return _first_page(payload, plan, used_mode, ranked, scores, client, mmr_lambda, background_tasks)
+
+@router.post("/search", response_model=WorksSearchResponse, dependencies=[admission("search")])
+def search_works(payload: WorksSearchRequest, background_tasks: BackgroundTasks, client: OpenAlexClient = Depends(get_client)):
     try:
-        response = run_search(payload, client, discovery_mode = False)
-        results = response.results
-        if len(results)>20:
-            return WorksSearchResponse(results=results[:20])
-        else:
-            return response
+        return _search_and_rank(payload, client, mode="openalex", background_tasks=background_tasks)
     except OpenAlexError as exc:
         raise HTTPException(status_code=502, detail=str(exc))
 
-@router.post("/rerank_search_sentence_transformer", response_model=WorksSearchResponse)
-def search_and_rerank_bi_encoder(payload: WorksSearchRequest, client: OpenAlexClient = Depends(get_client)):
+@router.post("/rerank_search_sentence_transformer", response_model=WorksSearchResponse, dependencies=[admission("bi_encoder")])
+def search_and_rerank_bi_encoder(
+    payload: WorksSearchRequest,
+    background_tasks: BackgroundTasks,
+    latency_budget_ms: Optional[float] = Query(None, gt=0, description="Degrade to a cheaper ranking mode to stay within this budget."),
+    mmr_lambda: Optional[float] = Query(None, ge=0, le=1, description="Diversify the top results with MMR; 1 = relevance only."),
+    client: OpenAlexClient = Depends(get_client),
+):
     try:
-        response = run_search(payload, client)
-        reranked_response = rerank_works_by_query_sentence_transformer(searchRequest=payload, workList=response)
-        if len(reranked_response.results) > 20:
-             return WorksSearchResponse(results=reranked_response.results[:20])
-        return reranked_response
+        return _search_and_rank(payload, client, mode="bi_encoder", latency_budget_ms=latency_budget_ms, mmr_lambda=mmr_lambda, background_tasks=background_tasks)
     except OpenAlexError as exc:
         raise HTTPException(status_code=502, detail=str(exc))
     
-@router.post("/rerank_search_cross_encoder", response_model=WorksSearchResponse)
-def search_and_rerank_cross_encoder(payload: WorksSearchRequest, client: OpenAlexClient = Depends(get_client)):
+@router.post("/rerank_search_cross_encoder", response_model=WorksSearchResponse, dependencies=[admission("cross_encoder")])
+def search_and_rerank_cross_encoder(
+    payload: WorksSearchRequest,
+    background_tasks: BackgroundTasks,
+    latency_budget_ms: Optional[float] = Query(None, gt=0, description="Degrade to a cheaper ranking mode to stay within this budget."),
+    mmr_lambda: Optional[float] = Query(None, ge=0, le=1, description="Diversify the top results with MMR; 1 = relevance only."),
+    client: OpenAlexClient = Depends(get_client),
+):
+    try:
+        return _search_and_rank(payload, client, mode="cross_encoder", latency_budget_ms=latency_budget_ms, mmr_lambda=mmr_lambda, background_tasks=background_tasks)
+    except OpenAlexError as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+
+@router.post("/rerank_search_hybrid", response_model=WorksSearchResponse, dependencies=[admission("hybrid")])
+def search_and_rerank_hybrid(
+    payload: WorksSearchRequest,
+    background_tasks: BackgroundTasks,
+    mmr_lambda: Optional[float] = Query(None, ge=0, le=1, description="Diversify the top results with MMR; 1 = relevance only."),
+    client: OpenAlexClient = Depends(get_client),
+):
     try:
-        response = run_search(payload, client)
-        reranked_response = rerank_works_by_query_cross_encoder(searchRequest=payload, workList=response)
-        if len(reranked_response.results) > 20:
-             return WorksSearchResponse(results=reranked_response.results[:20])
-        return reranked_response
+        return _search_and_rank(payload, client, mode="hybrid", mmr_lambda=mmr_lambda, background_tasks=background_tasks)
     except OpenAlexError as exc:
-        raise HTTPException(status_code=502, detail=str(exc))
\ No newline at end of file
+        raise HTTPException(status_code=502, detail=str(exc))
+
+@router.get("/more", response_model=WorksSearchResponse, dependencies=[admission("more")])
+def more_results(
+    session_token: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    page: int = Query(2, ge=1),
+    client: OpenAlexClient = Depends(get_client),
+):
+    session = get_session_store().get(session_token)
+    if session is None:
+        owner = workers.owner_of(session_token)
+        if owner is not None and owner != workers.current_slot():
+            return workers.forward_to_owner(request, owner)
+        raise HTTPException(status_code=404, detail="Unknown or expired session token")
+    try:
+        response = session_page(session, client, page)
+    except OpenAlexError as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+    background_tasks.add_task(prefetch_after_response, session, client)
+    return response
+
+
+@router.get("/cache/stats")
+def query_cache_stats():
+    cache = get_query_cache()
+    return {"entries": len(cache), **cache.stats.as_dict()}
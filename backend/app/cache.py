@@ -5,6 +5,8 @@ from typing import Optional
 
 _model_cache_dir: Optional[str] = None
 _temp_dir: Optional[str] = None
+_work_store_dir: Optional[str] = None
+_phrase_vocab_dir: Optional[str] = None
 
 def get_model_cache_dir() -> str:
     global _model_cache_dir
@@ -14,6 +16,22 @@ def get_model_cache_dir() -> str:
         _model_cache_dir = str(cache_path)
     return _model_cache_dir
 
+def get_work_store_dir() -> str:
+    global _work_store_dir
+    if _work_store_dir is None:
+        store_path = Path.home() / ".cache" / "research-finder" / "works"
+        store_path.mkdir(parents=True, exist_ok=True)
+        _work_store_dir = str(store_path)
+    return _work_store_dir
+
+def get_phrase_vocab_dir() -> str:
+    global _phrase_vocab_dir
+    if _phrase_vocab_dir is None:
+        vocab_path = Path.home() / ".cache" / "research-finder" / "phrase_vocab"
+        vocab_path.mkdir(parents=True, exist_ok=True)
+        _phrase_vocab_dir = str(vocab_path)
+    return _phrase_vocab_dir
+
 def get_temp_dir() -> str:
     global _temp_dir
     if _temp_dir is None:
@@ -0,0 +1,104 @@
+# backend/app/config.py
+from typing import Dict, Literal, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+class AppSettings(BaseSettings):
+    """
+    Central config for the API layer (ranking, serving).
+    """
+    # hybrid rank mode: weights of the fused signals (renormalized over the signals present)
+    hybrid_lexical_weight: float = Field(0.3, ge=0.0)
+    hybrid_semantic_weight: float = Field(0.5, ge=0.0)
+    hybrid_openalex_weight: float = Field(0.2, ge=0.0)
+
+    # latency-budgeted rerank: starting cost estimates, refined from observed timings
+    rerank_cost_per_pair_ms: float = Field(4.0, gt=0)    # cross-encoder, per (query, doc) pair
+    rerank_cost_per_text_ms: float = Field(2.0, gt=0)    # bi-encoder, per encoded text
+    rerank_cascade_min_k: int = Field(10, ge=1)          # smaller cascades fall back to bi-encoder only
+
+    # bi-encoder model; cached embeddings are tagged with it, so changing it recomputes them
+    bi_encoder_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # server-side work store
+    work_store_path: Optional[str] = None                # sqlite file; default: <cache>/works/works.sqlite3
+    work_store_hot_size: int = Field(5000, ge=0)         # works kept decoded in memory (LRU)
+    work_store_embedding_dtype: str = "float32"          # float32 / float16 / int8 (see quantization.py)
+
+    # bi-encoder: above this many works, score through the binary-code prefilter
+    bi_encoder_prefilter_min_works: int = Field(2000, ge=1)
+    bi_encoder_rescore_k: int = Field(200, ge=1)         # prefilter survivors rescored exactly
+
+    # search sessions ("more results" paging)
+    session_ttl_s: float = Field(900, gt=0)
+    session_max_count: int = Field(1000, ge=1)
+    session_page_size: int = Field(20, ge=1)
+    session_max_openalex_pages: int = Field(10, ge=1)    # deepest OpenAlex page a session will fetch
+
+    # duplicate collapsing before reranking
+    dedup_enabled: bool = True
+    dedup_similarity_threshold: float = Field(0.95, ge=0.0, le=1.0)  # cosine, on cached embeddings
+
+    # query-level result cache
+    query_cache_enabled: bool = True
+    query_cache_ttl_s: float = Field(600, gt=0)
+    query_cache_max_entries: int = Field(512, ge=1)
+    query_cache_semantic_threshold: float = Field(0.97, ge=0.0)  # > 1 disables the embedding tier
+
+    # abstract keyword extraction: "keybert", "vocabulary" (prebuilt phrase index,
+    # scripts/build_phrase_vocab.py) or "auto" (the vocabulary when built, else KeyBERT).
+    # Opt-in: the vocabulary returns its own n-grams (1-2 by default), not KeyBERT's unigrams
+    keyword_extractor: Literal["auto", "keybert", "vocabulary"] = "keybert"
+    keyword_vocab_path: Optional[str] = None             # default: <cache>/phrase_vocab
+
+    # citation-graph expansion of reranked results (opt-in: up to two more OpenAlex calls per search)
+    expansion_enabled: bool = False
+    expansion_top_k: int = Field(5, ge=1)                # top works whose references / related works are added
+    expansion_max_new: int = Field(30, ge=1)             # fan-out cap
+    expansion_max_latency_ms: float = Field(1500, gt=0)  # added latency cap for the id lookups
+
+    # MMR diversification (opt-in per request with ?mmr_lambda=)
+    mmr_k: int = Field(20, ge=1)                         # top positions reordered
+
+    # multi-worker serving (python -m backend.app.serve)
+    serve_host: str = "127.0.0.1"
+    serve_port: int = 8000
+    serve_workers: int = Field(1, ge=1)
+    serve_torch_threads: Optional[int] = Field(None, ge=1)  # per worker; default CPUs / workers
+    serve_forward_timeout_s: float = Field(30.0, gt=0)   # /more forwarded to the worker owning the session
+    serve_restart_backoff_s: float = Field(1.0, gt=0)    # first delay before restarting a worker that died young
+    serve_restart_backoff_max_s: float = Field(60.0, gt=0)
+
+    # per-request profiling (X-Profile: 1 header or ?profile=1; see profiling.py)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = Field(0.0, ge=0.0, le=1.0)  # share of requests profiled without asking
+    profiling_max_profiles: int = Field(50, ge=1)        # artifacts kept per worker
+    profiling_top_n: int = Field(40, ge=1)               # functions in the text summary
+
+    # admission control for model-backed routes
+    admission_enabled: bool = True
+    admission_limits: Dict[str, int] = {                 # concurrent requests per route
+        "search": 8,
+        "bi_encoder": 4,
+        "hybrid": 4,
+        "cross_encoder": 2,
+        "more": 4,
+    }
+    admission_default_limit: int = Field(4, ge=1)
+    admission_max_queue: int = Field(16, ge=0)           # waiting requests per route before fast 503s
+    admission_queue_timeout_s: float = Field(5.0, gt=0)
+    admission_retry_after_s: int = Field(2, ge=0)
+
+    # background prefetch after a response (see prefetch.py)
+    prefetch_enabled: bool = True
+    prefetch_queue_size: int = Field(32, ge=1)           # queued jobs per worker; more are dropped
+    prefetch_pages_ahead: int = Field(2, ge=1)           # result pages kept ready past the last one served
+    prefetch_cross_encoder: bool = True                  # pre-score the pool for a switch to the cross-encoder view
+    prefetch_chunk_size: int = Field(16, ge=1)           # works scored between yields to foreground requests
+    prefetch_nice: int = Field(10, ge=0, le=19)          # added niceness of the prefetch thread
+    prefetch_max_wait_s: float = Field(10.0, gt=0)       # a job kept waiting this long for an idle worker is dropped
+    prefetch_max_age_s: float = Field(120.0, gt=0)       # queued jobs older than this are skipped
+
+
+app_settings = AppSettings()
@@ -4,12 +4,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .api.routes import router as api_router
 from .cache import get_model_cache_dir, get_temp_dir, cleanup_temp_dir
+from .profiling import profiling_middleware
+from .prefetch import get_prefetcher
+from .config import app_settings
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     get_model_cache_dir()
     get_temp_dir()
+    if app_settings.prefetch_enabled:
+        get_prefetcher().start()
     yield
+    get_prefetcher().stop()
     cleanup_temp_dir()
 
 # Pass the lifespan handler to the FastAPI app
@@ -32,6 +38,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(profiling_middleware)
+
 app.include_router(api_router, prefix="/api")
 
 @app.get("/health")
@@ -0,0 +1,47 @@
+# backend/app/memory.py
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared",
+    "Shared_Dirty": "shared",
+    "Private_Clean": "uss",
+    "Private_Dirty": "uss",
+}
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    RSS, PSS, USS and shared bytes of a process, from /proc/<pid>/smaps_rollup.
+    USS (pages no other process maps) is what a worker really costs; model
+    weights shared copy-on-write with the parent only show up in RSS/PSS.
+    Empty on platforms without /proc.
+    """
+    proc = Path("/proc") / str(pid or os.getpid())
+    path = proc / "smaps_rollup"
+    if not path.exists():
+        path = proc / "smaps"
+        if not path.exists():
+            return {}
+
+    usage = {"rss": 0, "pss": 0, "uss": 0, "shared": 0}
+    for line in path.read_text().splitlines():
+        name, _, rest = line.partition(":")
+        key = _FIELDS.get(name)
+        if key and rest.strip().endswith("kB"):
+            usage[key] += int(rest.split()[0]) * 1024
+    return usage
+
+
+def child_pids(pid: int) -> List[int]:
+    # direct children, as listed by the kernel for each thread of `pid`
+    children: List[int] = []
+    for task in (Path("/proc") / str(pid) / "task").glob("*"):
+        try:
+            children.extend(int(c) for c in (task / "children").read_text().split())
+        except OSError:
+            continue
+    return sorted(set(children))
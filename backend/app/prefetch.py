@@ -0,0 +1,203 @@
+# backend/app/prefetch.py
+"""
+Background work queued after a response has been sent.
+
+Routes hand jobs over through FastAPI BackgroundTasks (so after the response
+is written); one daemon thread per worker runs them:
+  - the queue is bounded: when it is full, new jobs are dropped, not queued
+  - a job is keyed (the session token) and named; a newer job with the same
+    key and name supersedes the queued or running one, and cancel(key) drops
+    all of a key's jobs
+  - jobs call `checkpoint()` between steps: it raises Cancelled for a
+    superseded job and otherwise blocks while foreground requests are active
+    or queued (admission control), so prefetch only runs on an idle worker
+  - the thread raises its own nice value; on Linux this renices the thread
+    alone. Torch's intra-op pool is shared with foreground requests and keeps
+    its priority, so model work is bounded by the chunking and checkpoints,
+    not by the nice value
+
+Prefetch OpenAlex requests draw from the same rate limit as foreground ones.
+"""
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from .admission import get_admission_controller
+from .config import app_settings
+
+Checkpoint = Callable[[], None]
+
+
+class Cancelled(Exception):
+    pass
+
+
+@dataclass
+class PrefetchJob:
+    key: str
+    name: str
+    fn: Callable[[Checkpoint], None]
+    enqueued_at: float
+    cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+@dataclass
+class PrefetchStats:
+    submitted: int = 0
+    dropped_full: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    expired: int = 0
+    failed: int = 0
+    waited_s: float = 0.0          # time jobs spent yielding to foreground requests
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "submitted": self.submitted,
+            "dropped_full": self.dropped_full,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "failed": self.failed,
+            "waited_s": round(self.waited_s, 3),
+        }
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        max_queue: int,
+        is_busy: Callable[[], bool],
+        nice: int = 10,
+        max_wait_s: float = 10.0,
+        max_age_s: float = 120.0,
+        poll_s: float = 0.05,
+    ) -> None:
+        self.is_busy = is_busy
+        self.nice = nice
+        self.max_wait_s = max_wait_s
+        self.max_age_s = max_age_s
+        self.poll_s = poll_s
+        self.stats = PrefetchStats()
+        self._queue: "queue.Queue[PrefetchJob]" = queue.Queue(maxsize=max_queue)
+        self._current: Dict[Tuple[str, str], PrefetchJob] = {}   # newest job per (key, name)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        self._stop.set()
+        with self._lock:
+            for job in self._current.values():
+                job.cancelled.set()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+        self._thread = None
+
+    def submit(self, key: str, name: str, fn: Callable[[Checkpoint], None]) -> bool:
+        """
+        Queue `fn(checkpoint)`; False when the worker is not running or the queue is full.
+        """
+        if not self.running:
+            return False
+        job = PrefetchJob(key=key, name=name, fn=fn, enqueued_at=time.monotonic())
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.stats.dropped_full += 1
+                return False
+            previous = self._current.get((key, name))
+            if previous is not None:
+                previous.cancelled.set()
+            self._current[(key, name)] = job
+            self.stats.submitted += 1
+        return True
+
+    def cancel(self, key: str) -> None:
+        with self._lock:
+            for (job_key, _), job in self._current.items():
+                if job_key == key:
+                    job.cancelled.set()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _checkpoint(self, job: PrefetchJob) -> None:
+        started = time.monotonic()
+        try:
+            while True:
+                if job.cancelled.is_set() or self._stop.is_set():
+                    raise Cancelled()
+                if not self.is_busy():
+                    return
+                if time.monotonic() - started > self.max_wait_s:
+                    raise Cancelled()
+                time.sleep(self.poll_s)
+        finally:
+            self.stats.waited_s += time.monotonic() - started
+
+    def _lower_priority(self) -> None:
+        if not self.nice or not hasattr(os, "setpriority"):
+            return
+        try:
+            # with a thread id, PRIO_PROCESS renices only this thread (Linux)
+            tid = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + self.nice)
+        except OSError as exc:
+            print(f"[prefetch] could not lower thread priority: {exc}")
+
+    def _run(self) -> None:
+        self._lower_priority()
+        while not self._stop.is_set():
+            try:
+                job = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job: PrefetchJob) -> None:
+        try:
+            if time.monotonic() - job.enqueued_at > self.max_age_s:
+                self.stats.expired += 1
+                return
+            checkpoint = lambda: self._checkpoint(job)
+            checkpoint()
+            job.fn(checkpoint)
+            self.stats.completed += 1
+        except Cancelled:
+            self.stats.cancelled += 1
+        except Exception as exc:
+            self.stats.failed += 1
+            print(f"[prefetch] {job.name} for {job.key[:8]} failed: {exc!r}")
+        finally:
+            with self._lock:
+                if self._current.get((job.key, job.name)) is job:
+                    del self._current[(job.key, job.name)]
+
+
+@lru_cache(maxsize=1)
+def get_prefetcher() -> Prefetcher:
+    # One prefetch thread per process, started by the app lifespan
+    return Prefetcher(
+        max_queue=app_settings.prefetch_queue_size,
+        is_busy=get_admission_controller().busy,
+        nice=app_settings.prefetch_nice,
+        max_wait_s=app_settings.prefetch_max_wait_s,
+        max_age_s=app_settings.prefetch_max_age_s,
+    )
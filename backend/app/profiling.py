@@ -0,0 +1,178 @@
+# backend/app/profiling.py
+"""
+Opt-in per-request profiling.
+
+With `profiling_enabled`, a request is profiled when it carries an
+`X-Profile: 1` header or a `profile=1` query parameter, or when it is drawn by
+`profiling_sample_rate`. The route handler then runs under cProfile; the
+artifact (`<id>.prof` for pstats/snakeviz, `<id>.txt` summary) is written to
+get_temp_dir()/profiles, the id is returned in the `X-Profile-Id` response
+header, and /api/admin/profiles serves it back.
+
+Only the handler's own thread is profiled: time spent in the OpenAlex fetch
+pool shows up as waiting in the handler. Profiles live in the worker that
+served the request; under serve.py their ids start with its slot, so the
+admin routes can forward to it (see workers.py).
+"""
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import random
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+from .cache import get_temp_dir
+from .config import app_settings
+from .workers import token_prefix
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+_TRUE = {"1", "true", "yes"}
+
+
+@dataclass
+class ProfileRecord:
+    id: str
+    method: str
+    path: str
+    reason: str                      # "requested" or "sampled"
+    started_at: float                # epoch seconds
+    duration_ms: Optional[float] = None
+    status_code: Optional[int] = None
+    saved: bool = False
+
+
+_current_profile: ContextVar[Optional[ProfileRecord]] = ContextVar("current_profile", default=None)
+
+
+class ProfileStore:
+    """
+    The last `max_profiles` artifacts of this worker; older files are deleted.
+    """
+
+    def __init__(self, directory: Path, max_profiles: int, top_n: int = 40) -> None:
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.top_n = top_n
+        self._records: "OrderedDict[str, ProfileRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, profile_id: str, kind: str = "prof") -> Path:
+        return self.directory / f"{profile_id}.{kind}"
+
+    def save(self, record: ProfileRecord, profiler: cProfile.Profile) -> None:
+        profiler.dump_stats(str(self.path(record.id, "prof")))
+        summary = io.StringIO()
+        summary.write(f"{record.method} {record.path} ({record.reason}), {record.duration_ms:.1f} ms\n\n")
+        try:
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(self.top_n)
+        except TypeError:
+            summary.write("(no calls recorded)\n")
+        self.path(record.id, "txt").write_text(summary.getvalue(), encoding="utf-8")
+        record.saved = True
+
+        with self._lock:
+            self._records[record.id] = record
+            while len(self._records) > self.max_profiles:
+                old_id, _ = self._records.popitem(last=False)
+                for kind in ("prof", "txt"):
+                    self.path(old_id, kind).unlink(missing_ok=True)
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        with self._lock:
+            return self._records.get(profile_id)
+
+    def list(self) -> List[ProfileRecord]:
+        with self._lock:
+            return list(reversed(self._records.values()))
+
+
+@lru_cache(maxsize=1)
+def get_profile_store() -> ProfileStore:
+    # One store per process, in its temp dir
+    return ProfileStore(
+        Path(get_temp_dir()) / "profiles",
+        max_profiles=app_settings.profiling_max_profiles,
+        top_n=app_settings.profiling_top_n,
+    )
+
+
+def profile_reason(request: Request) -> Optional[str]:
+    if not app_settings.profiling_enabled:
+        return None
+    if (request.headers.get(PROFILE_HEADER, "").lower() in _TRUE
+            or request.query_params.get("profile", "").lower() in _TRUE):
+        return "requested"
+    if app_settings.profiling_sample_rate > 0 and random.random() < app_settings.profiling_sample_rate:
+        return "sampled"
+    return None
+
+
+async def profiling_middleware(request: Request, call_next):
+    reason = profile_reason(request)
+    if reason is None:
+        return await call_next(request)
+
+    record = ProfileRecord(
+        id=token_prefix() + secrets.token_hex(8),
+        method=request.method,
+        path=request.url.path,
+        reason=reason,
+        started_at=time.time(),
+    )
+    # the handler runs in a copy of this context (threadpool), so it sees the record
+    token = _current_profile.set(record)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_profile.reset(token)
+    record.status_code = response.status_code
+    if record.saved:
+        response.headers[PROFILE_ID_HEADER] = record.id
+    return response
+
+
+def profiled(endpoint):
+    """
+    Run a sync route handler under cProfile when its request was picked for profiling.
+    """
+    # include_router rebuilds routes from the already wrapped endpoint
+    if inspect.iscoroutinefunction(endpoint) or getattr(endpoint, "__profiled__", False):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        record = _current_profile.get()
+        if record is None:
+            return endpoint(*args, **kwargs)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+            record.duration_ms = (time.perf_counter() - started) * 1000.0
+            get_profile_store().save(record, profiler)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    # route_class for routers whose handlers may be profiled
+    def __init__(self, path: str, endpoint, **kwargs) -> None:
+        super().__init__(path, profiled(endpoint), **kwargs)
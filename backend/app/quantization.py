@@ -0,0 +1,165 @@
+# backend/app/quantization.py
+"""
+Compact bi-encoder embedding representations.
+
+Storage precisions (decoded back to float32 for scoring):
+  - float32   4 bytes / dim
+  - float16   2 bytes / dim
+  - int8      1 byte / dim + a float32 scale per vector (symmetric, per-vector max)
+Binary sign codes (1 bit / dim, packed) are not decodable; they drive a
+Hamming-distance prefilter whose survivors are rescored at full precision.
+"""
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+_SCALE = np.dtype("<f4")
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(x)
+else:
+    _POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        return _POPCOUNT[x]
+
+
+# --------- scalar precisions ------------------------------------------------
+def encode_embedding(vec: np.ndarray, dtype: str = "float32") -> bytes:
+    vec = np.asarray(vec, dtype=np.float32)
+    if dtype == "float32":
+        return vec.tobytes()
+    if dtype == "float16":
+        return vec.astype(np.float16).tobytes()
+    if dtype == "int8":
+        scale = float(np.abs(vec).max()) / 127.0 or 1.0
+        codes = np.clip(np.rint(vec / scale), -127, 127).astype(np.int8)
+        return np.asarray(scale, dtype=_SCALE).tobytes() + codes.tobytes()
+    raise ValueError(f"unknown embedding dtype: {dtype}")
+
+
+def decode_embedding(blob: bytes, dtype: Optional[str] = "float32") -> np.ndarray:
+    # rows written before precisions existed have no dtype: float32
+    if dtype in (None, "float32"):
+        return np.frombuffer(blob, dtype=np.float32)
+    if dtype == "float16":
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+    if dtype == "int8":
+        scale = float(np.frombuffer(blob[:_SCALE.itemsize], dtype=_SCALE)[0])
+        return np.frombuffer(blob[_SCALE.itemsize:], dtype=np.int8).astype(np.float32) * scale
+    raise ValueError(f"unknown embedding dtype: {dtype}")
+
+
+def bytes_per_vector(dim: int, dtype: str) -> int:
+    if dtype == "binary":
+        return -(-dim // 8)
+    return len(encode_embedding(np.zeros(dim, dtype=np.float32), dtype))
+
+
+# --------- binary codes -----------------------------------------------------
+def pack_codes(emb: np.ndarray) -> np.ndarray:
+    """
+    Sign bits of each row, packed: (n, dim) float -> (n, ceil(dim / 8)) uint8.
+    """
+    return np.packbits(np.atleast_2d(emb) > 0, axis=1)
+
+
+def hamming_distances(query_codes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    (n_queries, n_codes) Hamming distances between packed codes.
+    """
+    query_codes = np.atleast_2d(query_codes)
+    out = np.empty((query_codes.shape[0], codes.shape[0]), dtype=np.int32)
+    for i, q in enumerate(query_codes):
+        out[i] = _popcount(np.bitwise_xor(codes, q)).sum(axis=1, dtype=np.int32)
+    return out
+
+
+def _normalize(emb: np.ndarray) -> np.ndarray:
+    emb = np.atleast_2d(np.asarray(emb, dtype=np.float32))
+    return emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+
+
+def two_stage_cosine(
+    query_emb: np.ndarray,
+    doc_emb: np.ndarray,
+    rescore_k: int,
+    doc_codes: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Mean cosine similarity of every document against the queries, exact for
+    the `rescore_k` documents with the smallest mean Hamming distance to the
+    query codes. The rest are ordered by the sign-hash estimate
+    cos(pi * hamming / dim), shifted to rank strictly below every survivor:
+    their scores are not cosines, only an order.
+    """
+    dim = doc_emb.shape[1]
+    if doc_codes is None:
+        doc_codes = pack_codes(doc_emb)
+    hamming = hamming_distances(pack_codes(query_emb), doc_codes).mean(axis=0)
+    estimate = np.cos(math.pi * hamming / dim).astype(np.float32)
+
+    n = doc_emb.shape[0]
+    k = min(rescore_k, n)
+    if k >= n:
+        return (_normalize(query_emb) @ _normalize(doc_emb).T).mean(axis=0).astype(np.float32)
+    survivors = np.argpartition(hamming, k - 1)[:k]
+    exact = (_normalize(query_emb) @ _normalize(doc_emb[survivors]).T).mean(axis=0)
+    # estimate - 1 lies in [-2, 0]: below the lowest exact score, in estimate order
+    scores = (float(exact.min()) - 1e-3 + (estimate - 1.0)).astype(np.float32)
+    scores[survivors] = exact
+    return scores
+
+
+class EmbeddingIndex:
+    """
+    In-memory matrix of corpus embeddings at a storage precision, with binary
+    codes alongside for the prefilter. `search` scans the codes and rescores
+    `rescore_k` survivors; `exact` scans the dequantized matrix.
+    """
+
+    def __init__(self, ids: Sequence[str], emb: np.ndarray, dtype: str = "float32") -> None:
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"unknown embedding dtype: {dtype}")
+        self.ids: List[str] = list(ids)
+        self.dtype = dtype
+        emb = _normalize(emb)
+        self.dim = emb.shape[1]
+        self.codes = pack_codes(emb)
+        if dtype == "int8":
+            self._scales = (np.abs(emb).max(axis=1) / 127.0).astype(np.float32)
+            self._scales[self._scales == 0] = 1.0
+            self._matrix = np.clip(np.rint(emb / self._scales[:, None]), -127, 127).astype(np.int8)
+        else:
+            self._scales = None
+            self._matrix = emb.astype(dtype)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _rows(self, rows: np.ndarray) -> np.ndarray:
+        out = self._matrix[rows].astype(np.float32)
+        if self._scales is not None:
+            out *= self._scales[rows, None]
+        return out
+
+    def nbytes(self, codes: bool = True) -> Dict[str, int]:
+        sizes = {"matrix": self._matrix.nbytes + (self._scales.nbytes if self._scales is not None else 0)}
+        if codes:
+            sizes["codes"] = self.codes.nbytes
+        return sizes
+
+    def exact(self, query_emb: np.ndarray, k: int) -> List[int]:
+        scores = (_normalize(query_emb) @ self._rows(np.arange(len(self))).T).mean(axis=0)
+        return list(np.argsort(-scores, kind="stable")[:k])
+
+    def search(self, query_emb: np.ndarray, k: int, rescore_k: int) -> List[int]:
+        hamming = hamming_distances(pack_codes(query_emb), self.codes).mean(axis=0)
+        n = min(max(rescore_k, k), len(self))
+        survivors = np.argpartition(hamming, n - 1)[:n] if n < len(self) else np.arange(n)
+        scores = (_normalize(query_emb) @ self._rows(survivors).T).mean(axis=0)
+        return list(survivors[np.argsort(-scores, kind="stable")[:k]])
@@ -26,6 +26,22 @@ class WorkSummary(BaseModel):
     keywords: str
     abstract: str
     publication_year: Optional[int]
+    relevance_score: Optional[float] = None
+    match_level: Optional[int] = None
 
 class WorksSearchResponse(BaseModel):
     results: List[WorkSummary]
+    rerank_mode: Optional[str] = Field(
+        None,
+        description="Ranking mode actually used (may be cheaper than the route's own under a latency budget)."
+    )
+    session_token: Optional[str] = Field(
+        None,
+        description="Token for fetching further pages of this search."
+    )
+    page: Optional[int] = None
+    has_more: Optional[bool] = None
+    dropped_terms: Optional[List[str]] = Field(
+        None,
+        description="Search terms left out because the query needed more OpenAlex requests than allowed."
+    )
@@ -0,0 +1,173 @@
+# backend/app/serve.py
+"""
+Multi-worker server that loads the models once.
+
+`uvicorn --workers N` spawns fresh interpreters, so every worker loads its own
+copy of the bi-encoder and the cross-encoder through the lru_cache getters.
+Here the parent process imports the app, loads the models, binds the socket
+and then forks the workers: the weight tensors are shared copy-on-write.
+The parent never runs inference (forking after torch has started its thread
+pools is unsafe); it only supervises and restarts workers, with a growing
+delay for workers that keep dying shortly after they start.
+
+Search sessions, the query cache and admission state are per worker. The
+workers share the listening socket, so a /more request can reach a worker
+that does not hold its session; each worker therefore also listens on its own
+unix socket and forwards such requests to the session's owner (workers.py).
+No sticky load balancer is needed in front.
+
+Usage (from the repository root):
+    python -m backend.app.serve --workers 4 --torch-threads 2
+Per-worker memory: GET /api/admin/memory, or
+    python -m backend.scripts.measure_worker_memory --pid <parent pid>
+"""
+import argparse
+import gc
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import traceback
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from .config import app_settings
+from . import workers
+
+
+def preload_models() -> None:
+    # KeyBERT wraps the bi-encoder instance, so it adds no weights of its own
+    from .services.semantic_rerank_service import get_sentence_transformer, get_cross_encoder
+    from .services.works_service import get_keybert_model
+    from .services.phrase_vocab_service import get_phrase_vocabulary
+
+    get_sentence_transformer()
+    get_cross_encoder()
+    get_keybert_model()
+    # only the vocabulary extractors read it; a stale one would fail startup otherwise
+    if app_settings.keyword_extractor != "keybert":
+        get_phrase_vocabulary()
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _bind_unix(path: str) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(128)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sockets: List[socket.socket], torch_threads: int, log_level: str) -> None:
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+def restart_delay(failures: int, base_s: float, max_s: float) -> float:
+    # exponential in the number of consecutive early exits
+    return 0.0 if failures <= 0 else min(max_s, base_s * 2 ** (failures - 1))
+
+
+def serve(host: str, port: int, n_workers: int, torch_threads: Optional[int] = None, log_level: str = "info") -> None:
+    torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // n_workers)
+    # HF tokenizers' own thread pool does not survive fork
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    from .main import app
+
+    preload_models()
+    sock = _bind(host, port)
+    # one private socket per slot, kept across restarts, for forwarded /more requests
+    socket_dir = tempfile.mkdtemp(prefix="research-finder-workers-")
+    slot_socks = [_bind_unix(workers.socket_path(socket_dir, slot)) for slot in range(n_workers)]
+    # keep the collector from touching (and so un-sharing) the preloaded objects
+    gc.freeze()
+    print(f"Models loaded in {os.getpid()}; forking {n_workers} worker(s), {torch_threads} torch thread(s) each")
+
+    workers_by_pid: Dict[int, int] = {}
+    started_at: Dict[int, float] = {}
+    failures: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # never return into the parent's supervision loop
+            try:
+                workers.configure(slot, socket_dir)
+                _run_worker(app, [sock, slot_socks[slot]], torch_threads, log_level)
+            except BaseException:
+                traceback.print_exc()
+                os._exit(1)
+            os._exit(0)
+        workers_by_pid[pid] = slot
+        started_at[slot] = time.monotonic()
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers_by_pid):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for slot in range(n_workers):
+        spawn(slot)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while workers_by_pid:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot = workers_by_pid.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        # a worker that lived a while starts the count over
+        uptime = time.monotonic() - started_at[slot]
+        failures[slot] = failures.get(slot, 0) + 1 if uptime < app_settings.serve_restart_backoff_max_s else 1
+        delay = restart_delay(failures[slot], app_settings.serve_restart_backoff_s, app_settings.serve_restart_backoff_max_s)
+        print(f"Worker {pid} exited with status {status} after {uptime:.1f}s; restarting in {delay:.1f}s")
+        time.sleep(delay)
+        if not stopping:
+            spawn(slot)
+    sock.close()
+    for slot_sock in slot_socks:
+        slot_sock.close()
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=app_settings.serve_host)
+    parser.add_argument("--port", type=int, default=app_settings.serve_port)
+    parser.add_argument("--workers", type=int, default=app_settings.serve_workers)
+    parser.add_argument("--torch-threads", type=int, default=app_settings.serve_torch_threads,
+                        help="intra-op threads per worker (default: CPUs / workers)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, max(1, args.workers), args.torch_threads, args.log_level)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
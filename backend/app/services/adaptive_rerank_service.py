@@ -0,0 +1,59 @@
+# backend/app/services/adaptive_rerank_service.py
+from ..schemas import WorksSearchResponse, WorksSearchRequest
+from .cost_model import get_cost_model
+from .semantic_rerank_service import (
+    build_cross_encoder_queries,
+    build_query_space_representation,
+    score_works_sentence_transformer,
+    score_works_cross_encoder,
+    sort_works_by_scores,
+)
+
+
+def rerank_works_by_query_cascade(searchRequest: WorksSearchRequest, workList: WorksSearchResponse, top_k: int) -> WorksSearchResponse:
+    """
+    Bi-encoder over every candidate, then the cross-encoder over the bi-encoder top_k only.
+    The cross-encoded head is followed by the rest in bi-encoder order.
+    """
+    bi_scores = score_works_sentence_transformer(searchRequest, workList)
+    if not bi_scores:
+        return workList
+
+    bi_ranked = sort_works_by_scores(workList, bi_scores)
+    head = WorksSearchResponse(results=bi_ranked.results[:top_k])
+    tail = bi_ranked.results[top_k:]
+
+    ce_scores = score_works_cross_encoder(searchRequest, head)
+    if ce_scores:
+        head = sort_works_by_scores(head, ce_scores)
+    return WorksSearchResponse(results=head.results + tail)
+
+
+def rerank_works_within_budget(
+    searchRequest: WorksSearchRequest,
+    workList: WorksSearchResponse,
+    budget_ms: float,
+    ceiling: str = "cross_encoder",
+) -> WorksSearchResponse:
+    """
+    Rerank with the best mode (up to `ceiling`) the cost model expects to finish in `budget_ms`.
+    The chosen mode is reported in `rerank_mode`.
+    """
+    n_queries = max(
+        len(build_cross_encoder_queries(searchRequest)),
+        len(build_query_space_representation(searchRequest)),
+    )
+    plan = get_cost_model().plan(len(workList.results), n_queries, budget_ms, ceiling=ceiling)
+
+    if plan.mode == "cross_encoder":
+        scores = score_works_cross_encoder(searchRequest, workList)
+        reranked = sort_works_by_scores(workList, scores) if scores else workList
+    elif plan.mode == "cascade":
+        reranked = rerank_works_by_query_cascade(searchRequest, workList, top_k=plan.cascade_k)
+    elif plan.mode == "bi_encoder":
+        scores = score_works_sentence_transformer(searchRequest, workList)
+        reranked = sort_works_by_scores(workList, scores) if scores else workList
+    else:
+        reranked = workList
+
+    return WorksSearchResponse(results=reranked.results, rerank_mode=plan.mode)
@@ -0,0 +1,90 @@
+# backend/app/services/cost_model.py
+import math
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from ..config import app_settings
+
+# Rank modes, best quality first
+RERANK_MODES = ["cross_encoder", "cascade", "bi_encoder", "openalex"]
+
+
+@dataclass
+class RerankPlan:
+    mode: str
+    estimated_ms: float
+    cascade_k: Optional[int] = None
+
+
+class RerankCostModel:
+    """
+    Per-unit inference cost, kept as an exponentially weighted moving average
+    of the timings the rerankers observe:
+      - cross-encoder: milliseconds per (query, document) pair
+      - bi-encoder: milliseconds per encoded text
+    Starts from the configured defaults until the first observation.
+    """
+
+    def __init__(self, per_pair_ms: float, per_text_ms: float, alpha: float = 0.2) -> None:
+        self.per_pair_ms = per_pair_ms
+        self.per_text_ms = per_text_ms
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def _update(self, current: float, units: int, elapsed_s: float) -> float:
+        if units <= 0 or elapsed_s <= 0:
+            return current
+        observed = elapsed_s * 1000.0 / units
+        return (1 - self.alpha) * current + self.alpha * observed
+
+    def observe_cross_encoder(self, n_pairs: int, elapsed_s: float) -> None:
+        with self._lock:
+            self.per_pair_ms = self._update(self.per_pair_ms, n_pairs, elapsed_s)
+
+    def observe_bi_encoder(self, n_texts: int, elapsed_s: float) -> None:
+        with self._lock:
+            self.per_text_ms = self._update(self.per_text_ms, n_texts, elapsed_s)
+
+    def estimate_ms(self, mode: str, n_works: int, n_queries: int, cascade_k: int = 0) -> float:
+        if mode == "openalex":
+            return 0.0
+        bi_cost = (n_works + n_queries) * self.per_text_ms
+        if mode == "bi_encoder":
+            return bi_cost
+        if mode == "cascade":
+            return bi_cost + min(cascade_k, n_works) * n_queries * self.per_pair_ms
+        if mode == "cross_encoder":
+            return n_works * n_queries * self.per_pair_ms
+        raise ValueError(f"Unknown rerank mode: {mode}")
+
+    def plan(self, n_works: int, n_queries: int, budget_ms: float, ceiling: str = "cross_encoder") -> RerankPlan:
+        """
+        Pick the best-quality mode, no better than `ceiling`, whose estimated
+        cost fits in `budget_ms`. The cascade gets the largest top-k that fits.
+        """
+        n_queries = max(1, n_queries)
+        for mode in RERANK_MODES[RERANK_MODES.index(ceiling):]:
+            if mode == "cascade":
+                spare_ms = budget_ms - self.estimate_ms("bi_encoder", n_works, n_queries)
+                if spare_ms <= 0 or self.per_pair_ms <= 0:
+                    continue
+                k = min(n_works, int(math.floor(spare_ms / (n_queries * self.per_pair_ms))))
+                if k < app_settings.rerank_cascade_min_k:
+                    continue
+                return RerankPlan(mode, self.estimate_ms(mode, n_works, n_queries, k), cascade_k=k)
+
+            estimated = self.estimate_ms(mode, n_works, n_queries)
+            if estimated <= budget_ms:
+                return RerankPlan(mode, estimated)
+        return RerankPlan("openalex", 0.0)
+
+
+@lru_cache(maxsize=1)
+def get_cost_model() -> RerankCostModel:
+    # One calibration state per process
+    return RerankCostModel(
+        per_pair_ms=app_settings.rerank_cost_per_pair_ms,
+        per_text_ms=app_settings.rerank_cost_per_text_ms,
+    )
@@ -0,0 +1,123 @@
+# backend/app/services/dedup_service.py
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..schemas import WorkSummary, WorksSearchResponse
+from ..config import app_settings
+from ..work_store import get_work_store, search_text, text_hash
+from ...data.fetch import _sanitize_term
+
+
+def title_key(title: str) -> Optional[str]:
+    """
+    Hash of the title with case, accents, punctuation and spacing removed,
+    so "Molecular Communication: A Survey" and "molecular communication - a survey" collide.
+    """
+    normalized = re.sub(r"[^a-z0-9]+", " ", _sanitize_term(title or "").lower()).strip()
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # the earlier position stays the root, so clusters keep first-seen order
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def _cached_embeddings(works: List[WorkSummary]) -> Dict[int, np.ndarray]:
+    # only works scored before have an embedding in the store; nothing is encoded here
+    hashes = {w.id: text_hash(search_text(w)) for w in works if w.id}
+    stored = get_work_store().get_embeddings(hashes)
+    return {i: stored[w.id] for i, w in enumerate(works) if w.id in stored}
+
+
+def _representative_rank(work: WorkSummary, position: int):
+    # best OpenAlex relevance first, then the most complete record, then the earliest
+    return (-(work.relevance_score or 0.0), -len(work.abstract or ""), position)
+
+
+def dedup_works(
+    workList: WorksSearchResponse,
+    known: Optional[List[WorkSummary]] = None,
+    threshold: Optional[float] = None,
+) -> WorksSearchResponse:
+    """
+    Collapse duplicate candidates (e.g. preprint + article of one paper) before
+    the expensive rerankers. Works are clustered when they share an id, a
+    normalized title and publication year (generic titles such as
+    "Introduction" alone are not enough), or their cached bi-encoder embeddings have cosine
+    similarity >= threshold; one representative per cluster is kept, in the
+    position of the cluster's first member.
+
+    Dedup runs before scoring, so the embedding tier only compares works whose
+    embeddings an earlier rerank already stored: it catches a new candidate
+    duplicating a previously scored work (or two previously scored works), never
+    two works seen for the first time. Those fall to the id and title tiers.
+
+    `known` works are already kept elsewhere (an earlier page): candidates
+    clustering with any of them are dropped.
+    """
+    if threshold is None:
+        threshold = app_settings.dedup_similarity_threshold
+    known = known or []
+    if not known and len(workList.results) <= 1:
+        return workList
+    works = list(known) + list(workList.results)
+    n_known = len(known)
+
+    uf = _UnionFind(len(works))
+
+    first_by_key: Dict[str, int] = {}
+    for i, work in enumerate(works):
+        keys = []
+        if work.id:
+            keys.append(f"id:{work.id}")
+        tkey = title_key(work.title)
+        if tkey and work.publication_year is not None:
+            keys.append(f"title:{tkey}:{work.publication_year}")
+        for key in keys:
+            if key in first_by_key:
+                uf.union(first_by_key[key], i)
+            else:
+                first_by_key[key] = i
+
+    embeddings = _cached_embeddings(works)
+    if len(embeddings) > 1 and threshold <= 1.0:
+        rows = np.asarray(list(embeddings.keys()))
+        emb = np.stack([embeddings[i] for i in rows]).astype(np.float32)
+        emb /= np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+        sims = np.triu(emb @ emb.T, k=1)
+        for a, b in zip(*np.nonzero(sims >= threshold)):
+            uf.union(int(rows[a]), int(rows[b]))
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(works)):
+        clusters.setdefault(uf.find(i), []).append(i)
+
+    keep = []
+    for root, members in clusters.items():
+        if any(i < n_known for i in members):
+            continue
+        best = min(members, key=lambda i: _representative_rank(works[i], i))
+        keep.append((root, best))
+
+    keep.sort()
+    removed = len(works) - n_known - len(keep)
+    if removed:
+        print(f"Dedup collapsed {removed} duplicate candidate(s)")
+    return workList.model_copy(update={"results": [works[i] for _, i in keep]})
@@ -0,0 +1,74 @@
+# backend/app/services/diversity_service.py
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..schemas import WorksSearchResponse
+from ..config import app_settings
+from .semantic_rerank_service import build_search_space_representation, encode_search_space
+
+
+def mmr_select(relevance: np.ndarray, emb: np.ndarray, lambda_: float, k: int) -> List[int]:
+    """
+    Maximal Marginal Relevance: k row indices, each maximizing
+        lambda * relevance - (1 - lambda) * max cosine similarity to the rows already picked.
+    The running max similarity is one vector updated per pick (n x d work per
+    step), so the cost is O(k * n * d) NumPy with no pairwise Python loop.
+    """
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    emb = emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+    gain = lambda_ * relevance
+    penalty = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    picked: List[int] = []
+    for step in range(k):
+        mmr = np.where(available, gain - (1.0 - lambda_) * penalty, -np.inf)
+        i = int(np.argmax(mmr))
+        picked.append(i)
+        available[i] = False
+        sims = emb @ emb[i]
+        penalty = sims if step == 0 else np.maximum(penalty, sims)
+    return picked
+
+
+def _relevance(workList: WorksSearchResponse, scores: Optional[Dict[str, float]]) -> np.ndarray:
+    """
+    Relevance in [0, 1]: min-max normalized scores (cross-encoder logits are
+    unbounded), or linear in rank when the ranking came without scores.
+    """
+    n = len(workList.results)
+    if scores:
+        raw = np.asarray([scores.get(w.id, np.nan) for w in workList.results], dtype=np.float32)
+        if not np.isnan(raw).all():
+            raw = np.nan_to_num(raw, nan=float(np.nanmin(raw)))
+            span = float(raw.max() - raw.min())
+            return (raw - raw.min()) / span if span > 0 else np.ones(n, dtype=np.float32)
+    return np.linspace(1.0, 0.0, n, dtype=np.float32) if n > 1 else np.ones(n, dtype=np.float32)
+
+
+def diversify(
+    workList: WorksSearchResponse,
+    scores: Optional[Dict[str, float]],
+    lambda_: float,
+    k: Optional[int] = None,
+) -> WorksSearchResponse:
+    """
+    Reorder the top `k` of a ranking with MMR; the rest keeps its order.
+    Embeddings come from the work store when cached (bi-encoder / hybrid
+    rankings), and are encoded and cached otherwise.
+    """
+    k = k or app_settings.mmr_k
+    if len(workList.results) <= 1 or lambda_ >= 1.0:
+        return workList
+    search_space = build_search_space_representation(workList)
+    row_of = {work_id: i for i, work_id in enumerate(search_space)}
+    emb = encode_search_space(search_space)[[row_of[w.id] for w in workList.results]]
+    picked = mmr_select(_relevance(workList, scores), emb, lambda_, k)
+
+    chosen = set(picked)
+    rest = [w for i, w in enumerate(workList.results) if i not in chosen]
+    return workList.model_copy(update={"results": [workList.results[i] for i in picked] + rest})
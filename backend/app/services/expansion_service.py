@@ -0,0 +1,111 @@
+# backend/app/services/expansion_service.py
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..schemas import WorkSummary, WorksSearchRequest, WorksSearchResponse
+from ..config import app_settings
+from ..work_store import get_work_store
+from ...data.client import OpenAlexClient, OpenAlexError
+from ...data.fetch import SEARCH_WORK_TYPES, fetch_works_by_ids, select_for
+from ...data.records import WorkRecord
+from .works_service import record_to_summary
+from .dedup_service import dedup_works
+from .session_service import merge_ranked
+
+
+def neighbor_ids(link_records: Iterable[Dict], exclude: Set[str], limit: int) -> List[str]:
+    """
+    Works cited by or related to the given records, most shared first
+    (ties in first-seen order), without the ids in `exclude`.
+    """
+    counts: Counter = Counter()
+    for r in link_records:
+        for wid in (r.get("referenced_works") or []) + (r.get("related_works") or []):
+            if wid and wid not in exclude:
+                counts[wid] += 1
+    return [wid for wid, _ in counts.most_common(limit)]
+
+
+def _remaining_s(deadline: float) -> float:
+    return max(0.0, deadline - time.perf_counter())
+
+
+def expand_candidates(
+    client: OpenAlexClient,
+    ranked: WorksSearchResponse,
+    top_k: Optional[int] = None,
+    max_new: Optional[int] = None,
+    max_latency_ms: Optional[float] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> List[WorkSummary]:
+    """
+    Works the keyword filter missed: the references and related works of the
+    top `top_k` ranked works, at most `max_new`, most shared first.
+
+    Two batched id lookups: the link lists of the top works, then the records
+    of the neighbours, restricted to the search's date range and work types
+    (so the work store, which keeps neither, cannot answer the second). Both
+    share the `max_latency_ms` budget; lookups that do not make it are dropped.
+    """
+    top_k = top_k or app_settings.expansion_top_k
+    max_new = max_new or app_settings.expansion_max_new
+    if max_latency_ms is None:
+        max_latency_ms = app_settings.expansion_max_latency_ms
+    deadline = time.perf_counter() + max_latency_ms / 1000.0
+
+    top = [w.id for w in ranked.results[:top_k] if w.id]
+    if not top:
+        return []
+    links = fetch_works_by_ids(client, top, select_fields=select_for("citations"), timeout_s=_remaining_s(deadline))
+    ids = neighbor_ids(links, exclude={w.id for w in ranked.results}, limit=max_new)
+    if not ids:
+        return []
+
+    if _remaining_s(deadline) <= 0:
+        return []
+    records = fetch_works_by_ids(
+        client,
+        ids,
+        select_fields=select_for("search"),
+        timeout_s=_remaining_s(deadline),
+        start_date=start_date,
+        end_date=end_date,
+        work_types=SEARCH_WORK_TYPES,
+    )
+    hydrated = [record_to_summary(WorkRecord(r)) for r in records]
+    get_work_store().upsert_many(hydrated)
+
+    by_id = {w.id: w for w in hydrated}
+    new = [by_id[wid] for wid in ids if wid in by_id]
+    print(f"Citation expansion: {len(new)} new candidate(s) of {len(ids)} neighbour(s)")
+    return new
+
+
+def expand_ranking(
+    client: OpenAlexClient,
+    payload: WorksSearchRequest,
+    mode: str,
+    ranked: WorksSearchResponse,
+    scores: Optional[Dict[str, float]],
+    max_latency_ms: Optional[float] = None,
+) -> Tuple[WorksSearchResponse, Optional[Dict[str, float]]]:
+    """
+    Add citation-graph neighbours of the top works to a ranking, scored like the rest.
+    Expansion is best effort: OpenAlex errors leave the ranking as it was.
+    """
+    try:
+        new = expand_candidates(
+            client, ranked, max_latency_ms=max_latency_ms, start_date=payload.start_date, end_date=payload.end_date
+        )
+    except OpenAlexError as exc:
+        print(f"Citation expansion skipped: {exc}")
+        return ranked, scores
+    if new and app_settings.dedup_enabled:
+        new = dedup_works(WorksSearchResponse(results=new), known=ranked.results).results
+    if not new:
+        return ranked, scores
+
+    merged, merged_scores = merge_ranked(mode, payload, list(ranked.results), scores or {}, new)
+    return ranked.model_copy(update={"results": merged}), merged_scores or scores
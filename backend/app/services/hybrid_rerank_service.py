@@ -0,0 +1,107 @@
+# backend/app/services/hybrid_rerank_service.py
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..schemas import WorksSearchResponse, WorksSearchRequest
+from ..config import app_settings
+from .lexical_service import BM25Index
+from .semantic_rerank_service import (
+    build_search_space_representation,
+    build_query_space_representation,
+    score_works_sentence_transformer,
+    sort_works_by_scores,
+)
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    if values.size == 0:
+        return values
+    lo, hi = float(values.min()), float(values.max())
+    if hi - lo <= 1e-12:
+        return np.zeros_like(values, dtype=np.float32)
+    return ((values - lo) / (hi - lo)).astype(np.float32)
+
+
+def score_works_bm25(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> Dict[str, float]:
+    search_space = build_search_space_representation(workList) #Dict
+    query_space = build_query_space_representation(searchRequest) #List[str]
+
+    if not search_space or not query_space:
+        return {}
+
+    index = BM25Index(search_space)
+    scores = index.score_many(query_space)
+    return dict(zip(index.doc_ids, scores.tolist()))
+
+
+def fuse_scores(
+    work_ids: List[str],
+    signals: Dict[str, Dict[str, float]],
+    weights: Dict[str, float],
+) -> Dict[str, float]:
+    """
+    Weighted sum of min-max normalized signals. A signal that is missing for
+    every work is dropped and the remaining weights are renormalized.
+    """
+    fused = np.zeros(len(work_ids), dtype=np.float32)
+    total_weight = 0.0
+    for name, scores in signals.items():
+        weight = weights.get(name, 0.0)
+        if weight <= 0 or not scores:
+            continue
+        raw = np.array([scores.get(wid, np.nan) for wid in work_ids], dtype=np.float32)
+        if np.isnan(raw).all():
+            continue
+        raw = np.where(np.isnan(raw), np.nanmin(raw), raw)
+        fused += weight * _min_max(raw)
+        total_weight += weight
+
+    if total_weight > 0:
+        fused /= total_weight
+    return dict(zip(work_ids, fused.tolist()))
+
+
+def score_works_hybrid(
+    searchRequest: WorksSearchRequest,
+    workList: WorksSearchResponse,
+    weights: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """
+    Fuse BM25 over the candidate text, bi-encoder cosine similarity and the
+    OpenAlex relevance_score. Needs no cross-encoder.
+    """
+    if weights is None:
+        weights = {
+            "lexical": app_settings.hybrid_lexical_weight,
+            "semantic": app_settings.hybrid_semantic_weight,
+            "openalex": app_settings.hybrid_openalex_weight,
+        }
+
+    lexical = score_works_bm25(searchRequest, workList)
+    if not lexical:
+        return {}
+
+    semantic = score_works_sentence_transformer(searchRequest, workList) if weights.get("semantic", 0.0) > 0 else {}
+    openalex = {
+        work.id: work.relevance_score
+        for work in workList.results
+        if work.relevance_score is not None
+    }
+
+    return fuse_scores(
+        list(lexical.keys()),
+        {"lexical": lexical, "semantic": semantic, "openalex": openalex},
+        weights,
+    )
+
+
+def rerank_works_by_query_hybrid(
+    searchRequest: WorksSearchRequest,
+    workList: WorksSearchResponse,
+    weights: Optional[Dict[str, float]] = None,
+) -> WorksSearchResponse:
+    fused = score_works_hybrid(searchRequest, workList, weights)
+    if not fused:
+        return workList
+    return sort_works_by_scores(workList, fused)
@@ -0,0 +1,86 @@
+# backend/app/services/lexical_service.py
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from ...data.fetch import _sanitize_term
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Same normalization as the OpenAlex filter builder, so lexical scores
+    see the terms exactly the way the retrieval stage sent them.
+    """
+    tokens = []
+    for token in _sanitize_term(text or "").lower().split():
+        token = token.strip(".-")
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a small in-memory corpus.
+
+    Postings are kept as a CSR-style inverted index (term -> doc rows) in flat
+    NumPy arrays, and the BM25 weight of every posting is computed once at build
+    time, so scoring a query is a gather + add over the matching postings.
+    """
+
+    def __init__(self, documents: Dict[str, str], k1: float = 1.5, b: float = 0.75) -> None:
+        self.doc_ids: List[str] = list(documents.keys())
+        self.vocab: Dict[str, int] = {}
+
+        term_rows: List[int] = []
+        doc_rows: List[int] = []
+        tfs: List[int] = []
+        doc_lens = np.zeros(len(self.doc_ids), dtype=np.float32)
+
+        for doc_row, text in enumerate(documents.values()):
+            counts = Counter(tokenize(text))
+            doc_lens[doc_row] = sum(counts.values())
+            for term, tf in counts.items():
+                term_rows.append(self.vocab.setdefault(term, len(self.vocab)))
+                doc_rows.append(doc_row)
+                tfs.append(tf)
+
+        term_arr = np.asarray(term_rows, dtype=np.int32)
+        order = np.argsort(term_arr, kind="stable")
+
+        self.indices = np.asarray(doc_rows, dtype=np.int32)[order]
+        tf_arr = np.asarray(tfs, dtype=np.float32)[order]
+        df = np.bincount(term_arr, minlength=len(self.vocab)).astype(np.float32)
+        self.indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+        n_docs = len(self.doc_ids)
+        avg_len = float(doc_lens.mean()) if n_docs and doc_lens.mean() > 0 else 1.0
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        norm = k1 * (1.0 - b + b * doc_lens[self.indices] / avg_len)
+        posting_idf = np.repeat(self.idf, df.astype(np.int64))
+        self.weights = (posting_idf * tf_arr * (k1 + 1.0) / (tf_arr + norm)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def score(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            row = self.vocab.get(term)
+            if row is None:
+                continue
+            start, end = self.indptr[row], self.indptr[row + 1]
+            # each doc appears at most once per term, so plain fancy-index add is safe
+            scores[self.indices[start:end]] += self.weights[start:end]
+        return scores
+
+    def score_many(self, queries: List[str]) -> np.ndarray:
+        """
+        Mean BM25 score across several query strings (one per abstract),
+        mirroring how the bi-encoder averages over the query space.
+        """
+        if not queries or not self.doc_ids:
+            return np.zeros(len(self.doc_ids), dtype=np.float32)
+        return np.mean([self.score(q) for q in queries], axis=0)
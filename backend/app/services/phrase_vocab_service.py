@@ -0,0 +1,106 @@
+# backend/app/services/phrase_vocab_service.py
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from ..config import app_settings
+from ..cache import get_phrase_vocab_dir
+from .semantic_rerank_service import get_sentence_transformer
+
+MODEL_NAME = app_settings.bi_encoder_model   # vectors must come from the same encoder
+META_FILE = "phrases.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+
+
+def _analyzer(ngram_range: Tuple[int, int]):
+    # KeyBERT's default candidate tokenization (CountVectorizer, English stop words)
+    return CountVectorizer(ngram_range=tuple(ngram_range), stop_words="english").build_analyzer()
+
+
+def mine_phrases(
+    texts: Sequence[str],
+    ngram_range: Tuple[int, int] = (1, 2),
+    min_df: int = 2,
+    max_phrases: int = 50000,
+) -> List[str]:
+    """
+    Candidate phrases seen in at least `min_df` texts, most frequent first.
+    """
+    vectorizer = CountVectorizer(
+        ngram_range=tuple(ngram_range),
+        stop_words="english",
+        min_df=min(min_df, max(1, len(texts))),
+        max_features=max_phrases,
+    )
+    counts = vectorizer.fit_transform(texts)
+    df = np.asarray((counts > 0).sum(axis=0)).ravel()
+    names = vectorizer.get_feature_names_out()
+    return [str(names[i]) for i in np.argsort(-df, kind="stable")]
+
+
+def build_vocabulary(
+    directory: Path,
+    phrases: List[str],
+    ngram_range: Tuple[int, int],
+    dtype: str = "float32",
+    batch_size: int = 256,
+) -> None:
+    """
+    Embed `phrases` with the bi-encoder and write the vocabulary:
+    phrases.json (phrases + metadata) and embeddings.npy (normalized, row per phrase).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    emb = get_sentence_transformer().encode(
+        phrases, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+    ).astype(dtype)
+    np.save(directory / EMBEDDINGS_FILE, emb)
+    meta = {"model": MODEL_NAME, "dim": int(emb.shape[1]), "ngram_range": list(ngram_range), "phrases": phrases}
+    (directory / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+
+class PhraseVocabulary:
+    """
+    Prebuilt phrase vocabulary with its embeddings memory-mapped, so the matrix
+    is paged in on demand and shared between worker processes.
+
+    Extraction matches the text's n-grams against the vocabulary, encodes the
+    text once and ranks the matched phrases with one matrix-vector product,
+    instead of embedding every candidate n-gram per request as KeyBERT does.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+        if meta.get("model") != MODEL_NAME:
+            raise ValueError(f"phrase vocabulary was built with {meta.get('model')}, not {MODEL_NAME}")
+        self.phrases: List[str] = meta["phrases"]
+        self.ngram_range = tuple(meta["ngram_range"])
+        self.row_of: Dict[str, int] = {p: i for i, p in enumerate(self.phrases)}
+        self.embeddings = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r")
+        self._analyze = _analyzer(self.ngram_range)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def candidates(self, text: str) -> List[int]:
+        return list(dict.fromkeys(self.row_of[g] for g in self._analyze(text) if g in self.row_of))
+
+    def extract(self, text: str, top_n: int = 8) -> List[str]:
+        rows = np.sort(np.asarray(self.candidates(text), dtype=np.int64))  # sorted: sequential memmap reads
+        if not len(rows):
+            return []
+        doc = get_sentence_transformer().encode([text], convert_to_numpy=True, normalize_embeddings=True)[0]
+        scores = np.asarray(self.embeddings[rows], dtype=np.float32) @ doc
+        return [self.phrases[i] for i in rows[np.argsort(-scores, kind="stable")[:top_n]]]
+
+
+@lru_cache(maxsize=1)
+def get_phrase_vocabulary() -> Optional[PhraseVocabulary]:
+    # Load once per process; None when no vocabulary has been built
+    directory = Path(app_settings.keyword_vocab_path or get_phrase_vocab_dir())
+    if not (directory / META_FILE).exists():
+        return None
+    return PhraseVocabulary(directory)
@@ -0,0 +1,123 @@
+# backend/app/services/prefetch_service.py
+from functools import partial
+from typing import Dict, List
+
+from ..schemas import WorkSummary, WorksSearchRequest, WorksSearchResponse
+from ..config import app_settings
+from ..prefetch import Checkpoint, get_prefetcher
+from ...data.client import OpenAlexClient
+from .works_service import SearchPlan
+from .query_cache import get_query_cache
+from .semantic_rerank_service import (
+    build_search_space_representation,
+    encode_search_space,
+    score_works_cross_encoder,
+    sort_works_by_scores,
+)
+from .session_service import PendingPage, SearchSession, fetch_next_page, fold_page, score_page
+
+# views users switch from to the cross-encoder one
+_CROSS_ENCODER_FROM = {"openalex", "bi_encoder", "hybrid"}
+
+
+def _score_page(session: SearchSession, pending: PendingPage, checkpoint: Checkpoint) -> Dict[str, float]:
+    # chunked so a foreground request waits for one chunk at most; hybrid scores
+    # are normalized over the whole pool, so they come in one piece
+    if session.mode == "hybrid":
+        checkpoint()
+        return score_page(session.mode, session.payload, pending.ranked, pending.fresh)
+    scores: Dict[str, float] = {}
+    size = app_settings.prefetch_chunk_size
+    for i in range(0, len(pending.fresh), size):
+        checkpoint()
+        scores.update(score_page(session.mode, session.payload, pending.ranked, pending.fresh[i:i + size]))
+    return scores
+
+
+def prefetch_next_page(session: SearchSession, client: OpenAlexClient, checkpoint: Checkpoint) -> None:
+    """
+    Keep `prefetch_pages_ahead` result pages ready past the ones served: fetch
+    the next OpenAlex pages, score them for the session's mode and embed the
+    new works into the work store.
+
+    Fetching and scoring run without the session lock, which is only taken to
+    fold a page into the pool, so a /more request never waits behind them.
+    A page the /more request fetched itself meanwhile is discarded.
+    """
+    wanted = app_settings.prefetch_pages_ahead * app_settings.session_page_size
+    while True:
+        checkpoint()
+        # a /more request holding the lock is extending the pool itself
+        if not session.lock.acquire(blocking=False):
+            return
+        try:
+            if session.exhausted or len(session.ranked) - session.served >= wanted:
+                return
+            if not session.overflow and session.next_openalex_page > app_settings.session_max_openalex_pages:
+                session.exhausted = True
+                return
+        finally:
+            session.lock.release()
+
+        pending = fetch_next_page(session, client)
+        # what merge_ranked would score under the lock: nothing for OpenAlex order or unscored pools
+        if pending.fresh and (session.mode == "cascade" or (session.scores and session.mode != "openalex")):
+            pending.page_scores = _score_page(session, pending, checkpoint)
+        checkpoint()
+
+        if not session.lock.acquire(blocking=False):
+            return
+        try:
+            fresh = fold_page(session, pending, served=session.served)
+        finally:
+            session.lock.release()
+        if fresh is None:
+            return
+
+        if fresh:
+            checkpoint()
+            # already cached for bi-encoder / hybrid pools, whose scorers embed them
+            encode_search_space(build_search_space_representation(WorksSearchResponse(results=fresh)))
+
+
+def precompute_cross_encoder(
+    payload: WorksSearchRequest,
+    plan: SearchPlan,
+    pool: List[WorkSummary],
+    checkpoint: Checkpoint,
+) -> None:
+    """
+    Cross-encoder ranking of a session's first pool, stored in the query cache
+    under the cross-encoder route's key so switching views is a cache hit.
+    Scored in chunks, so a foreground request waits for one chunk at most.
+    """
+    cache = get_query_cache()
+    if cache.contains(payload, "cross_encoder"):
+        return
+    scores = {}
+    size = app_settings.prefetch_chunk_size
+    for i in range(0, len(pool), size):
+        checkpoint()
+        scores.update(score_works_cross_encoder(payload, WorksSearchResponse(results=pool[i:i + size])))
+    if not scores:
+        return
+    ranked = sort_works_by_scores(WorksSearchResponse(results=pool), scores)
+    cache.put(payload, "cross_encoder", plan, ranked, scores)
+
+
+def prefetch_after_response(session: SearchSession, client: OpenAlexClient, first_page: bool = False) -> None:
+    """
+    Queue the likely next work for a session whose page was just sent: the next
+    results page and, after a first page, the cross-encoder view of its pool.
+    """
+    if not app_settings.prefetch_enabled:
+        return
+    prefetcher = get_prefetcher()
+    # snapshot before the page job can grow the pool
+    pool = list(session.ranked)
+    prefetcher.submit(session.token, "next_page", partial(prefetch_next_page, session, client))
+    if (first_page and app_settings.prefetch_cross_encoder and app_settings.query_cache_enabled
+            and session.mode in _CROSS_ENCODER_FROM):
+        prefetcher.submit(
+            session.token, "cross_encoder", partial(precompute_cross_encoder, session.payload, session.plan, pool)
+        )
@@ -0,0 +1,165 @@
+# backend/app/services/query_cache.py
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..schemas import WorksSearchRequest, WorksSearchResponse
+from ..config import app_settings
+from .works_service import SearchPlan
+from .semantic_rerank_service import build_query_space_representation, get_sentence_transformer
+
+CacheKey = Tuple
+
+# modes without a semantic tier: plain OpenAlex search loads no model, and
+# embedding its queries would load the bi-encoder for every cache miss
+_EXACT_ONLY_MODES = {"openalex"}
+
+
+@dataclass
+class CachedSearch:
+    plan: SearchPlan
+    mode: str
+    ranked: WorksSearchResponse
+    scores: Dict[str, float]
+    embedding: Optional[np.ndarray] = None
+    expires_at: float = 0.0
+
+
+@dataclass
+class CacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
+
+
+def normalize_request(payload: WorksSearchRequest, mode: str) -> CacheKey:
+    """
+    Exact-match key: keyword order and case do not matter, abstracts are
+    compared stripped and lowercased.
+    """
+    keywords = tuple(sorted({(k or "").strip().lower() for k in payload.keywords or [] if (k or "").strip()}))
+    abstracts = tuple(sorted((a or "").strip().lower() for a in payload.abstracts or [] if (a or "").strip()))
+    return (mode, keywords, abstracts, payload.start_date, payload.end_date)
+
+
+def _embed_query(payload: WorksSearchRequest) -> Optional[np.ndarray]:
+    query_space = build_query_space_representation(payload)
+    if not query_space:
+        return None
+    emb = get_sentence_transformer().encode(query_space, convert_to_numpy=True).mean(axis=0)
+    return (emb / max(float(np.linalg.norm(emb)), 1e-12)).astype(np.float32)
+
+
+class QueryResultCache:
+    """
+    Ranked results per query, in two tiers:
+      1. exact match on the normalized request
+      2. cosine similarity of the query embedding >= `threshold`, among entries with
+         the same mode and date range (paraphrased / slightly edited queries);
+         not for the model-free "openalex" mode
+    Entries expire after `ttl_s`; the least recently used one is evicted past `max_entries`.
+    """
+
+    def __init__(self, ttl_s: float, max_entries: int, threshold: float) -> None:
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, CachedSearch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _semantic(self, mode: str) -> bool:
+        return self.threshold <= 1.0 and mode not in _EXACT_ONLY_MODES
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for k in expired:
+            del self._entries[k]
+        self.stats.expirations += len(expired)
+
+    def get(self, payload: WorksSearchRequest, mode: str) -> Optional[CachedSearch]:
+        key = normalize_request(payload, mode)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.exact_hits += 1
+                return entry
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if e.embedding is not None and k[0] == key[0] and k[3:] == key[3:]
+            ]
+
+        if self._semantic(mode) and candidates:
+            query_emb = _embed_query(payload)
+            if query_emb is not None:
+                sims = np.stack([e.embedding for _, e in candidates]) @ query_emb
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    best_key, best_entry = candidates[best]
+                    with self._lock:
+                        if best_key in self._entries:
+                            self._entries.move_to_end(best_key)
+                            self.stats.semantic_hits += 1
+                            return best_entry
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def contains(self, payload: WorksSearchRequest, mode: str) -> bool:
+        # exact-key check that does not count as a lookup
+        key = normalize_request(payload, mode)
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > time.monotonic()
+
+    def put(self, payload: WorksSearchRequest, mode: str, plan: SearchPlan, ranked: WorksSearchResponse, scores: Optional[Dict[str, float]]) -> None:
+        entry = CachedSearch(
+            plan=plan,
+            mode=mode,
+            ranked=ranked,
+            scores=dict(scores or {}),
+            embedding=_embed_query(payload) if self._semantic(mode) else None,
+            expires_at=time.monotonic() + self.ttl_s,
+        )
+        key = normalize_request(payload, mode)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> QueryResultCache:
+    # One cache per process
+    return QueryResultCache(
+        ttl_s=app_settings.query_cache_ttl_s,
+        max_entries=app_settings.query_cache_max_entries,
+        threshold=app_settings.query_cache_semantic_threshold,
+    )
@@ -1,4 +1,5 @@
 # backend/app/services/semantic_rerank_service.py
+import time
 from functools import lru_cache
 from typing import List, Dict
 import numpy as np
@@ -7,11 +8,15 @@ from sentence_transformers import SentenceTransformer, util, CrossEncoder
 
 from ..schemas import WorksSearchResponse, WorksSearchRequest
 from ..cache import get_model_cache_dir
+from ..config import app_settings
+from ..quantization import two_stage_cosine
+from ..work_store import get_work_store, search_text, text_hash
+from .cost_model import get_cost_model
 
 @lru_cache(maxsize=1)
 def get_sentence_transformer() -> SentenceTransformer:
     # Load once per process
-    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", 
+    return SentenceTransformer(app_settings.bi_encoder_model,
                                cache_folder=get_model_cache_dir(),
                                device="cpu",
                                 model_kwargs={
@@ -34,12 +39,31 @@ def get_cross_encoder():
 def build_search_space_representation(workList: WorksSearchResponse) -> Dict:
     search_space ={}
     for work in workList.results:
-        keywords = (work.keywords or "").strip().lower()
-        abstract = (work.abstract or "").strip().lower()
-        search_space[work.id] = f"{keywords} {abstract}".strip()
+        search_space[work.id] = search_text(work)
     return search_space
 
 
+def encode_search_space(search_space: Dict[str, str]) -> np.ndarray:
+    """
+    Bi-encoder embeddings for the search space, in its order. Embeddings of works
+    in the work store are reused when their text is unchanged; new ones are written back.
+    """
+    store = get_work_store()
+    hashes = {work_id: text_hash(text) for work_id, text in search_space.items()}
+    cached = store.get_embeddings(hashes)
+
+    missing = [work_id for work_id in search_space if work_id not in cached]
+    if missing:
+        model = get_sentence_transformer()
+        started = time.perf_counter()
+        fresh = model.encode([search_space[work_id] for work_id in missing], convert_to_numpy=True)
+        get_cost_model().observe_bi_encoder(len(missing), time.perf_counter() - started)
+        store.put_embeddings({work_id: (hashes[work_id], emb) for work_id, emb in zip(missing, fresh)})
+        cached.update(zip(missing, fresh))
+
+    return np.stack([cached[work_id] for work_id in search_space]).astype(np.float32)
+
+
 def build_query_space_representation(searchRequest: WorksSearchRequest) -> List[str]:
     query_space = []
     
@@ -59,37 +83,56 @@ def build_query_space_representation(searchRequest: WorksSearchRequest) -> List[
     return query_space
 
 
-def rerank_works_by_query_sentence_transformer(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> WorksSearchResponse:
+def sort_works_by_scores(workList: WorksSearchResponse, scores: Dict[str, float]) -> WorksSearchResponse:
+    work_lookup = {work.id: work for work in workList.results}
+    scored_works = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+    sorted_results = [
+        work_lookup[work_id] 
+        for work_id, _ in scored_works 
+        if work_id in work_lookup
+    ]
+    return WorksSearchResponse(results=sorted_results)
 
+
+def score_works_sentence_transformer(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> Dict[str, float]:
+    """
+    Mean cosine similarity of every work against the query space, keyed by work id.
+    Returns an empty dict when there is nothing to compare.
+    """
     search_space = build_search_space_representation(workList) #Dict
     query_space = build_query_space_representation(searchRequest) #List[str]
 
     if not search_space or not query_space:
-        return workList
+        return {}
 
     model = get_sentence_transformer()
-    query_emb = model.encode(query_space, convert_to_tensor=True) #dim: abstract_num x embed_dim
+    started = time.perf_counter()
+    query_emb = model.encode(query_space, convert_to_numpy=True) #dim: abstract_num x embed_dim
+    get_cost_model().observe_bi_encoder(len(query_space), time.perf_counter() - started)
 
-    search_space_list = [item for item in search_space.values()]
-    search_emb = model.encode(search_space_list, convert_to_tensor=True) #dim: #_of_results_from_openalex x embed_dim
+    search_emb = encode_search_space(search_space) #dim: #_of_results_from_openalex x embed_dim
 
-    scores = util.cos_sim(query_emb, search_emb).mean(dim=0)  # shape: (# of_results_from_openalex,)
+    if len(search_space) >= app_settings.bi_encoder_prefilter_min_works:
+        # large pools: Hamming prefilter over sign codes, exact cosine for the survivors only
+        scores = two_stage_cosine(query_emb, search_emb, rescore_k=app_settings.bi_encoder_rescore_k)
+    else:
+        scores = util.cos_sim(query_emb, search_emb).mean(dim=0)  # shape: (# of_results_from_openalex,)
 
-    work_ids = list(search_space.keys())
-    work_lookup = {work.id: work for work in workList.results}
-    scored_works = sorted(zip(work_ids, scores.tolist()), key=lambda x: x[1], reverse=True)
+    return dict(zip(search_space.keys(), scores.tolist()))
 
-    sorted_results = [
-        work_lookup[work_id] 
-        for work_id, _ in scored_works 
-        if work_id in work_lookup
-    ]
-    return WorksSearchResponse(results=sorted_results)
+
+def rerank_works_by_query_sentence_transformer(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> WorksSearchResponse:
+
+    scores = score_works_sentence_transformer(searchRequest, workList)
+
+    if not scores:
+        return workList
+
+    return sort_works_by_scores(workList, scores)
     
     
-def rerank_works_by_query_cross_encoder(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> WorksSearchResponse:
-    model = get_cross_encoder()
-
+def build_cross_encoder_queries(searchRequest: WorksSearchRequest) -> List[str]:
     keywords = searchRequest.keywords or []
     query_str = " ".join(
         (k or "").strip().lower()
@@ -106,12 +149,21 @@ def rerank_works_by_query_cross_encoder(searchRequest: WorksSearchRequest, workL
         ]
     else:
         query_pairs = [query_str] if query_str else []
+    return query_pairs
+
+
+def score_works_cross_encoder(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> Dict[str, float]:
+    """
+    Mean cross-encoder score of every work over the query pairs, keyed by work id.
+    Returns an empty dict when there is nothing to score.
+    """
+    query_pairs = build_cross_encoder_queries(searchRequest)
     len_query_pairs = len(query_pairs)
     ranking_pairs = []
     work_ids_ordered = []
 
     if not query_pairs:
-        return workList
+        return {}
 
     for work in workList.results:
         doc_text = f"{work.title or ''} {work.abstract or ''}".strip()
@@ -120,20 +172,25 @@ def rerank_works_by_query_cross_encoder(searchRequest: WorksSearchRequest, workL
         work_ids_ordered.append(work.id)
 
     if not ranking_pairs:
-        return workList
+        return {}
 
+    model = get_cross_encoder()
+    started = time.perf_counter()
     scores = model.predict(ranking_pairs)
+    get_cost_model().observe_cross_encoder(len(ranking_pairs), time.perf_counter() - started)
+
     scores_final = []
     i=0
     while i<len(scores):
-        scores_final.append(np.mean(scores[i:i+len_query_pairs]))
+        scores_final.append(float(np.mean(scores[i:i+len_query_pairs])))
         i+=len_query_pairs
-    work_lookup = {work.id: work for work in workList.results}
-    scored_works = sorted(zip(work_ids_ordered, scores_final), key=lambda x: x[1], reverse=True)
+    return dict(zip(work_ids_ordered, scores_final))
 
-    sorted_results = [
-        work_lookup[work_id] 
-        for work_id, _ in scored_works 
-        if work_id in work_lookup
-    ]
-    return WorksSearchResponse(results=sorted_results)
+
+def rerank_works_by_query_cross_encoder(searchRequest: WorksSearchRequest, workList: WorksSearchResponse) -> WorksSearchResponse:
+    scores = score_works_cross_encoder(searchRequest, workList)
+
+    if not scores:
+        return workList
+
+    return sort_works_by_scores(workList, scores)
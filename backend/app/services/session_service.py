@@ -0,0 +1,278 @@
+# backend/app/services/session_service.py
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set
+
+from ..schemas import WorkSummary, WorksSearchRequest, WorksSearchResponse
+from ..config import app_settings
+from ..workers import token_prefix
+from ...data.client import OpenAlexClient
+from .works_service import SearchPlan, fetch_candidates
+from .semantic_rerank_service import (
+    score_works_sentence_transformer,
+    score_works_cross_encoder,
+    sort_works_by_scores,
+)
+from .hybrid_rerank_service import score_works_hybrid
+from .dedup_service import dedup_works
+
+Scorer = Callable[[WorksSearchRequest, WorksSearchResponse], Dict[str, float]]
+
+SCORERS: Dict[str, Optional[Scorer]] = {
+    "openalex": None,
+    "bi_encoder": score_works_sentence_transformer,
+    "cross_encoder": score_works_cross_encoder,
+    "hybrid": score_works_hybrid,
+}
+
+# modes whose scores are absolute, so a new page can be merged into the unserved tail
+# (hybrid scores are min-max normalized per candidate set, so the pool is rescored instead)
+_COMPARABLE = {"bi_encoder", "cross_encoder"}
+
+
+@dataclass
+class SearchSession:
+    """
+    A ranked candidate pool for one query. Pages are served from `ranked`;
+    OpenAlex pages beyond the first are fetched and scored only once the pool runs out.
+    Embeddings of the candidates live in the work store, keyed by work id.
+    """
+    token: str
+    payload: WorksSearchRequest
+    plan: SearchPlan
+    mode: str
+    ranked: List[WorkSummary]
+    scores: Dict[str, float]
+    seen_ids: Set[str]
+    next_openalex_page: int = 2
+    overflow: List[WorkSummary] = field(default_factory=list)   # fetched, not yet in the pool (plan.overflow)
+    exhausted: bool = False
+    served: int = 0                  # works handed out so far; their positions are fixed
+    expires_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+def rank_candidates(mode: str, payload: WorksSearchRequest, candidates: WorksSearchResponse):
+    """
+    Scores (possibly empty) and the candidates ordered by them; OpenAlex order is kept
+    for the "openalex" mode and when there is nothing to score.
+    """
+    scorer = SCORERS[mode]
+    scores = scorer(payload, candidates) if scorer else {}
+    ranked = sort_works_by_scores(candidates, scores) if scores else candidates
+    return ranked, scores
+
+
+def score_page(mode: str, payload: WorksSearchRequest, ranked: List[WorkSummary], fresh: List[WorkSummary]) -> Dict[str, float]:
+    """
+    The scoring merge_ranked needs to fold `fresh` into `ranked`: the fresh
+    works alone for comparable modes and cascade (bi-encoder order), the whole
+    pool for hybrid, nothing for OpenAlex order. Needs no session lock, and
+    outside hybrid can be computed in chunks of `fresh`.
+    """
+    if mode == "hybrid":
+        return score_works_hybrid(payload, WorksSearchResponse(results=ranked + fresh))
+    if mode == "cascade":
+        return score_works_sentence_transformer(payload, WorksSearchResponse(results=fresh))
+    scorer = SCORERS.get(mode)
+    return scorer(payload, WorksSearchResponse(results=fresh)) if scorer else {}
+
+
+def merge_ranked(
+    mode: str,
+    payload: WorksSearchRequest,
+    ranked: List[WorkSummary],
+    scores: Dict[str, float],
+    fresh: List[WorkSummary],
+    served: int = 0,
+    page_scores: Optional[Dict[str, float]] = None,
+):
+    """
+    Fold newly found works into a ranking, scoring only them where the mode's
+    scores are comparable. The first `served` works keep their positions.
+    `page_scores` is score_page's result when already computed for this `ranked`.
+    Returns the new ranking and scores.
+    """
+    head, tail = ranked[:served], ranked[served:]
+    if mode in _COMPARABLE and scores:
+        scores = dict(scores)
+        scores.update(page_scores if page_scores is not None else score_page(mode, payload, ranked, fresh))
+        pool = WorksSearchResponse(results=tail + fresh)
+        return head + sort_works_by_scores(pool, {w.id: scores.get(w.id, float("-inf")) for w in pool.results}).results, scores
+    if mode == "hybrid" and scores:
+        scores = page_scores if page_scores is not None else score_page(mode, payload, ranked, fresh)
+        rest = WorksSearchResponse(results=tail + fresh)
+        return head + sort_works_by_scores(rest, scores).results, scores
+    # OpenAlex order, or a mode whose scores cannot be compared across sets (cascade: bi-encoder order)
+    if mode == "cascade":
+        fresh_scores = page_scores if page_scores is not None else score_page(mode, payload, ranked, fresh)
+        if fresh_scores:
+            fresh = sort_works_by_scores(WorksSearchResponse(results=fresh), fresh_scores).results
+    return ranked + fresh, scores
+
+
+class SessionStore:
+    """
+    Search sessions by token, with a TTL (refreshed on access) and an LRU cap.
+    """
+
+    def __init__(self, ttl_s: float, max_sessions: int) -> None:
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SearchSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        expired = [t for t, s in self._sessions.items() if s.expires_at <= now]
+        for t in expired:
+            del self._sessions[t]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def open(
+        self,
+        payload: WorksSearchRequest,
+        plan: SearchPlan,
+        mode: str,
+        ranked: WorksSearchResponse,
+        scores: Optional[Dict[str, float]] = None,
+    ) -> SearchSession:
+        now = time.monotonic()
+        session = SearchSession(
+            # the owning worker's slot, so /more requests reaching another worker are forwarded
+            token=token_prefix() + secrets.token_urlsafe(16),
+            payload=payload,
+            plan=plan,
+            mode=mode,
+            ranked=list(ranked.results),
+            scores=dict(scores or {}),
+            seen_ids={w.id for w in ranked.results},
+            next_openalex_page=plan.next_page,
+            overflow=list(plan.overflow),
+            # judged on the raw OpenAlex page, before dedup shortened the pool
+            exhausted=plan.match_count is None or not (plan.more_pages or plan.overflow),
+            expires_at=now + self.ttl_s,
+        )
+        with self._lock:
+            self._sessions[session.token] = session
+            self._purge(now)
+        return session
+
+    def get(self, token: str) -> Optional[SearchSession]:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            session = self._sessions.get(token)
+            if session is not None:
+                session.expires_at = now + self.ttl_s
+                self._sessions.move_to_end(token)
+            return session
+
+
+@dataclass
+class PendingPage:
+    """
+    An OpenAlex page fetched for a session but not yet folded into its pool.
+    """
+    number: int                      # the session's next_openalex_page when fetched
+    page_ids: List[str]              # every id on the page, duplicates included
+    fresh: List[WorkSummary]         # new works, deduplicated against `ranked`
+    has_more: bool
+    ranked: List[WorkSummary]        # the pool it was fetched against
+    page_scores: Optional[Dict[str, float]] = None   # score_page(...) for `ranked`, if computed
+    from_overflow: bool = False      # the session's held-back overflow rather than a new OpenAlex page
+
+
+def fetch_next_page(session: SearchSession, client: OpenAlexClient) -> PendingPage:
+    """
+    Fetch and deduplicate the session's next OpenAlex page; the overflow the
+    first pool was cut from comes first, without a request. Does not need the
+    session lock: the pool is only read, and fold_page checks it is still current.
+    """
+    number, ranked, overflow = session.next_openalex_page, session.ranked, session.overflow
+    if overflow:
+        works, has_more = overflow, session.plan.more_pages
+    else:
+        page = fetch_candidates(client, session.plan, page=number)
+        # a short raw page is the last one
+        works, has_more = page.results, bool(page.has_more)
+    page_ids = [w.id for w in works if w.id]
+    fresh = [w for w in works if w.id and w.id not in session.seen_ids]
+    if fresh and app_settings.dedup_enabled:
+        fresh = dedup_works(WorksSearchResponse(results=fresh), known=ranked).results
+    return PendingPage(
+        number=number, page_ids=page_ids, fresh=fresh, has_more=has_more, ranked=ranked,
+        from_overflow=bool(overflow),
+    )
+
+
+def fold_page(session: SearchSession, pending: PendingPage, served: int) -> Optional[List[WorkSummary]]:
+    """
+    Merge a fetched page into the unserved part of the pool; call with the
+    session lock held. Returns the works added, or None when the session has
+    moved past the page meanwhile (it was fetched again by someone else).
+    """
+    if session.next_openalex_page != pending.number or (pending.from_overflow and not session.overflow):
+        return None
+    if pending.from_overflow:
+        session.overflow = []
+    else:
+        session.next_openalex_page += 1
+    session.exhausted = not pending.has_more
+    fresh = [w for w in pending.fresh if w.id not in session.seen_ids]
+    session.seen_ids.update(pending.page_ids)
+    if not fresh:
+        return []
+
+    # whole-pool (hybrid) scores only hold for the pool they were computed on
+    page_scores = pending.page_scores
+    if session.mode == "hybrid" and pending.ranked is not session.ranked:
+        page_scores = None
+    session.ranked, session.scores = merge_ranked(
+        session.mode, session.payload, session.ranked, session.scores, fresh, served=served, page_scores=page_scores
+    )
+    return fresh
+
+
+def _extend_pool(session: SearchSession, client: OpenAlexClient, served: int) -> None:
+    """
+    Fetch the next OpenAlex page, score only the new works and fold them into
+    the part of the pool that has not been served yet.
+    """
+    fold_page(session, fetch_next_page(session, client), served=served)
+
+
+def session_page(session: SearchSession, client: OpenAlexClient, page: int, page_size: Optional[int] = None) -> WorksSearchResponse:
+    page_size = page_size or app_settings.session_page_size
+    start = (page - 1) * page_size
+    end = start + page_size
+
+    with session.lock:
+        while len(session.ranked) < end and not session.exhausted:
+            if not session.overflow and session.next_openalex_page > app_settings.session_max_openalex_pages:
+                session.exhausted = True
+                break
+            _extend_pool(session, client, served=min(start, len(session.ranked)))
+
+        results = session.ranked[start:end]
+        session.served = max(session.served, start + len(results))
+        has_more = len(session.ranked) > end or not session.exhausted
+
+    return WorksSearchResponse(
+        results=results,
+        rerank_mode=session.mode,
+        session_token=session.token,
+        page=page,
+        has_more=has_more,
+        dropped_terms=session.plan.dropped_terms or None,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_session_store() -> SessionStore:
+    # One store per process; serve.py forwards /more requests to the owning worker
+    return SessionStore(ttl_s=app_settings.session_ttl_s, max_sessions=app_settings.session_max_count)
@@ -1,36 +1,23 @@
 # backend/app/services/works_service.py
-from ...data.fetch import search_from_lists
+from ...data.fetch import SearchPage, search_page, probe_match_counts, pick_match_levels, select_for
+from ...data.records import WorkRecord
 from ...data.client import OpenAlexClient
+from ...data.config import settings
 from ..schemas import WorksSearchRequest, WorksSearchResponse, WorkSummary
 from functools import lru_cache
 from keybert import KeyBERT
-from typing import List, Set
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
 from .semantic_rerank_service import get_sentence_transformer
+from .phrase_vocab_service import get_phrase_vocabulary
+from ..config import app_settings
 from ..cache import get_model_cache_dir
+from ..work_store import get_work_store
 
 
-SELECT_FIELDS = "id,display_name,concepts,abstract_inverted_index,publication_year,authorships"
-
-# ----------- helpers --------------------
-def _inverted_index_to_abstract(inverted_index: dict) -> str:
-    if not inverted_index:
-        return ""
-    
-    max_index = max(idx for indices in inverted_index.values() for idx in indices)
-    
-    words = [""] * (max_index + 1)
-    
-    for word, indices in inverted_index.items():
-        for idx in indices:
-            words[idx] = word
-            
-    return " ".join(words)
-
-def _concepts_to_keywords(concepts: list) -> str:
-    if not concepts:
-        return ""
-    
-    return ", ".join([c['display_name'] for c in concepts if 'display_name' in c])
+# Records the search routes return: no authorships, which nothing reads
+SELECT_FIELDS = select_for("search")
 
 @lru_cache(maxsize=1)
 def get_keybert_model():
@@ -40,22 +27,61 @@ def get_keybert_model():
     """
     return KeyBERT(model=get_sentence_transformer())
 
+@lru_cache(maxsize=1)
+def _warn_no_phrase_vocabulary() -> None:
+    # once per process, not per request
+    print("No phrase vocabulary built; using KeyBERT")
+
 def extract_keywords_from_text(text: str, top_n: int = 8) -> List[str]:
+    if app_settings.keyword_extractor != "keybert":
+        vocab = get_phrase_vocabulary()
+        if vocab is not None:
+            keywords = vocab.extract(text, top_n=top_n)
+            # nothing in the vocabulary matched: fall back to KeyBERT
+            if keywords:
+                return keywords
+        elif app_settings.keyword_extractor == "vocabulary":
+            _warn_no_phrase_vocabulary()
     kw_model = get_keybert_model()
     keywords = kw_model.extract_keywords(text, top_n=top_n)
     return [k[0] for k in keywords]
 
 
 # --------------------- openalex search function ----------------------------
-def run_search(payload: WorksSearchRequest, client: OpenAlexClient, discovery_mode: bool = True) -> WorksSearchResponse:
+FETCH_LIMIT = 40
+
+@dataclass
+class SearchPlan:
+    """
+    What plan_search decided for a request: the terms it sends and the strictness
+    levels the candidate pool is built from (strictest first).
+    Kept by search sessions so later pages reuse it without KeyBERT or probing.
+    """
+    keywords: List[str]
+    abstract_keywords: List[str]
+    match_levels: List[int]
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    more_pages: bool = True          # the loosest level's last fetched OpenAlex page came back full
+    next_page: int = 2               # the loosest level's first OpenAlex page not fetched yet
+    overflow: List[WorkSummary] = field(default_factory=list)  # fetched past target_candidates, held for /more
+    dropped_terms: List[str] = field(default_factory=list)  # left out of the OpenAlex filters (too long)
+
+    @property
+    def match_count(self) -> Optional[int]:
+        # loosest level; its results include those of the stricter ones
+        return self.match_levels[-1] if self.match_levels else None
+
+
+def plan_search(payload: WorksSearchRequest, client: OpenAlexClient) -> SearchPlan:
     
-    # Protection: if keywords are too much, take the first 6 because it increases exponentially in the search logic
-    keywords_to_use = payload.keywords
-    if keywords_to_use and len(keywords_to_use) > 5:
-        keywords_to_use = keywords_to_use[:5]
+    # Protection: the combinatorial filter still grows with C(n, r); the query planner
+    # splits long filters across requests, so the cap only bounds the fan-out
+    keywords_to_use = payload.keywords or []
+    if len(keywords_to_use) > settings.max_keywords:
+        keywords_to_use = keywords_to_use[:settings.max_keywords]
 
     extracted_abstract_keywords = []
-    fetch_limit = 40
 
     total_kw = len(keywords_to_use)
     start_match = max(1, total_kw - 1)
@@ -73,36 +99,115 @@ def run_search(payload: WorksSearchRequest, client: OpenAlexClient, discovery_mo
             print(f"\nTotal Unique Keywords Extracted: {unique_keywords_set}\n")
             extracted_abstract_keywords = list(unique_keywords_set)[:9]            
 
-    for match_count in range(start_match, 0, -1):
-            print(f"Trying search with min_match_count: {match_count} (Total KW: {total_kw})")
-            results_gen = search_from_lists(
-                client,
-                keywords=keywords_to_use,
-                abstracts=extracted_abstract_keywords,
-                start_date=payload.start_date,
-                end_date=payload.end_date,
-                select_fields=SELECT_FIELDS,
-                per_page=fetch_limit,
-                min_match_count=match_count,
-            )
-            
-            results = list(results_gen)
-            
-            if results:
-                print(f"Found {len(results)} results with match count {match_count}")
-                break # Result is found, exit the loop
-            else:
-                print(f"No results for match count {match_count}, decreasing strictness...")
-
-    summaries = []
-    for r in results:
-        summaries.append(
-            WorkSummary(
-                id=r.get("id", ""),
-                title=r.get("display_name", ""),
-                keywords=_concepts_to_keywords(r.get("concepts", [])),
-                abstract=_inverted_index_to_abstract(r.get("abstract_inverted_index")),
-                publication_year=r.get("publication_year"),
-            )
-        )
-    return WorksSearchResponse(results=summaries)
\ No newline at end of file
+    # Probe every strictness level for its count only, then download full records once
+    counts = probe_match_counts(
+        client,
+        levels=range(start_match, 0, -1),
+        keywords=keywords_to_use,
+        abstracts=extracted_abstract_keywords,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+    )
+    print(f"Match counts per min_match_count (Total KW: {total_kw}): {counts}")
+    match_levels = pick_match_levels(counts, target=settings.target_candidates)
+    if not match_levels:
+            print("No results for any match count")
+
+    return SearchPlan(
+        keywords=keywords_to_use,
+        abstract_keywords=extracted_abstract_keywords,
+        match_levels=match_levels,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+    )
+
+
+def record_to_summary(record: WorkRecord, match_level: Optional[int] = None) -> WorkSummary:
+    return WorkSummary(
+        id=record.id,
+        title=record.title,
+        keywords=record.keywords,
+        abstract=record.abstract,
+        publication_year=record.publication_year,
+        relevance_score=record.relevance_score,
+        match_level=match_level,
+    )
+
+
+def _fetch_level(client: OpenAlexClient, plan: SearchPlan, level: int, page: int) -> SearchPage:
+    return search_page(
+        client,
+        keywords=plan.keywords,
+        abstracts=plan.abstract_keywords,
+        start_date=plan.start_date,
+        end_date=plan.end_date,
+        select_fields=SELECT_FIELDS,
+        per_page=FETCH_LIMIT,
+        page=page,
+        min_match_count=level,
+        max_date_shards=settings.max_date_shards,
+    )
+
+
+def fetch_candidates(client: OpenAlexClient, plan: SearchPlan, page: int = 1) -> WorksSearchResponse:
+    """
+    Candidate pool for the planned query, as WorkSummary records.
+
+    Page 1 fetches every planned strictness level concurrently and merges them,
+    strictest first, deduplicated by id, so sparse strict levels are topped up
+    from looser ones; while the pool is still short of target_candidates, the
+    loosest level is paged on. The pool is then cut to target_candidates, and
+    the rest is kept on the plan (`overflow`, with the next OpenAlex page of the
+    loosest level in `next_page`) for /more to serve before fetching again.
+    Later pages only page through the loosest level. Each work records the
+    strictest level it came from.
+    `has_more` tells whether the last request of the loosest level came back full,
+    i.e. whether OpenAlex has a next page (dedup shortens the pool itself).
+    """
+    levels = plan.match_levels if page == 1 else plan.match_levels[-1:]
+    level_pages: List[SearchPage] = []
+    if levels:
+        with ThreadPoolExecutor(max_workers=len(levels)) as pool:
+            level_pages = list(pool.map(lambda level: _fetch_level(client, plan, level, page), levels))
+
+    results = []
+    level_of = {}
+
+    def merge(level: int, level_page: SearchPage, number: int) -> int:
+        added = 0
+        level_works = [WorkRecord(r) for r in level_page.results]
+        for r in level_works:
+            wid = r.id
+            if wid and wid not in level_of:
+                level_of[wid] = level
+                results.append(r)
+                added += 1
+        print(f"Found {len(level_works)} results with match count {level} (page {number})")
+        if level_page.dropped_terms:
+            print(f"Query too long at match count {level}; left out: {level_page.dropped_terms}")
+        return added
+
+    for level, level_page in zip(levels, level_pages):
+        merge(level, level_page, page)
+
+    target = settings.target_candidates
+    if page == 1 and levels:
+        next_page = 2
+        # a page adding nothing new means the loosest level only repeats the stricter ones
+        while len(results) < target and level_pages[-1].full:
+            level_pages.append(_fetch_level(client, plan, levels[-1], next_page))
+            added = merge(levels[-1], level_pages[-1], next_page)
+            next_page += 1
+            if not added:
+                break
+        plan.next_page = next_page
+
+    # abstracts are rebuilt once per work, not once per level that returned it
+    summaries = [record_to_summary(r, level_of.get(r.id)) for r in results]
+    # Keep every work we have seen, so later rerank calls can reference it by id
+    get_work_store().upsert_many(summaries)
+    if page == 1:
+        summaries, plan.overflow = summaries[:target], summaries[target:]
+    has_more = bool(level_pages) and level_pages[-1].full
+    dropped = list(dict.fromkeys(t for p in level_pages for t in p.dropped_terms))
+    return WorksSearchResponse(results=summaries, has_more=has_more, dropped_terms=dropped or None)
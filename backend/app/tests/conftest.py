@@ -2,6 +2,21 @@
 import csv
 from pathlib import Path
 
+import pytest
+
+from ..config import app_settings
+from ..work_store import get_work_store
+
+
+@pytest.fixture(autouse=True)
+def isolated_work_store(tmp_path, monkeypatch):
+    # routes and fetches write to the work store; keep them out of the user's cache
+    monkeypatch.setattr(app_settings, "work_store_path", str(tmp_path / "works.sqlite3"))
+    get_work_store.cache_clear()
+    yield
+    get_work_store.cache_clear()
+
+
 def pytest_sessionfinish(session, exitstatus):
     try:
         from .test_rerank_endpoints import RESULT_ROWS
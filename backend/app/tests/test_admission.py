@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from ..admission import Overloaded, RouteLimiter
+
+
+def test_full_queue_is_rejected_fast():
+    async def scenario():
+        limiter = RouteLimiter("cross_encoder", limit=1, max_queue=0, timeout_s=1.0)
+        await limiter.acquire()
+        with pytest.raises(Overloaded) as exc:
+            await limiter.acquire()
+        assert exc.value.status_code == 503
+        assert "Retry-After" in exc.value.headers
+        limiter.release()
+        return limiter.metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["admitted"] == 1
+    assert metrics["rejected_queue_full"] == 1
+
+
+def test_queued_request_times_out_or_gets_slot():
+    async def scenario():
+        limiter = RouteLimiter("bi_encoder", limit=1, max_queue=2, timeout_s=0.05)
+        await limiter.acquire()
+        with pytest.raises(Overloaded):
+            await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        limiter.release()
+        await waiter
+        return limiter.metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["rejected_timeout"] == 1
+    assert metrics["admitted"] == 2
+    assert metrics["active"] == 1
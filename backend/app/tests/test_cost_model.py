@@ -0,0 +1,39 @@
+from ..services.cost_model import RerankCostModel
+
+
+def make_model():
+    return RerankCostModel(per_pair_ms=4.0, per_text_ms=2.0)
+
+
+def test_generous_budget_keeps_cross_encoder():
+    plan = make_model().plan(n_works=40, n_queries=1, budget_ms=10_000)
+    assert plan.mode == "cross_encoder"
+
+
+def test_tight_budget_picks_cascade_with_fitting_k():
+    model = make_model()
+    # cross-encoder: 40 * 4 = 160ms does not fit;
+    # bi-encoder: (40 + 1) * 2 = 82ms, leaves 68ms -> 17 pairs
+    plan = model.plan(n_works=40, n_queries=1, budget_ms=150)
+    assert plan.mode == "cascade"
+    assert plan.cascade_k == 17
+    assert plan.estimated_ms <= 150
+
+
+def test_degrades_to_bi_encoder_then_openalex():
+    model = make_model()
+    assert model.plan(n_works=40, n_queries=1, budget_ms=90).mode == "bi_encoder"
+    assert model.plan(n_works=40, n_queries=1, budget_ms=10).mode == "openalex"
+
+
+def test_ceiling_is_respected():
+    plan = make_model().plan(n_works=40, n_queries=1, budget_ms=10_000, ceiling="bi_encoder")
+    assert plan.mode == "bi_encoder"
+
+
+def test_observations_move_estimate():
+    model = make_model()
+    model.observe_cross_encoder(n_pairs=100, elapsed_s=1.0)  # 10ms per pair
+    assert 4.0 < model.per_pair_ms < 10.0
+    model.observe_cross_encoder(n_pairs=0, elapsed_s=1.0)
+    assert 4.0 < model.per_pair_ms < 10.0
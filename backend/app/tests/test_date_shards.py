@@ -0,0 +1,68 @@
+from datetime import date
+
+from ...data.fetch import date_shards, search_page, select_for
+
+TODAY = date(2025, 3, 1)
+
+
+def test_narrow_or_disabled_ranges_are_not_split():
+    assert date_shards("2021-01-01", "2023-12-31", 4, min_span_years=5) == [("2021-01-01", "2023-12-31")]
+    assert date_shards(None, None, 1, today=TODAY) == [(None, None)]
+
+
+def test_wide_range_is_split_into_contiguous_year_buckets():
+    shards = date_shards("2010-06-01", "2021-05-31", 4, min_span_years=5)
+    assert shards == [
+        ("2010-06-01", "2012-12-31"),
+        ("2013-01-01", "2015-12-31"),
+        ("2016-01-01", "2018-12-31"),
+        ("2019-01-01", "2021-05-31"),
+    ]
+
+
+def test_open_range_keeps_open_ends_and_recent_buckets_narrower():
+    shards = date_shards(None, None, 4, min_span_years=5, floor_year=2000, today=TODAY)
+    assert shards[0] == (None, "2006-12-31")
+    assert shards[-1] == ("2020-01-01", None)
+
+
+class ShardClient:
+    """Two works per shard (newer shards score higher); honours page, per-page and select."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_json(self, path, params=None):
+        self.calls.append(params)
+        to_date = next(p for p in params["filter"].split(",") if p.startswith("to_publication_date:"))
+        year = int(to_date.split(":")[1][:4])
+        works = [{"id": f"W{year}-{i}", "relevance_score": float(year - i)} for i in range(2)]
+        per_page = int(params["per-page"])
+        start = (int(params["page"]) - 1) * per_page
+        fields = params["select"].split(",")
+        return {"results": [{k: v for k, v in w.items() if k in fields} for w in works[start:start + per_page]]}
+
+
+def test_shards_split_the_page_quota_and_page_in_step():
+    client = ShardClient()
+    pages = [
+        search_page(
+            client,
+            keywords=["graph"],
+            start_date="2000-01-01",
+            end_date="2019-12-31",
+            page=page,
+            per_page=4,
+            select_fields=select_for("search"),
+            max_date_shards=4,
+        )
+        for page in (1, 2, 3)
+    ]
+    assert len(client.calls) == 12
+    assert all(c["per-page"] == 1 for c in client.calls)
+    assert all("from_publication_date" in c["filter"] and "to_publication_date" in c["filter"] for c in client.calls)
+    # each page is one work per shard, by relevance; nothing is cut, nothing repeats
+    assert [r["id"] for r in pages[0].results] == ["W2019-0", "W2014-0", "W2009-0", "W2004-0"]
+    assert [r["id"] for r in pages[1].results] == ["W2019-1", "W2014-1", "W2009-1", "W2004-1"]
+    assert pages[0].full and pages[1].full
+    assert pages[2].results == [] and not pages[2].full
@@ -0,0 +1,40 @@
+from ..schemas import WorkSummary, WorksSearchResponse
+from ..services.dedup_service import dedup_works, title_key
+
+
+def work(wid, title, abstract="", relevance=None, year=2020):
+    return WorkSummary(id=wid, title=title, keywords="", abstract=abstract,
+                       publication_year=year, relevance_score=relevance)
+
+
+def test_title_key_ignores_case_and_punctuation():
+    assert title_key("Molecular Communication: A Survey") == title_key("molecular communication - a survey")
+    assert title_key("") is None
+
+
+def test_duplicates_collapse_to_best_representative():
+    works = WorksSearchResponse(results=[
+        work("W1", "Channel Models for MC", abstract="short", relevance=3.0),
+        work("W2", "Graph Learning"),
+        work("W3", "channel models for MC.", abstract="a much longer abstract", relevance=9.0),
+        work("W2", "Graph Learning"),
+    ])
+    kept = dedup_works(works, threshold=1.1)
+    assert [w.id for w in kept.results] == ["W3", "W2"]
+
+
+def test_known_works_drop_their_duplicates():
+    known = [work("W1", "Channel Models for MC")]
+    fresh = WorksSearchResponse(results=[work("W9", "Channel models for MC"), work("W5", "Other")])
+    kept = dedup_works(fresh, known=known, threshold=1.1)
+    assert [w.id for w in kept.results] == ["W5"]
+
+
+def test_shared_generic_title_needs_the_same_year():
+    works = WorksSearchResponse(results=[
+        work("W1", "Introduction", year=2018),
+        work("W2", "Introduction", year=2021),
+        work("W3", "Introduction", year=None),
+    ])
+    kept = dedup_works(works, threshold=1.1)
+    assert [w.id for w in kept.results] == ["W1", "W2", "W3"]
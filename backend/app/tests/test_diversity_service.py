@@ -0,0 +1,26 @@
+import numpy as np
+
+from ..schemas import WorkSummary, WorksSearchResponse
+from ..services.diversity_service import _relevance, mmr_select
+
+
+def test_lambda_one_keeps_relevance_order():
+    rng = np.random.default_rng(0)
+    relevance = rng.random(50).astype(np.float32)
+    emb = rng.normal(size=(50, 16)).astype(np.float32)
+    assert mmr_select(relevance, emb, lambda_=1.0, k=10) == list(np.argsort(-relevance)[:10])
+
+
+def test_near_duplicate_is_pushed_down():
+    emb = np.array([[1.0, 0.0], [0.999, 0.01], [0.0, 1.0]], dtype=np.float32)
+    relevance = np.array([1.0, 0.95, 0.6], dtype=np.float32)
+    assert mmr_select(relevance, emb, lambda_=1.0, k=3) == [0, 1, 2]
+    assert mmr_select(relevance, emb, lambda_=0.5, k=3) == [0, 2, 1]
+
+
+def test_relevance_falls_back_to_rank():
+    works = WorksSearchResponse(results=[
+        WorkSummary(id=f"W{i}", title="t", keywords="", abstract="", publication_year=None) for i in range(3)
+    ])
+    assert _relevance(works, None).tolist() == [1.0, 0.5, 0.0]
+    assert _relevance(works, {"W0": -2.0, "W1": 2.0, "W2": 0.0}).tolist() == [0.0, 1.0, 0.5]
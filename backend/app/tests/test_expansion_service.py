@@ -0,0 +1,80 @@
+import time
+
+import pytest
+import requests
+
+from ...data.client import OpenAlexClient, OpenAlexError
+from ...data.fetch import MAX_IDS_PER_FILTER, fetch_works_by_ids
+from ...data.rate_limit import TokenBucket
+from ..schemas import WorkSummary, WorksSearchRequest, WorksSearchResponse
+from ..services.expansion_service import expand_ranking, neighbor_ids
+
+
+class IdClient:
+    """Answers openalex_id filters and records each request's params."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_json(self, path, params=None):
+        self.calls.append(params)
+        ids = params["filter"].split(",")[0].split(":", 1)[1].split("|")
+        return {"results": [{"id": f"https://openalex.org/{wid}"} for wid in ids]}
+
+
+def test_ids_are_batched_or_joined_and_deduplicated():
+    client = IdClient()
+    ids = [f"https://openalex.org/W{i}" for i in range(120)] + ["W0", "W1"]
+    records = fetch_works_by_ids(client, ids, select_fields="id")
+
+    assert len(records) == 120
+    assert sorted(len(c["filter"].split("|")) for c in client.calls) == [20, MAX_IDS_PER_FILTER, MAX_IDS_PER_FILTER]
+    assert all("sort" not in c and c["select"] == "id" for c in client.calls)
+
+
+def test_id_lookup_keeps_the_search_date_range_and_types():
+    client = IdClient()
+    fetch_works_by_ids(client, ["W1", "W2"], start_date="2020-01-01", end_date="2021-12-31", work_types=["article"])
+    assert client.calls[0]["filter"] == (
+        "openalex_id:W1|W2,from_publication_date:2020-01-01,to_publication_date:2021-12-31,type:article"
+    )
+
+
+def test_neighbors_are_ordered_by_how_many_top_works_share_them():
+    links = [
+        {"id": "A", "referenced_works": ["X", "Y"], "related_works": ["Z"]},
+        {"id": "B", "referenced_works": ["Y", "A"], "related_works": []},
+    ]
+    assert neighbor_ids(links, exclude={"A", "B"}, limit=10) == ["Y", "X", "Z"]
+    assert neighbor_ids(links, exclude={"A", "B"}, limit=1) == ["Y"]
+
+
+class TimeoutSession:
+    def get(self, url, params=None, timeout=None):
+        time.sleep(timeout)
+        raise requests.exceptions.ReadTimeout("read timed out")
+
+
+class TimeoutClient(OpenAlexClient):
+    """Every request times out, after waiting out its (deadline-capped) timeout."""
+
+    def __init__(self):
+        super().__init__(timeout_s=0.05, max_retries=1, rate_limiter=TokenBucket(rate_per_s=0, burst=1))
+
+    @property
+    def session(self):
+        return TimeoutSession()
+
+
+def test_network_timeouts_leave_the_ranking_as_it_was():
+    client = TimeoutClient()
+    with pytest.raises(OpenAlexError):
+        fetch_works_by_ids(client, ["W1"], select_fields="id")
+    # out of time: the batch is dropped like any request past the deadline
+    assert fetch_works_by_ids(client, ["W1"], select_fields="id", timeout_s=0.02) == []
+
+    ranked = WorksSearchResponse(results=[
+        WorkSummary(id="W1", title="t", keywords="", abstract="", publication_year=2020)
+    ])
+    payload = WorksSearchRequest(keywords=["a"])
+    assert expand_ranking(client, payload, "bi_encoder", ranked, {"W1": 1.0}, max_latency_ms=200) == (ranked, {"W1": 1.0})
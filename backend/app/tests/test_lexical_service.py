@@ -0,0 +1,35 @@
+import numpy as np
+
+from ..services.lexical_service import BM25Index, tokenize
+from ..services.hybrid_rerank_service import fuse_scores
+
+
+def test_tokenize_uses_filter_normalization():
+    assert tokenize("Molecular-Communication, Nanonetworks!") == ["molecular-communication", "nanonetworks"]
+    assert tokenize("Café déjà vu.") == ["cafe", "deja", "vu"]
+
+
+def test_bm25_ranks_matching_document_first():
+    index = BM25Index({
+        "a": "terahertz band channel model for nanonetworks",
+        "b": "molecular communication via diffusion",
+        "c": "graph neural networks for recommendation",
+    })
+    scores = index.score("molecular diffusion channel")
+    assert int(np.argmax(scores)) == index.doc_ids.index("b")
+    assert scores[index.doc_ids.index("c")] == 0.0
+
+
+def test_bm25_unknown_terms_score_zero():
+    index = BM25Index({"a": "alpha beta", "b": "gamma"})
+    assert not index.score("delta epsilon").any()
+    assert index.score_many([]).shape == (2,)
+
+
+def test_fuse_scores_drops_missing_signal():
+    fused = fuse_scores(
+        ["a", "b"],
+        {"lexical": {"a": 2.0, "b": 1.0}, "openalex": {}},
+        {"lexical": 0.5, "openalex": 0.5},
+    )
+    assert fused == {"a": 1.0, "b": 0.0}
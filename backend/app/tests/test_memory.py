@@ -0,0 +1,26 @@
+import os
+import time
+
+import pytest
+
+from ..memory import child_pids, memory_usage
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps"), reason="needs /proc")
+def test_memory_usage_of_this_process():
+    usage = memory_usage()
+    assert usage["rss"] > 0
+    assert 0 < usage["uss"] <= usage["rss"]
+    assert usage["pss"] <= usage["rss"]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="needs /proc")
+def test_forked_child_is_listed():
+    pid = os.fork()
+    if pid == 0:
+        time.sleep(1)
+        os._exit(0)
+    try:
+        assert pid in child_pids(os.getpid())
+    finally:
+        os.waitpid(pid, 0)
@@ -0,0 +1,37 @@
+import json
+import threading
+
+import pytest
+
+from ...data.client import OpenAlexClient, OpenAlexError
+from ...data.rate_limit import TokenBucket
+from ...scripts.openalex_standin import Recordings, make_server, recording_key
+
+
+@pytest.fixture
+def standin(tmp_path):
+    page = {"meta": {"count": 1}, "results": [{"id": "https://openalex.org/W1", "display_name": "recorded"}]}
+    Recordings(tmp_path).put("/works", "filter=type:article&per-page=5", 200, json.dumps(page).encode("utf-8"))
+    server, stats = make_server(tmp_path, mode="replay", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", stats
+    server.shutdown()
+    server.server_close()
+
+
+def test_key_ignores_param_order_and_mailto():
+    assert recording_key("/works", "a=1&b=2") == recording_key("/works/", "b=2&mailto=x%40y.org&a=1")
+    assert recording_key("/works", "a=1") != recording_key("/works", "a=2")
+
+
+def test_client_replays_recorded_responses(standin):
+    base_url, stats = standin
+    client = OpenAlexClient(base_url=base_url, mailto="dev@example.org", rate_limiter=TokenBucket(rate_per_s=0, burst=1))
+
+    data = client.get_json("works", {"per-page": 5, "filter": "type:article"})
+    assert data["results"][0]["display_name"] == "recorded"
+
+    with pytest.raises(OpenAlexError):
+        client.get_json("works", {"filter": "type:preprint"})
+    assert stats.counts["served"] == 1 and stats.counts["misses"] == 1
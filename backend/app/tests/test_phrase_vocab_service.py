@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+
+from ..services import phrase_vocab_service
+from ..services.phrase_vocab_service import EMBEDDINGS_FILE, META_FILE, MODEL_NAME, PhraseVocabulary, mine_phrases
+
+
+class FakeEncoder:
+    def encode(self, texts, **kwargs):
+        return np.tile(np.array([1.0, 0.0], dtype=np.float32), (len(texts), 1))
+
+
+def write_vocab(directory, phrases, emb):
+    np.save(directory / EMBEDDINGS_FILE, np.asarray(emb, dtype=np.float32))
+    meta = {"model": MODEL_NAME, "dim": 2, "ngram_range": [1, 2], "phrases": phrases}
+    (directory / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+
+def test_mined_phrases_skip_stop_words_and_rare_ngrams():
+    texts = [
+        "Molecular communication in nanonetworks.",
+        "A survey of molecular communication channels.",
+        "Terahertz band channels.",
+    ]
+    phrases = mine_phrases(texts, ngram_range=(1, 2), min_df=2)
+    assert "molecular communication" in phrases
+    assert "channels" in phrases
+    assert "terahertz" not in phrases
+    assert not any(p.split()[0] in {"a", "of", "in"} for p in phrases)
+
+
+def test_extract_ranks_matched_phrases_by_similarity(tmp_path, monkeypatch):
+    write_vocab(
+        tmp_path,
+        ["molecular communication", "channel", "diffusion", "terahertz"],
+        [[0.6, 0.8], [0.2, 0.98], [1.0, 0.0], [1.0, 0.0]],
+    )
+    monkeypatch.setattr(phrase_vocab_service, "get_sentence_transformer", lambda: FakeEncoder())
+    vocab = PhraseVocabulary(tmp_path)
+
+    text = "Diffusion based molecular communication channel models"
+    assert vocab.extract(text, top_n=2) == ["diffusion", "molecular communication"]
+    assert vocab.extract("nothing known here", top_n=2) == []
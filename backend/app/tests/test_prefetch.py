@@ -0,0 +1,116 @@
+import threading
+import time
+
+from ..prefetch import Prefetcher
+from ..services import prefetch_service, session_service
+from ..services.session_service import SessionStore, fetch_next_page, fold_page, session_page
+from ..services.works_service import FETCH_LIMIT
+from .test_session_service import PAYLOAD, PLAN, FakeClient, first_page
+
+
+def wait_for(predicate, timeout_s=2.0):
+    deadline = time.monotonic() + timeout_s
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_full_queue_drops_new_jobs():
+    prefetcher = Prefetcher(max_queue=1, is_busy=lambda: False, nice=0)
+    assert not prefetcher.submit("s", "next_page", lambda checkpoint: None)   # not started
+
+    release = threading.Event()
+    prefetcher.start()
+    try:
+        prefetcher.submit("s", "block", lambda checkpoint: release.wait(2))
+        assert wait_for(lambda: prefetcher.qsize() == 0)
+        assert prefetcher.submit("s", "next_page", lambda checkpoint: None)
+        assert not prefetcher.submit("t", "next_page", lambda checkpoint: None)
+        release.set()
+        assert wait_for(lambda: prefetcher.stats.completed == 2)
+    finally:
+        prefetcher.stop()
+    assert prefetcher.stats.dropped_full == 1
+
+
+def test_newer_job_for_a_session_supersedes_the_queued_one():
+    prefetcher = Prefetcher(max_queue=4, is_busy=lambda: False, nice=0)
+    release = threading.Event()
+    ran = []
+    prefetcher.start()
+    try:
+        prefetcher.submit("s", "block", lambda checkpoint: release.wait(2))
+        prefetcher.submit("s", "next_page", lambda checkpoint: ran.append("old"))
+        prefetcher.submit("s", "next_page", lambda checkpoint: ran.append("new"))
+        prefetcher.submit("t", "next_page", lambda checkpoint: ran.append("other"))
+        release.set()
+        assert wait_for(lambda: prefetcher.stats.completed == 3)
+    finally:
+        prefetcher.stop()
+    assert ran == ["new", "other"]
+    assert prefetcher.stats.cancelled == 1
+
+
+def test_jobs_wait_for_foreground_requests():
+    busy = threading.Event()
+    busy.set()
+    done = threading.Event()
+    prefetcher = Prefetcher(max_queue=4, is_busy=busy.is_set, nice=0, poll_s=0.01)
+    prefetcher.start()
+    try:
+        prefetcher.submit("s", "next_page", lambda checkpoint: done.set())
+        assert not done.wait(0.1)
+        busy.clear()
+        assert done.wait(2)
+    finally:
+        prefetcher.stop()
+    assert prefetcher.stats.waited_s > 0
+
+
+def test_next_page_is_fetched_ahead_of_paging(monkeypatch):
+    embedded = []
+    monkeypatch.setattr(prefetch_service, "encode_search_space", lambda space: embedded.extend(space))
+    client = FakeClient({2: FETCH_LIMIT, 3: FETCH_LIMIT})
+    session = SessionStore(ttl_s=60, max_sessions=10).open(PAYLOAD, PLAN, "openalex", first_page(FETCH_LIMIT))
+
+    session_page(session, client, page=1, page_size=20)
+    prefetch_service.prefetch_next_page(session, client, checkpoint=lambda: None)
+    assert client.pages == [2]
+    assert len(session.ranked) == 2 * FETCH_LIMIT
+    assert embedded == [f"W2-{i}" for i in range(FETCH_LIMIT)]
+
+    # the prefetched works are served without another OpenAlex request
+    session_page(session, client, page=3, page_size=20)
+    assert client.pages == [2]
+
+
+def test_next_page_is_fetched_and_scored_outside_the_session_lock(monkeypatch):
+    monkeypatch.setattr(prefetch_service, "encode_search_space", lambda space: None)
+    session = SessionStore(ttl_s=60, max_sessions=10).open(
+        PAYLOAD, PLAN, "bi_encoder", first_page(FETCH_LIMIT), scores={f"W1-{i}": 1.0 - i / 100 for i in range(FETCH_LIMIT)}
+    )
+    locked_during = []
+
+    class LockCheckingClient(FakeClient):
+        def get_json(self, path, params=None):
+            locked_during.append(session.lock.locked())
+            return super().get_json(path, params)
+
+    def score(payload, works):
+        locked_during.append(session.lock.locked())
+        return {w.id: 0.5 for w in works.results}
+
+    monkeypatch.setitem(session_service.SCORERS, "bi_encoder", score)
+    session_page(session, FakeClient({}), page=1, page_size=20)
+    prefetch_service.prefetch_next_page(session, LockCheckingClient({2: FETCH_LIMIT}), checkpoint=lambda: None)
+    assert len(session.ranked) == 2 * FETCH_LIMIT
+    assert locked_during and not any(locked_during)
+
+
+def test_page_fetched_meanwhile_is_not_folded_twice():
+    client = FakeClient({2: FETCH_LIMIT, 3: FETCH_LIMIT})
+    session = SessionStore(ttl_s=60, max_sessions=10).open(PAYLOAD, PLAN, "openalex", first_page(FETCH_LIMIT))
+    stale = fetch_next_page(session, client)
+    session_page(session, client, page=3, page_size=20)   # /more fetched page 2 itself
+    assert fold_page(session, stale, served=session.served) is None
+    assert len(session.ranked) == 2 * FETCH_LIMIT
@@ -0,0 +1,50 @@
+import pstats
+import time
+
+from .. import profiling
+from ..profiling import ProfileRecord, ProfileStore, profiled
+
+
+def slow_handler(n: int):
+    time.sleep(0.01)
+    return sum(range(n))
+
+
+def make_record(pid: str) -> ProfileRecord:
+    return ProfileRecord(id=pid, method="POST", path="/api/works/search", reason="requested", started_at=time.time())
+
+
+def test_handler_is_profiled_only_when_requested(tmp_path, monkeypatch):
+    store = ProfileStore(tmp_path, max_profiles=5)
+    monkeypatch.setattr(profiling, "get_profile_store", lambda: store)
+    handler = profiled(slow_handler)
+    assert profiled(handler) is handler
+
+    assert handler(10) == 45
+    assert store.list() == []
+
+    record = make_record("abc")
+    token = profiling._current_profile.set(record)
+    try:
+        assert handler(10) == 45
+    finally:
+        profiling._current_profile.reset(token)
+
+    assert record.saved and record.duration_ms >= 10
+    assert [r.id for r in store.list()] == ["abc"]
+    stats = pstats.Stats(str(store.path("abc", "prof")))
+    assert any(func[2] == "slow_handler" for func in stats.stats)
+    assert "slow_handler" in store.path("abc", "txt").read_text()
+
+
+def test_store_evicts_oldest_artifacts(tmp_path):
+    import cProfile
+
+    store = ProfileStore(tmp_path, max_profiles=2)
+    for pid in ("a", "b", "c"):
+        record = make_record(pid)
+        record.duration_ms = 1.0
+        store.save(record, cProfile.Profile())
+    assert [r.id for r in store.list()] == ["c", "b"]
+    assert not store.path("a", "prof").exists()
+    assert store.get("a") is None
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from ..quantization import (
+    EmbeddingIndex,
+    bytes_per_vector,
+    decode_embedding,
+    encode_embedding,
+    hamming_distances,
+    pack_codes,
+    two_stage_cosine,
+)
+from ..schemas import WorkSummary
+from ..work_store import WorkStore, search_text, text_hash
+
+
+@pytest.mark.parametrize("dtype,tol", [("float32", 0.0), ("float16", 1e-3), ("int8", 1e-2)])
+def test_precisions_round_trip(dtype, tol):
+    vec = np.random.default_rng(0).normal(size=384).astype(np.float32)
+    vec /= np.linalg.norm(vec)
+    back = decode_embedding(encode_embedding(vec, dtype), dtype)
+    assert back.dtype == np.float32
+    assert np.abs(back - vec).max() <= tol
+    assert len(encode_embedding(vec, dtype)) == bytes_per_vector(384, dtype)
+
+
+def test_hamming_distance_counts_differing_signs():
+    a = np.array([[1, -1, 1, -1, 1, 1, 1, 1, -1]], dtype=np.float32)
+    b = a.copy()
+    b[0, [0, 8]] *= -1
+    assert hamming_distances(pack_codes(a), pack_codes(b)).tolist() == [[2]]
+
+
+def test_two_stage_matches_exact_for_survivors():
+    rng = np.random.default_rng(1)
+    docs = rng.normal(size=(500, 64)).astype(np.float32)
+    query = docs[:1] + rng.normal(0, 0.05, size=(1, 64)).astype(np.float32)
+    scores = two_stage_cosine(query, docs, rescore_k=20)
+    assert int(np.argmax(scores)) == 0
+
+    index = EmbeddingIndex([str(i) for i in range(500)], docs, "int8")
+    assert index.search(query, k=1, rescore_k=20) == [0]
+    assert index.nbytes()["codes"] == 500 * 8
+
+
+def test_unrescored_documents_rank_below_every_survivor():
+    rng = np.random.default_rng(2)
+    docs = rng.normal(size=(300, 32)).astype(np.float32)
+    query = rng.normal(size=(2, 32)).astype(np.float32)
+    scores = two_stage_cosine(query, docs, rescore_k=10)
+    hamming = hamming_distances(pack_codes(query), pack_codes(docs)).mean(axis=0)
+    survivors = set(np.argsort(scores)[-10:].tolist())
+    assert len(survivors) == 10
+    assert max(hamming[sorted(survivors)]) <= min(np.delete(hamming, sorted(survivors)))
+
+
+def test_store_keeps_precision_per_row():
+    work = WorkSummary(id="a", title="t", keywords="k", abstract="x", publication_year=None)
+    store = WorkStore(":memory:", embedding_dtype="int8")
+    store.upsert_many([work])
+    h = text_hash(search_text(work))
+    store.put_embeddings({"a": (h, np.linspace(-1, 1, 8, dtype=np.float32))})
+    emb = store.get_embeddings({"a": h})["a"]
+    assert emb.dtype == np.float32
+    assert np.allclose(emb, np.linspace(-1, 1, 8), atol=1e-2)
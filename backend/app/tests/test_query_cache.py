@@ -0,0 +1,53 @@
+from ..schemas import WorksSearchRequest, WorksSearchResponse
+from ..services import query_cache
+from ..services.query_cache import QueryResultCache, normalize_request
+from ..services.works_service import SearchPlan
+
+PLAN = SearchPlan(keywords=["a"], abstract_keywords=[], match_levels=[1])
+EMPTY = WorksSearchResponse(results=[])
+
+
+def exact_only_cache(**kwargs):
+    # a threshold above 1 turns the embedding tier off, so no model is needed
+    return QueryResultCache(ttl_s=kwargs.get("ttl_s", 60), max_entries=kwargs.get("max_entries", 8), threshold=2.0)
+
+
+def test_normalized_key_ignores_order_case_and_whitespace():
+    a = WorksSearchRequest(keywords=["Nanonet", "MC"], abstracts=["  Some Abstract "])
+    b = WorksSearchRequest(keywords=["mc", "nanonet "], abstracts=["some abstract"])
+    assert normalize_request(a, "bi_encoder") == normalize_request(b, "bi_encoder")
+    assert normalize_request(a, "bi_encoder") != normalize_request(a, "cross_encoder")
+
+
+def test_exact_hit_miss_and_lru_eviction():
+    cache = exact_only_cache(max_entries=1)
+    first = WorksSearchRequest(keywords=["a", "b"])
+    second = WorksSearchRequest(keywords=["c"])
+
+    assert cache.get(first, "hybrid") is None
+    cache.put(first, "hybrid", PLAN, EMPTY, {})
+    assert cache.get(WorksSearchRequest(keywords=["B", "a"]), "hybrid") is not None
+
+    cache.put(second, "hybrid", PLAN, EMPTY, {})
+    assert cache.get(first, "hybrid") is None
+    stats = cache.stats.as_dict()
+    assert (stats["exact_hits"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+
+
+def test_entries_expire():
+    cache = exact_only_cache(ttl_s=1e-9)
+    request = WorksSearchRequest(keywords=["a"])
+    cache.put(request, "hybrid", PLAN, EMPTY, {})
+    assert cache.get(request, "hybrid") is None
+    assert cache.stats.expirations == 1
+
+
+def test_openalex_mode_never_embeds_queries(monkeypatch):
+    def fail(payload):
+        raise AssertionError("the openalex mode must not load the bi-encoder")
+    monkeypatch.setattr(query_cache, "_embed_query", fail)
+    cache = QueryResultCache(ttl_s=60, max_entries=8, threshold=0.9)
+    request = WorksSearchRequest(keywords=["a"])
+    cache.put(request, "openalex", PLAN, EMPTY, {})
+    assert cache.get(WorksSearchRequest(keywords=["b"]), "openalex") is None
+    assert cache.get(request, "openalex") is not None
@@ -0,0 +1,97 @@
+from ...data.config import settings
+from ...data.fetch import (
+    _combinatorial_join,
+    build_filter,
+    estimate_clause_count,
+    merge_results,
+    pick_match_levels,
+    plan_query,
+    search_page,
+)
+
+KEYWORDS = [
+    "molecular communication", "nanonetworks", "channel modeling", "terahertz band",
+    "diffusion", "receiver design", "drug delivery", "synthetic biology",
+]
+
+
+def test_level_one_absorbs_and_groups():
+    assert _combinatorial_join(["a", "b", "A"], 1) == '"a" OR "b"'
+    assert estimate_clause_count(3, 1) == 6
+
+
+def test_higher_level_keeps_only_minimal_groups():
+    joined = _combinatorial_join(["a", "b", "c"], 2)
+    assert joined == '("a" AND "b") OR ("a" AND "c") OR ("b" AND "c")'
+
+
+def test_small_query_is_not_split():
+    plan = plan_query(keywords=["a", "b"], abstracts=["c"], min_match_count=1)
+    assert plan.filters == [build_filter(keywords=["a", "b"], abstracts=["c"], min_match_count=1)]
+
+
+def test_oversized_query_is_split_under_url_limit():
+    plan = plan_query(keywords=KEYWORDS, min_match_count=4, max_url_length=1500, max_requests=16)
+    assert len(plan.filters) > 1
+    assert plan.estimated_url_length <= 1500
+    assert plan.clause_count == estimate_clause_count(len(KEYWORDS), 4)
+
+
+def test_split_drops_trailing_terms_to_respect_request_cap():
+    plan = plan_query(keywords=KEYWORDS, min_match_count=4, max_url_length=500, max_requests=3)
+    assert len(plan.filters) <= 3
+    assert plan.estimated_url_length <= 500
+    assert plan.dropped_terms and plan.dropped_terms == KEYWORDS[-len(plan.dropped_terms):]
+    assert plan.original_clause_count == estimate_clause_count(len(KEYWORDS), 4)
+
+
+class SplitClient:
+    """Three works per filter and page, ids unique to the filter; counts the requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_json(self, path, params=None):
+        self.requests.append((params["filter"], params["page"]))
+        tag = abs(hash(params["filter"])) % 10**6
+        return {"results": [
+            {"id": f"W{tag}-{params['page']}-{i}", "relevance_score": float(10 - i)}
+            for i in range(params["per-page"] if params["page"] == 1 else 1)
+        ]}
+
+
+def test_split_pages_keep_the_whole_union():
+    client = SplitClient()
+    page = search_page(client, keywords=KEYWORDS, min_match_count=4, per_page=3)
+    n_filters = len({f for f, _ in client.requests})
+    assert n_filters > 1
+    assert len(page.results) == 3 * n_filters
+    assert page.full
+
+    second = search_page(client, keywords=KEYWORDS, min_match_count=4, page=2, per_page=3)
+    assert len(second.results) == n_filters and not second.full
+
+
+def test_page_reports_terms_dropped_from_the_query(monkeypatch):
+    monkeypatch.setattr(settings, "max_url_length", 500)
+    monkeypatch.setattr(settings, "max_parallel_requests", 3)
+    page = search_page(SplitClient(), keywords=KEYWORDS, min_match_count=4, per_page=3)
+    assert page.dropped_terms and page.dropped_terms == KEYWORDS[-len(page.dropped_terms):]
+
+    assert search_page(SplitClient(), keywords=KEYWORDS[:3], min_match_count=1, per_page=3).dropped_terms == []
+
+
+def test_merge_results_dedups_and_orders_by_relevance():
+    merged = merge_results([
+        [{"id": "a", "relevance_score": 1.0}, {"id": "b", "relevance_score": 5.0}],
+        [{"id": "a", "relevance_score": 7.0}, {"id": "c"}],
+    ])
+    assert [r["id"] for r in merged] == ["a", "b", "c"]
+    assert merged[0]["relevance_score"] == 7.0
+
+
+def test_pick_match_levels_tops_up_sparse_strict_levels():
+    assert pick_match_levels({3: 2, 2: 45, 1: 900}, target=40) == [3, 2]
+    assert pick_match_levels({3: 0, 2: 5, 1: 12}, target=40) == [2, 1]
+    assert pick_match_levels({3: 50, 2: 90, 1: 900}, target=40) == [3]
+    assert pick_match_levels({1: 0}, target=40) == []
@@ -0,0 +1,44 @@
+import time
+
+from ...data.rate_limit import TokenBucket
+
+
+def test_bucket_is_shared_through_state_file(tmp_path):
+    path = str(tmp_path / "bucket")
+    a = TokenBucket(rate_per_s=1000, burst=2, path=path, jitter_s=0)
+    b = TokenBucket(rate_per_s=1000, burst=2, path=path, jitter_s=0)
+    assert a.acquire() == 0.0
+    assert b.acquire() == 0.0
+    # the burst is spent across both: the next one waits for a refill
+    assert a.acquire() > 0.0
+    assert a.stats.waits == 1
+
+
+def test_penalize_blocks_other_workers(tmp_path):
+    path = str(tmp_path / "bucket")
+    a = TokenBucket(rate_per_s=1000, burst=5, path=path, jitter_s=0)
+    b = TokenBucket(rate_per_s=1000, burst=5, path=path, jitter_s=0)
+    a.penalize(0.05)
+    started = time.monotonic()
+    b.acquire()
+    assert time.monotonic() - started >= 0.04
+    assert a.stats.rate_limited == 1
+    assert b.stats.throttled_s > 0
+
+
+def test_disabled_throttling_still_honours_retry_after(tmp_path):
+    bucket = TokenBucket(rate_per_s=0, burst=1, path=str(tmp_path / "bucket"), jitter_s=0)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    bucket.penalize(0.05)
+    assert bucket.acquire() >= 0.04
+    bucket.close()
+
+
+def test_acquire_gives_up_at_its_timeout(tmp_path):
+    bucket = TokenBucket(rate_per_s=1000, burst=1, path=str(tmp_path / "bucket"), jitter_s=0)
+    bucket.penalize(1.0)
+    started = time.monotonic()
+    assert bucket.acquire(timeout_s=0.05) is None
+    assert time.monotonic() - started < 0.5
+    assert bucket.stats.acquired == 0
@@ -0,0 +1,57 @@
+from ...data.fetch import SELECT_PROFILES, search_from_lists, select_for
+from ...data.records import WorkRecord, inverted_index_to_abstract
+
+import pytest
+
+
+def test_abstract_is_rebuilt_in_word_order():
+    index = {"communication": [1], "molecular": [0], "survey": [3], "a": [2]}
+    assert inverted_index_to_abstract(index) == "molecular communication a survey"
+    assert inverted_index_to_abstract(None) == ""
+
+
+def test_record_decodes_lazily():
+    record = WorkRecord({
+        "id": "W1",
+        "display_name": "Title",
+        "abstract_inverted_index": {"hello": [0], "world": [1]},
+        "concepts": [{"display_name": "Biology"}, {"id": "C2"}],
+    })
+    assert record.id == "W1" and record.title == "Title"
+    assert record._abstract is None
+    assert record.abstract == "hello world"
+    assert record.keywords == "Biology"
+
+
+def test_profiles_are_minimal():
+    assert select_for("count") == "id"
+    assert "authorships" not in select_for("search")
+    with pytest.raises(ValueError):
+        select_for("everything")
+    assert set(SELECT_PROFILES) >= {"count", "dedup", "search"}
+
+
+class SelectingClient:
+    """Answers like OpenAlex with `select`: only the selected top-level fields come back."""
+
+    FULL = {
+        "id": "W1",
+        "display_name": "Title",
+        "publication_year": 2020,
+        "relevance_score": 12.5,
+        "abstract_inverted_index": {"hello": [0]},
+        "concepts": [],
+        "authorships": [{"author": {"display_name": "A"}}],
+    }
+
+    def get_json(self, path, params=None):
+        fields = params["select"].split(",")
+        return {"results": [{k: v for k, v in self.FULL.items() if k in fields}]}
+
+
+def test_search_profile_keeps_relevance_score():
+    [raw] = search_from_lists(SelectingClient(), keywords=["graph"], select_fields=select_for("search"))
+    record = WorkRecord(raw)
+    assert record.relevance_score == 12.5
+    assert record.abstract == "hello"
+    assert "authorships" not in raw
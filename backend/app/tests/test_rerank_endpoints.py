@@ -1,5 +1,4 @@
 import json
-import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -8,6 +7,13 @@ from fastapi.testclient import TestClient
 
 from ..main import app
 from ..schemas import WorkSummary, WorksSearchResponse
+from ...scripts.rerank_eval import (
+    GROUPS,
+    QUERY_VARIANTS,
+    paper_group,
+    pick_two_queries_per_group,
+    query_to_keywords_list,
+)
 
 # -------------------------------------------------
 # Helpers for logging
@@ -66,15 +72,6 @@ def missing_relevant_ids_in_top_k(
 
 RESULT_ROWS = []
 
-QUERY_VARIANTS = ["kw_only", "kw_plus_abs"]
-
-GROUPS: List[Tuple[str, int, int]] = [
-    ("G1_01_07", 1, 7),
-    ("G2_08_14", 8, 14),
-    ("G3_15_20", 15, 20),
-    ("G4_21_30", 21, 30),
-]
-
 P_THRESHOLD = 0.6
 
 # -----------------------------
@@ -106,25 +103,8 @@ DATASET_BY_ID = {p["id"]: p for p in DATASET}
 
 
 # -----------------------------
-# 3) Single-group membership (by index range)
+# 3) Single-group membership (by index range, paper_group in scripts/rerank_eval.py)
 # -----------------------------
-def paper_group(p: dict) -> str:
-    """
-    Her paper EXACTLY ONE group alır, index aralığına göre (predefined).
-    """
-    idx = p.get("index")
-    if not isinstance(idx, int):
-        pid = str(p.get("id", ""))
-        m = re.search(r"(\d+)$", pid)
-        idx = int(m.group(1)) if m else 10**9
-
-    for gname, lo, hi in GROUPS:
-        if lo <= idx <= hi:
-            return gname
-
-    raise AssertionError(f"Paper index out of supported ranges: id={p.get('id')} index={idx}")
-
-
 GROUP_COUNTS: Dict[str, int] = {g[0]: 0 for g in GROUPS}
 for p in DATASET:
     GROUP_COUNTS[paper_group(p)] += 1
@@ -140,24 +120,6 @@ def dynamic_k(target_group: str, returned_len: int) -> int:
     return min(relevant_count, returned_len)
 
 
-def pick_two_queries_per_group(dataset: List[dict]) -> Dict[str, List[dict]]:
-    grouped: Dict[str, List[dict]] = {g[0]: [] for g in GROUPS}
-
-    for p in dataset:
-        g = paper_group(p)
-        grouped[g].append(p)
-
-    for g in grouped:
-        grouped[g] = sorted(grouped[g], key=lambda x: (x.get("index", 10**9), x.get("title", "")))
-
-    missing = [g for g, arr in grouped.items() if len(arr) < 2]
-    if missing:
-        counts = {g: len(grouped[g]) for g in grouped}
-        raise AssertionError(f"Some groups have <2 papers: {missing}. Counts={counts}")
-
-    return {g: grouped[g][:2] for g in grouped}
-
-
 def build_test_cases(dataset: List[dict]) -> List[Tuple[str, str]]:
     selected = pick_two_queries_per_group(dataset)
     cases: List[Tuple[str, str]] = []
@@ -171,18 +133,9 @@ TEST_CASES = build_test_cases(DATASET)
 
 
 # -----------------------------
-# 4) Query -> keywords list ONLY
+# 4) Query -> keywords list ONLY (query_to_keywords_list in scripts/rerank_eval.py)
 # e.g. "MC + Nanonet + Channel Modeling (7)" -> ["MC","Nanonet","Channel Modeling"]
 # -----------------------------
-def query_to_keywords_list(q: str) -> List[str]:
-    q = (q or "").strip()
-    if not q:
-        return []
-    q = re.sub(r"\(\s*\d+\s*\)\s*$", "", q).strip()
-    parts = [p.strip() for p in q.split("+")]
-    return [p for p in parts if p]
-
-
 def build_query_payload(qp: dict, variant: str) -> dict:
     keywords_list = query_to_keywords_list(qp.get("query", ""))
 
@@ -257,59 +210,20 @@ def client():
 
 
 # -----------------------------
-# 7) Tests (8 suite per model => 16 tests)
+# 7) Tests (8 suite per model)
 # (4 grup * 2 query) = 8 case for each model
 # -----------------------------
-@pytest.mark.parametrize("group,query_id", TEST_CASES)
-@pytest.mark.parametrize("variant", QUERY_VARIANTS)
-def test_sentence_transformer_rerank(group, query_id, variant, client: TestClient):
-    qp = DATASET_BY_ID[query_id]
-
-    payload = {
-        "query": build_query_payload(qp, variant),
-        "works": build_search_space(excluding_id=query_id, dataset=DATASET).model_dump(),
-    }
-
-    r = client.post("/api/__test__/rerank_only_sentence_transformer", json=payload)
-    assert r.status_code == 200, r.text
-
-    results = r.json().get("results") or []
-    assert len(results) == len(payload["works"]["results"])
-
-    k_dyn = dynamic_k(target_group=group, returned_len=len(results))
-    hit = count_hits_in_top_k(results, target_group=group, k=k_dyn)
-    pk = p_at_k(hit=hit, k=k_dyn)
-
-    missing_ids = missing_relevant_ids_in_top_k(
-        returned_results=results,
-        target_group=group,
-        query_id=query_id,
-        k=k_dyn,
-    )
-    missing_str = ";".join(missing_ids)
-
-    RESULT_ROWS.append({
-        "model": "sentence_transformer",
-        "variant": variant,
-        "group": group,
-        "query_id": query_id,
-        "k": k_dyn,
-        "hit_in_top_k": hit,
-        "missing_in_top_k": missing_str,
-        "p_at_k": pk,
-        "threshold": P_THRESHOLD,
-        "pass": pk >= P_THRESHOLD,
-    })
-
-    assert pk >= P_THRESHOLD, (
-        f"[{variant}] P@{k_dyn} too low: {pk:.2f} "
-        f"(hit={hit}/{k_dyn}) group={group} query={query_id}"
-    )
+RERANK_ROUTES = [
+    ("/api/__test__/rerank_only_sentence_transformer", "sentence_transformer"),
+    ("/api/__test__/rerank_only_cross_encoder", "cross_encoder"),
+    ("/api/__test__/rerank_only_hybrid", "hybrid"),
+]
 
 
 @pytest.mark.parametrize("group,query_id", TEST_CASES)
 @pytest.mark.parametrize("variant", QUERY_VARIANTS)
-def test_cross_encoder_rerank(group, query_id, variant, client: TestClient):
+@pytest.mark.parametrize("route,model", RERANK_ROUTES, ids=[m for _, m in RERANK_ROUTES])
+def test_rerank(route, model, group, query_id, variant, client: TestClient):
     qp = DATASET_BY_ID[query_id]
 
     payload = {
@@ -317,7 +231,7 @@ def test_cross_encoder_rerank(group, query_id, variant, client: TestClient):
         "works": build_search_space(excluding_id=query_id, dataset=DATASET).model_dump(),
     }
 
-    r = client.post("/api/__test__/rerank_only_cross_encoder", json=payload)
+    r = client.post(route, json=payload)
     assert r.status_code == 200, r.text
 
     results = r.json().get("results") or []
@@ -336,7 +250,7 @@ def test_cross_encoder_rerank(group, query_id, variant, client: TestClient):
     missing_str = ";".join(missing_ids)
 
     RESULT_ROWS.append({
-        "model": "cross_encoder",
+        "model": model,
         "variant": variant,
         "group": group,
         "query_id": query_id,
@@ -349,6 +263,6 @@ def test_cross_encoder_rerank(group, query_id, variant, client: TestClient):
     })
 
     assert pk >= P_THRESHOLD, (
-        f"[{variant}] P@{k_dyn} too low: {pk:.2f} "
+        f"[{model}/{variant}] P@{k_dyn} too low: {pk:.2f} "
         f"(hit={hit}/{k_dyn}) group={group} query={query_id}"
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,117 @@
+import itertools
+import threading
+from dataclasses import replace
+
+from ..schemas import WorkSummary, WorksSearchRequest, WorksSearchResponse
+from ..services.session_service import SessionStore, session_page
+from ..services.works_service import FETCH_LIMIT, SearchPlan, fetch_candidates
+from ...data.config import settings
+
+
+class FakeClient:
+    """Serves OpenAlex pages of generated works and records which pages were asked for."""
+
+    def __init__(self, page_sizes):
+        self.page_sizes = page_sizes
+        self.pages = []
+
+    def get_json(self, path, params=None):
+        page = int(params["page"])
+        self.pages.append(page)
+        n = self.page_sizes.get(page, 0)
+        return {
+            "meta": {"count": sum(self.page_sizes.values())},
+            "results": [{"id": f"W{page}-{i}", "display_name": f"work {page}-{i}"} for i in range(n)],
+        }
+
+
+def first_page(n):
+    return WorksSearchResponse(results=[
+        WorkSummary(id=f"W1-{i}", title=f"work 1-{i}", keywords="", abstract="", publication_year=None)
+        for i in range(n)
+    ])
+
+
+PLAN = SearchPlan(keywords=["a"], abstract_keywords=[], match_levels=[1])
+PAYLOAD = WorksSearchRequest(keywords=["a"])
+
+
+def test_later_pages_fetch_openalex_lazily():
+    client = FakeClient({2: FETCH_LIMIT, 3: 5})
+    store = SessionStore(ttl_s=60, max_sessions=10)
+    session = store.open(PAYLOAD, PLAN, "openalex", first_page(FETCH_LIMIT))
+
+    second = session_page(session, client, page=2, page_size=20)
+    assert [w.id for w in second.results][:1] == ["W1-20"]
+    assert client.pages == []
+
+    fifth = session_page(session, client, page=5, page_size=20)
+    assert client.pages == [2, 3]
+    assert len(fifth.results) == 5
+    assert fifth.has_more is False
+    assert store.get(session.token) is session
+
+
+def test_sessions_expire_and_are_capped():
+    store = SessionStore(ttl_s=60, max_sessions=1)
+    last = replace(PLAN, more_pages=False)
+    old = store.open(PAYLOAD, last, "openalex", first_page(3))
+    new = store.open(PAYLOAD, last, "openalex", first_page(3))
+    assert store.get(old.token) is None
+    assert store.get(new.token) is new
+    assert new.exhausted
+
+
+def test_deduplicated_first_page_still_pages_on():
+    # one duplicate removed from a full OpenAlex page: the pool is short, OpenAlex is not
+    client = FakeClient({2: FETCH_LIMIT})
+    session = SessionStore(ttl_s=60, max_sessions=10).open(PAYLOAD, PLAN, "openalex", first_page(FETCH_LIMIT - 1))
+    assert not session.exhausted
+
+    second = session_page(session, client, page=2, page_size=20)
+    assert client.pages == [2]
+    assert second.has_more
+
+
+class FullPageClient:
+    """Every request returns a full page of works never returned before."""
+
+    def __init__(self):
+        self._calls = itertools.count()
+        self._lock = threading.Lock()
+
+    def get_json(self, path, params=None):
+        with self._lock:
+            call = next(self._calls)
+        return {"meta": {"count": 10 * FETCH_LIMIT},
+                "results": [{"id": f"W{call}-{i}", "display_name": f"work {call}-{i}"} for i in range(FETCH_LIMIT)]}
+
+
+def test_first_pool_is_cut_to_the_target_and_keeps_the_rest(monkeypatch):
+    plan = SearchPlan(keywords=["a", "b"], abstract_keywords=[], match_levels=[2, 1])
+    pool = fetch_candidates(FullPageClient(), plan)
+    assert len(pool.results) == settings.target_candidates
+    assert len(plan.overflow) == 2 * FETCH_LIMIT - settings.target_candidates
+    assert plan.next_page == 2 and pool.has_more
+
+    # a target above one page pages the loosest level on until it is met
+    monkeypatch.setattr(settings, "target_candidates", 3 * FETCH_LIMIT + 5)
+    plan = SearchPlan(keywords=["a"], abstract_keywords=[], match_levels=[1])
+    pool = fetch_candidates(FullPageClient(), plan)
+    assert len(pool.results) == 3 * FETCH_LIMIT + 5
+    assert len(plan.overflow) == FETCH_LIMIT - 5
+    assert plan.next_page == 5
+
+
+def test_overflow_is_served_before_the_next_openalex_page():
+    client = FakeClient({2: FETCH_LIMIT})
+    plan = replace(PLAN, overflow=list(first_page(FETCH_LIMIT + 10).results[FETCH_LIMIT:]))
+    session = SessionStore(ttl_s=60, max_sessions=10).open(PAYLOAD, plan, "openalex", first_page(FETCH_LIMIT))
+
+    second = session_page(session, client, page=2, page_size=25)
+    assert client.pages == []
+    assert [w.id for w in second.results][-1] == f"W1-{FETCH_LIMIT + 9}"
+    assert second.has_more
+
+    session_page(session, client, page=3, page_size=25)
+    assert client.pages == [2]
@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from ..main import app
+from ..schemas import WorkSummary, WorksSearchResponse
+
+WORKS = WorksSearchResponse(results=[
+    WorkSummary(id="w:1", title="Molecular communication channel", keywords="diffusion",
+                abstract="A diffusion based molecular communication channel model.", publication_year=2020),
+    WorkSummary(id="w:2", title="Graph neural recommendation", keywords="graphs",
+                abstract="Recommending items with graph neural networks.", publication_year=2021),
+])
+QUERY = {"keywords": ["molecular communication"], "abstracts": [], "start_date": None, "end_date": None}
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+def test_rerank_by_ids_uses_work_store(client: TestClient):
+    r = client.put("/api/__test__/works", json=WORKS.model_dump())
+    assert r.status_code == 200, r.text
+
+    r = client.post("/api/__test__/rerank_only_hybrid", json={"query": QUERY, "work_ids": ["w:2", "w:1"]})
+    assert r.status_code == 200, r.text
+    assert [w["id"] for w in r.json()["results"]] == ["w:1", "w:2"]
+
+
+def test_unknown_ids_are_rejected(client: TestClient):
+    r = client.post("/api/__test__/rerank_only_hybrid", json={"query": QUERY, "work_ids": ["w:missing"]})
+    assert r.status_code == 404
+
+
+def test_msgpack_round_trip(client: TestClient):
+    msgpack = pytest.importorskip("msgpack")
+    body = msgpack.packb({"query": QUERY, "works": WORKS.model_dump()}, use_bin_type=True)
+
+    r = client.post(
+        "/api/__test__/rerank_only_hybrid",
+        content=body,
+        headers={"content-type": "application/x-msgpack", "accept": "application/x-msgpack"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-msgpack")
+    assert len(msgpack.unpackb(r.content, raw=False)["results"]) == 2
@@ -0,0 +1,53 @@
+import numpy as np
+
+from ..schemas import WorkSummary
+from ..work_store import WorkStore, search_text, text_hash
+
+
+def make_work(wid: str, abstract: str = "diffusion channel") -> WorkSummary:
+    return WorkSummary(id=wid, title=f"title {wid}", keywords="mc", abstract=abstract, publication_year=2020)
+
+
+def test_get_many_keeps_request_order_and_reports_missing():
+    store = WorkStore(":memory:", hot_size=1)
+    store.upsert_many([make_work("a"), make_work("b"), make_work("c")])
+
+    works, missing = store.get_many(["c", "x", "a"])
+    assert [w.id for w in works] == ["c", "a"]
+    assert missing == ["x"]
+    assert works[0].abstract == "diffusion channel"
+
+
+def test_embedding_is_dropped_when_text_changes():
+    store = WorkStore(":memory:")
+    work = make_work("a")
+    store.upsert_many([work])
+    h = text_hash(search_text(work))
+    store.put_embeddings({"a": (h, np.ones(4, dtype=np.float32))})
+    assert set(store.get_embeddings({"a": h})) == {"a"}
+
+    store.upsert_many([work])
+    assert set(store.get_embeddings({"a": h})) == {"a"}
+
+    changed = make_work("a", abstract="terahertz band")
+    store.upsert_many([changed])
+    assert store.get_embeddings({"a": h}) == {}
+    assert store.get_embeddings({"a": text_hash(search_text(changed))}) == {}
+
+
+def test_embedding_of_another_model_is_not_served(tmp_path):
+    path = str(tmp_path / "works.sqlite3")
+    work = make_work("a")
+    h = text_hash(search_text(work))
+    old = WorkStore(path, embedding_model="old-model")
+    old.upsert_many([work])
+    old.put_embeddings({"a": (h, np.ones(4, dtype=np.float32))})
+    assert set(old.get_embeddings({"a": h})) == {"a"}
+
+    assert WorkStore(path, embedding_model="new-model").get_embeddings({"a": h}) == {}
+
+
+def test_iter_works_pages_through_everything():
+    store = WorkStore(":memory:", hot_size=0)
+    store.upsert_many([make_work(f"w{i:02d}") for i in range(7)])
+    assert [w.id for w in store.iter_works(batch_size=3)] == [f"w{i:02d}" for i in range(7)]
@@ -0,0 +1,73 @@
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from .. import workers
+from ..api import admin
+from ..serve import restart_delay
+
+
+def test_token_owner_is_the_slot_prefix(monkeypatch):
+    assert workers.owner_of("abc-DEF_123") is None
+    assert workers.owner_of("3.abc-DEF_123") == 3
+    monkeypatch.setattr(workers, "_slot", 2)
+    assert workers.token_prefix() == "2."
+
+
+def test_restart_delay_grows_and_is_capped():
+    assert [restart_delay(n, 1.0, 5.0) for n in range(5)] == [0.0, 1.0, 2.0, 4.0, 5.0]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # echoes the path; a local profile listing gets one profile of this "worker"
+    def do_GET(self):
+        if self.path == "/admin/profiles?local=1":
+            body, content_type = json.dumps([{"id": "1.abc", "started_at": 1.0}]).encode("utf-8"), "application/json"
+        else:
+            body, content_type = self.path.encode("utf-8"), "text/plain"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def test_forward_reaches_the_owning_workers_socket(tmp_path, monkeypatch):
+    server = _UnixHTTPServer(workers.socket_path(str(tmp_path), 1), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setattr(workers, "_socket_dir", str(tmp_path))
+        status, body, content_type = workers.forward_get(1, "/api/more?session_token=1.x&page=2", timeout_s=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert (status, body, content_type) == (200, b"/api/more?session_token=1.x&page=2", "text/plain")
+
+
+def test_profiles_of_other_workers_are_listed_and_forwarded(tmp_path, monkeypatch):
+    server = _UnixHTTPServer(workers.socket_path(str(tmp_path), 1), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app = FastAPI()
+    app.include_router(admin.router)
+    try:
+        monkeypatch.setattr(workers, "_slot", 0)
+        monkeypatch.setattr(workers, "_socket_dir", str(tmp_path))
+        client = TestClient(app)
+        assert [p["id"] for p in client.get("/admin/profiles").json()] == ["1.abc"]
+        assert client.get("/admin/profiles/1.abc?format=text").text == "/admin/profiles/1.abc?format=text"
+        assert client.get("/admin/profiles/0.abc").status_code == 404
+        assert client.get("/admin/profiles/2.abc").status_code == 503
+    finally:
+        server.shutdown()
+        server.server_close()
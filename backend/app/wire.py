@@ -0,0 +1,104 @@
+# backend/app/wire.py
+"""
+Request/response encodings for the rerank endpoints.
+
+JSON stays the default. Two compact alternatives are negotiated through the
+Content-Type / Accept headers, each backed by an optional dependency:
+  - application/x-msgpack                (msgpack)  same shape as the JSON body
+  - application/vnd.apache.arrow.stream  (pyarrow)  works as a columnar table,
+    the query as JSON in the schema metadata; a table with only an "id"
+    column is an id-only request
+"""
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from .schemas import WorksSearchResponse
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional
+    pa = None
+
+JSON = "application/json"
+MSGPACK = "application/x-msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+WORK_COLUMNS = ["id", "title", "keywords", "abstract", "publication_year", "relevance_score"]
+
+
+def _media_type(header: Optional[str]) -> str:
+    return (header or JSON).split(";", 1)[0].strip().lower()
+
+
+def _require(module, name: str, media_type: str):
+    if module is None:
+        raise HTTPException(status_code=415, detail=f"{media_type} needs the optional '{name}' package")
+    return module
+
+
+# --------- decoding -----------------------------------------------------------
+def _arrow_to_payload(body: bytes) -> Dict[str, Any]:
+    reader = pa.ipc.open_stream(body)
+    table = reader.read_all()
+    metadata = table.schema.metadata or {}
+    query = json.loads(metadata.get(b"query", b"{}"))
+
+    if table.column_names == ["id"]:
+        return {"query": query, "work_ids": table.column("id").to_pylist()}
+    return {"query": query, "works": {"results": table.to_pylist()}}
+
+
+def decode_payload(body: bytes, content_type: Optional[str]) -> Dict[str, Any]:
+    media_type = _media_type(content_type)
+    try:
+        if media_type == MSGPACK:
+            return _require(msgpack, "msgpack", media_type).unpackb(body, raw=False)
+        if media_type == ARROW:
+            _require(pa, "pyarrow", media_type)
+            return _arrow_to_payload(body)
+        if media_type in (JSON, "", "*/*"):
+            return json.loads(body or b"{}")
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Could not decode {media_type} body: {exc}") from exc
+    raise HTTPException(status_code=415, detail=f"Unsupported content type: {media_type}")
+
+
+# --------- encoding -----------------------------------------------------------
+def encode_works_arrow(response: WorksSearchResponse, metadata: Optional[Dict[str, str]] = None) -> bytes:
+    rows = [w.model_dump() for w in response.results]
+    table = pa.Table.from_pylist(rows, schema=pa.schema([
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("keywords", pa.string()),
+        ("abstract", pa.string()),
+        ("publication_year", pa.int32()),
+        ("relevance_score", pa.float64()),
+    ], metadata=metadata))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_response(response: WorksSearchResponse, accept: Optional[str]):
+    """
+    The response model itself for JSON (FastAPI serializes it), or a raw
+    Response in the first compact type the client accepts.
+    """
+    for media_type in (_media_type(part) for part in (accept or "").split(",")):
+        if media_type == MSGPACK and msgpack is not None:
+            return Response(content=msgpack.packb(response.model_dump(), use_bin_type=True), media_type=MSGPACK)
+        if media_type == ARROW and pa is not None:
+            metadata = {"rerank_mode": response.rerank_mode} if response.rerank_mode else None
+            return Response(content=encode_works_arrow(response, metadata), media_type=ARROW)
+    return response
@@ -0,0 +1,243 @@
+# backend/app/work_store.py
+import hashlib
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .schemas import WorkSummary
+from .config import app_settings
+from .cache import get_work_store_dir
+from .quantization import EMBEDDING_DTYPES, decode_embedding, encode_embedding
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    id               TEXT PRIMARY KEY,
+    title            TEXT NOT NULL,
+    keywords         TEXT NOT NULL,
+    abstract_z       BLOB NOT NULL,      -- zlib-compressed decoded abstract
+    publication_year INTEGER,
+    relevance_score  REAL,
+    text_hash        TEXT NOT NULL,      -- hash of the text the embedding was computed from
+    embedding        BLOB,               -- NULL until first computed
+    embedding_dtype  TEXT,               -- float32 / float16 / int8 (see quantization.py)
+    embedding_model  TEXT                -- bi-encoder the embedding was computed with
+)
+"""
+
+# SQLite's default limit on bound parameters is 999
+_SQL_BATCH = 500
+
+
+def search_text(work: WorkSummary) -> str:
+    # Same text the bi-encoder embeds (build_search_space_representation)
+    keywords = (work.keywords or "").strip().lower()
+    abstract = (work.abstract or "").strip().lower()
+    return f"{keywords} {abstract}".strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+_WORK_COLUMNS = "id, title, keywords, abstract_z, publication_year, relevance_score"
+
+
+def _row_to_work(row) -> WorkSummary:
+    wid, title, keywords, abstract_z, year, relevance = row
+    return WorkSummary(
+        id=wid,
+        title=title,
+        keywords=keywords,
+        abstract=zlib.decompress(abstract_z).decode("utf-8"),
+        publication_year=year,
+        relevance_score=relevance,
+    )
+
+
+class WorkStore:
+    """
+    Works known to the server, keyed by OpenAlex id, so rerank calls can
+    reference them by id instead of resending full records.
+
+    Persistent in a single SQLite file (abstracts zlib-compressed, embeddings
+    at `embedding_dtype` precision), with an LRU hot set of decoded WorkSummary
+    objects in front. An embedding is dropped when its work's text changes and
+    is only served to the model (`embedding_model`) that computed it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        hot_size: int = 5000,
+        embedding_dtype: str = "float32",
+        embedding_model: Optional[str] = None,
+    ) -> None:
+        if embedding_dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"unknown embedding dtype: {embedding_dtype}")
+        self.path = path
+        self.hot_size = hot_size
+        self.embedding_dtype = embedding_dtype
+        self.embedding_model = embedding_model or app_settings.bi_encoder_model
+        self._hot: "OrderedDict[str, WorkSummary]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            # several worker processes may share the file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(works)")}
+        if "embedding_dtype" not in columns:
+            # stores created before reduced precisions: their blobs are float32
+            self._conn.execute("ALTER TABLE works ADD COLUMN embedding_dtype TEXT")
+        if "embedding_model" not in columns:
+            # untagged embeddings never match a model and are recomputed once
+            self._conn.execute("ALTER TABLE works ADD COLUMN embedding_model TEXT")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM works").fetchone()[0]
+
+    # --------- hot set ------------------------------------------------------
+    def _remember(self, work: WorkSummary) -> None:
+        if self.hot_size <= 0:
+            return
+        self._hot[work.id] = work
+        self._hot.move_to_end(work.id)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    # --------- records ------------------------------------------------------
+    def upsert_many(self, works: Iterable[WorkSummary]) -> int:
+        rows = []
+        with self._lock:
+            for work in works:
+                if not work.id:
+                    continue
+                rows.append((
+                    work.id,
+                    work.title or "",
+                    work.keywords or "",
+                    zlib.compress((work.abstract or "").encode("utf-8")),
+                    work.publication_year,
+                    work.relevance_score,
+                    text_hash(search_text(work)),
+                ))
+                self._remember(work)
+            self._conn.executemany(
+                """
+                INSERT INTO works (id, title, keywords, abstract_z, publication_year, relevance_score, text_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    keywords = excluded.keywords,
+                    abstract_z = excluded.abstract_z,
+                    publication_year = excluded.publication_year,
+                    relevance_score = excluded.relevance_score,
+                    embedding = CASE WHEN works.text_hash = excluded.text_hash THEN works.embedding ELSE NULL END,
+                    embedding_dtype = CASE WHEN works.text_hash = excluded.text_hash THEN works.embedding_dtype ELSE NULL END,
+                    embedding_model = CASE WHEN works.text_hash = excluded.text_hash THEN works.embedding_model ELSE NULL END,
+                    text_hash = excluded.text_hash
+                """,
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def get_many(self, ids: List[str]) -> Tuple[List[WorkSummary], List[str]]:
+        """
+        Works for `ids` in request order, plus the ids that are not stored.
+        Hot-set misses are loaded with batched IN (...) queries.
+        """
+        with self._lock:
+            found: Dict[str, WorkSummary] = {wid: self._hot[wid] for wid in ids if wid in self._hot}
+            cold = [wid for wid in dict.fromkeys(ids) if wid not in found]
+            for start in range(0, len(cold), _SQL_BATCH):
+                batch = cold[start:start + _SQL_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT {_WORK_COLUMNS} FROM works WHERE id IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for row in rows:
+                    work = _row_to_work(row)
+                    found[work.id] = work
+                    self._remember(work)
+            for wid in found:
+                if wid in self._hot:
+                    self._hot.move_to_end(wid)
+
+        missing = [wid for wid in ids if wid not in found]
+        return [found[wid] for wid in ids if wid in found], missing
+
+    def iter_works(self, batch_size: int = _SQL_BATCH) -> Iterator[WorkSummary]:
+        """
+        Every stored work, in id order and batches (the hot set is left alone).
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {_WORK_COLUMNS} FROM works WHERE id > ? ORDER BY id LIMIT ?",
+                    (last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_work(row)
+            last = rows[-1][0]
+
+    # --------- embeddings ---------------------------------------------------
+    def get_embeddings(self, hashes: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """
+        Stored embeddings for {work id: text hash}, as float32; entries whose
+        text changed or that another model computed are skipped.
+        """
+        out: Dict[str, np.ndarray] = {}
+        ids = list(hashes)
+        with self._lock:
+            for start in range(0, len(ids), _SQL_BATCH):
+                batch = ids[start:start + _SQL_BATCH]
+                rows = self._conn.execute(
+                    "SELECT id, text_hash, embedding, embedding_dtype FROM works "
+                    f"WHERE embedding IS NOT NULL AND embedding_model = ? AND id IN ({','.join('?' * len(batch))})",
+                    [self.embedding_model, *batch],
+                ).fetchall()
+                for wid, stored_hash, blob, dtype in rows:
+                    if stored_hash == hashes[wid]:
+                        out[wid] = decode_embedding(blob, dtype)
+        return out
+
+    def put_embeddings(self, embeddings: Dict[str, Tuple[str, np.ndarray]]) -> None:
+        """
+        Store {work id: (text hash, embedding)} for works already in the store.
+        """
+        rows = [
+            (encode_embedding(emb, self.embedding_dtype), self.embedding_dtype, self.embedding_model, wid, h)
+            for wid, (h, emb) in embeddings.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE works SET embedding = ?, embedding_dtype = ?, embedding_model = ? WHERE id = ? AND text_hash = ?",
+                rows,
+            )
+            self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_work_store() -> WorkStore:
+    # One connection per process
+    path: Optional[str] = app_settings.work_store_path
+    if path is None:
+        path = str(Path(get_work_store_dir()) / "works.sqlite3")
+    return WorkStore(
+        path,
+        hot_size=app_settings.work_store_hot_size,
+        embedding_dtype=app_settings.work_store_embedding_dtype,
+        embedding_model=app_settings.bi_encoder_model,
+    )
@@ -0,0 +1,110 @@
+# backend/app/workers.py
+"""
+Which serve.py worker owns a search session.
+
+Sessions (and the query cache, admission and prefetch state) live in the
+memory of one worker process, but the workers share one listening socket, so
+a /more request can land on any of them. To keep paging working:
+  - every worker also listens on its own unix socket
+  - session tokens start with the slot of the worker that opened them
+  - a worker given another worker's token forwards the request to that
+    worker's socket and relays the answer
+Request profiles are kept per worker the same way: their ids carry the slot.
+
+Under plain uvicorn (one process, nothing configured) tokens carry no slot
+and nothing is forwarded.
+"""
+import http.client
+import os
+import re
+import socket
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+from .config import app_settings
+
+_slot: Optional[int] = None
+_socket_dir: Optional[str] = None
+
+
+def socket_path(socket_dir: str, slot: int) -> str:
+    return os.path.join(socket_dir, f"worker-{slot}.sock")
+
+
+def configure(slot: int, socket_dir: str) -> None:
+    # called in each forked worker before it starts serving
+    global _slot, _socket_dir
+    _slot, _socket_dir = slot, socket_dir
+
+
+def current_slot() -> Optional[int]:
+    return _slot
+
+
+def token_prefix() -> str:
+    return f"{_slot}." if _slot is not None else ""
+
+
+def peer_slots() -> List[int]:
+    """
+    Slots of the other serve.py workers, by their sockets; empty outside serve.py.
+    """
+    if _socket_dir is None:
+        return []
+    slots = []
+    for name in os.listdir(_socket_dir):
+        m = re.fullmatch(r"worker-(\d+)\.sock", name)
+        if m and int(m.group(1)) != _slot:
+            slots.append(int(m.group(1)))
+    return sorted(slots)
+
+
+def owner_of(token: str) -> Optional[int]:
+    """
+    Slot of the worker that opened the session (or recorded the profile),
+    or None for an unprefixed token.
+    """
+    prefix, sep, _ = token.partition(".")
+    if not sep or not prefix.isdigit():
+        return None
+    return int(prefix)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def forward_get(slot: int, path: str, timeout_s: float) -> Tuple[int, bytes, Optional[str]]:
+    """
+    GET `path` (with its query string) from the worker in `slot`; returns the
+    status, body and content type. Raises OSError when that worker is unreachable.
+    """
+    if _socket_dir is None:
+        raise OSError("not running under serve.py: no worker sockets")
+    conn = _UnixHTTPConnection(socket_path(_socket_dir, slot), timeout_s)
+    try:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        return resp.status, resp.read(), resp.getheader("Content-Type")
+    finally:
+        conn.close()
+
+
+def forward_to_owner(request: Request, owner: int, what: str = "session") -> Response:
+    """
+    Relay `request` (a GET) to the worker in slot `owner`; 503 when it is unreachable.
+    """
+    path = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+    try:
+        status, body, content_type = forward_get(owner, path, app_settings.serve_forward_timeout_s)
+    except OSError as exc:
+        raise HTTPException(status_code=503, detail=f"Worker {owner} holding this {what} is unavailable: {exc}")
+    return Response(content=body, status_code=status, media_type=content_type)
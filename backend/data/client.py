@@ -1,13 +1,24 @@
 # data/client.py
 from __future__ import annotations
 
+import json
+import random
+import threading
 import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from typing import Any, Dict, Optional
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from .config import settings
+from .rate_limit import TokenBucket, get_rate_limiter
 
 import logging
 logger = logging.getLogger("openalex")
@@ -23,11 +34,68 @@ class OpenAlexError(RuntimeError):
     pass
 
 
+class OpenAlexDeadlineError(OpenAlexError):
+    """The caller's deadline passed before the request could be (re)sent."""
+
+
+def loads(body: bytes) -> Any:
+    # orjson when installed (several times faster on large pages), stdlib otherwise
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+@dataclass
+class PayloadStats:
+    responses: int = 0
+    works: int = 0
+    bytes: int = 0
+    decode_s: float = 0.0
+
+    def record(self, n_bytes: int, n_works: int, decode_s: float) -> None:
+        with _payload_lock:
+            self.responses += 1
+            self.works += n_works
+            self.bytes += n_bytes
+            self.decode_s += decode_s
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "decoder": "orjson" if orjson is not None else "json",
+            "responses": self.responses,
+            "works": self.works,
+            "bytes": self.bytes,
+            "bytes_per_work": round(self.bytes / self.works, 1) if self.works else 0.0,
+            "decode_ms_per_response": round(self.decode_s * 1000.0 / self.responses, 3) if self.responses else 0.0,
+        }
+
+
+# Per-process totals over every client instance
+_payload_lock = threading.Lock()
+payload_stats = PayloadStats()
+
+
+def _retry_after_s(value: Optional[str], default: float) -> float:
+    # Retry-After is either seconds or an HTTP date
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
 class OpenAlexClient:
     """
     HTTP client for OpenAlex with:
       - sensible timeouts
-      - retry w/ exponential backoff for 429/5xx
+      - retry w/ exponential backoff for 5xx
+      - a token bucket shared by all workers; a 429's Retry-After pauses every worker
+      - optional polite-pool `mailto`
       - tiny helper for GETing JSON
 
     Usage:
@@ -41,29 +109,48 @@ class OpenAlexClient:
         timeout_s: Optional[int] = None,
         max_retries: Optional[int] = None,
         backoff_factor: Optional[float] = None,
+        mailto: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
     ) -> None:
         self.base_url = (base_url or str(settings.base_url)).rstrip("/")
         self.timeout_s = timeout_s or settings.timeout_s
-        self.session = requests.Session()
-
-        # Robust retry policy
-        retry = Retry(
-            total=max_retries or settings.max_retries,
-            connect=max_retries or settings.max_retries,
-            read=max_retries or settings.max_retries,
-            backoff_factor=backoff_factor or settings.backoff_factor,
-            status_forcelist=(429, 500, 502, 503, 504),
+        self.max_retries = max_retries or settings.max_retries
+        self.backoff_factor = backoff_factor or settings.backoff_factor
+        self.mailto = mailto or settings.mailto
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+        # Robust retry policy; 429s are left to get_json so the pause is shared
+        self._retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
             allowed_methods=frozenset(["GET"]),
             raise_on_status=False,
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        # requests.Session is not thread-safe: one per thread of the fetch pools
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(max_retries=self._retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
 
     def _url(self, path: str) -> str:
         return f"{self.base_url}/{path.lstrip('/')}"
 
-    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        With `deadline` (time.monotonic()), no rate-limit token is waited for and
+        no 429 retry is sent past it, and the request timeout is capped to it.
+        """
         params = dict(params or {})
 
         # Respect documented page size limits (1-200)
@@ -74,15 +161,36 @@ class OpenAlexClient:
                     params["per-page"] = min(200, max(1, v))
             except Exception:
                 params["per-page"] = settings.per_page
+        if self.mailto and "mailto" not in params:
+            params["mailto"] = self.mailto
         url = self._url(path)
         logger.info("OpenAlex GET %s params=%s", url, params)
-        resp = self.session.get(url, params=params, timeout=self.timeout_s)
 
-        # Manual handling for 429 after retries exhausted: brief sleep + one last try
-        if resp.status_code == 429:
-            retry_after = int(resp.headers.get("Retry-After", "1"))
-            time.sleep(min(5, max(1, retry_after)))
-            resp = self.session.get(url, params=params, timeout=self.timeout_s)
+        for attempt in range(self.max_retries + 1):
+            timeout = self.timeout_s
+            if deadline is None:
+                self.rate_limiter.acquire()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.rate_limiter.acquire(timeout_s=remaining) is None:
+                    raise OpenAlexDeadlineError(f"Deadline passed before the OpenAlex request to {url}")
+                timeout = max(0.01, min(timeout, deadline - time.monotonic()))
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout)
+            except requests.Timeout as e:
+                # the timeout was capped to the deadline, so running out of it is the deadline passing
+                if deadline is not None and time.monotonic() >= deadline - 0.01:
+                    raise OpenAlexDeadlineError(f"Deadline passed during the OpenAlex request to {url}") from e
+                raise OpenAlexError(f"OpenAlex request to {url} timed out: {e}") from e
+            except requests.RequestException as e:
+                raise OpenAlexError(f"OpenAlex request to {url} failed: {e}") from e
+            if resp.status_code != 429 or attempt == self.max_retries:
+                break
+            # every worker waits out Retry-After (or a jittered backoff) before the next request
+            backoff = self.backoff_factor * (2 ** attempt) * random.uniform(0.5, 1.5)
+            pause = min(settings.max_retry_after_s, _retry_after_s(resp.headers.get("Retry-After"), backoff))
+            logger.warning("OpenAlex 429, pausing requests for %.2fs", pause)
+            self.rate_limiter.penalize(pause)
 
         if not resp.ok:
             logger.error(
@@ -95,7 +203,12 @@ class OpenAlexClient:
             raise OpenAlexError(
                 f"OpenAlex error {resp.status_code} for {url} with params {params}:\n{resp.text[:500]}"
             )
+        body = resp.content
+        started = time.perf_counter()
         try:
-            return resp.json()
+            data = loads(body)
         except ValueError as e:
             raise OpenAlexError(f"Failed to decode JSON from OpenAlex: {e}") from e
+        results = data.get("results") if isinstance(data, dict) else None
+        payload_stats.record(len(body), len(results or []), time.perf_counter() - started)
+        return data
@@ -1,4 +1,6 @@
 # data/config.py
+from typing import Optional
+
 from pydantic import AnyHttpUrl, Field
 from pydantic_settings import BaseSettings
 
@@ -11,6 +13,18 @@ class Settings(BaseSettings):
     per_page: int = Field(20, ge=1, le=200)  
     max_retries: int = 3                      # network + 429/5xx retries
     backoff_factor: float = 0.8               # exponential backoff base
+    max_keywords: int = Field(8, ge=1)        # keywords kept per search (query planner keeps it tractable)
+    max_url_length: int = 4000                # longer filters are split across requests
+    max_parallel_requests: int = Field(8, ge=1)
+    target_candidates: int = Field(40, ge=1)  # first candidate pool size: probed for, paged up to, cut to
+    max_date_shards: int = Field(1, ge=1)     # year shards searched in parallel for wide date ranges; 1 disables (opt-in)
+    shard_min_span_years: int = Field(5, ge=2)  # narrower ranges are not sharded
+    shard_floor_year: int = 2000              # an unset start_date shards from here (the first shard stays open)
+    mailto: Optional[str] = None              # sent as ?mailto= to join the OpenAlex polite pool
+    rate_limit_per_s: float = 8.0             # shared by all workers on the host (OpenAlex allows 10/s); <= 0 disables
+    rate_limit_burst: float = 8.0
+    rate_limit_state_path: Optional[str] = None  # token-bucket state file; defaults to a per-user file in the system temp dir
+    max_retry_after_s: float = 30.0           # cap on a single Retry-After pause
 
 
 settings = Settings()
@@ -1,13 +1,22 @@
 # data/fetch.py
 from __future__ import annotations
 
+import logging
 import re
+import time
 import unicodedata
-from typing import Dict, Iterable, List, Optional
-from itertools import combinations
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from itertools import combinations, zip_longest
+from math import comb
+from urllib.parse import urlencode
 
-from .client import OpenAlexClient
+from .client import OpenAlexClient, OpenAlexDeadlineError
+from .config import settings
 
+logger = logging.getLogger("openalex")
 
 # --------- helpers ------------------------------------------------------
 def _sanitize_term(s: str) -> str:
@@ -33,60 +42,75 @@ def _or_join(terms: Optional[List[str]]) -> Optional[str]:
     parts = [_quote(t) for t in (t.strip() for t in terms) if t and t.strip()]
     return " OR ".join(parts) if parts else None
 
-def _combinatorial_join(terms: Optional[List[str]], min_match_count: int = 1) -> Optional[str]:
+def _minimal_groups(terms: Optional[List[str]], min_match_count: int = 1) -> List[List[str]]:
     """
-    min_match_count: Determines the minimum number of words that must intersect. 
-    Example: If there are 4 keywords, min_match_count=3 -> OR combinations of 4 and 3 keywords. 
+    Smallest OR-of-AND-groups equivalent to "at least min_match_count of terms":
+      - terms are deduplicated on their sanitized, case-folded form
+        (OpenAlex search is case-insensitive) and empty ones dropped
+      - at level 1 every AND-group is absorbed by its single terms
+        (a OR b OR (a AND b) == a OR b), so only the singles remain
+      - a level above the remaining term count means "all of them"
     """
-    if not terms:
-        return None
-    
-    clean_terms = [t.strip() for t in terms if t and t.strip()]
-    
-    if not clean_terms:
-        return None
+    unique: List[str] = []
+    seen = set()
+    for t in terms or []:
+        key = _sanitize_term(t or "").lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(t.strip())
 
-    if len(clean_terms) == 1:
-        return _quote(clean_terms[0])
+    if not unique:
+        return []
+    if len(unique) == 1 or min_match_count <= 1:
+        return [[t] for t in unique]
 
-    combined_parts = []
+    r = min(max(2, min_match_count), len(unique))
+    return [list(combo) for combo in combinations(unique, r)]
 
-    r = max(2, min_match_count)
+def _render_groups(groups: List[List[str]]) -> Optional[str]:
+    parts = []
+    for group in groups:
+        quoted = [_quote(t) for t in group]
+        parts.append(quoted[0] if len(quoted) == 1 else f"({' AND '.join(quoted)})")
+    return " OR ".join(parts) if parts else None
 
-    for combo in combinations(clean_terms, r):
-        quoted_combo = [_quote(t) for t in combo]
-        group_str = f"({' AND '.join(quoted_combo)})"
-        combined_parts.append(group_str)
+def _combinatorial_join(terms: Optional[List[str]], min_match_count: int = 1) -> Optional[str]:
+    """
+    min_match_count: Determines the minimum number of words that must intersect. 
+    Example: If there are 4 keywords, min_match_count=3 -> OR combinations of 3 keywords
+    (any 4-combination contains a 3-combination, so it is implied).
+    With min_match_count=1 ("bring whatever you find" mode) it is a plain OR of the terms.
+    """
+    return _render_groups(_minimal_groups(terms, min_match_count))
 
-    # If min_match_count is 1 (we are in "bring whatever you find" mode),
-    # we must also add single words to the list (simple OR logic).        
+def estimate_clause_count(n_terms: int, min_match_count: int = 1) -> int:
+    """
+    Clauses of the naive expansion: C(n, max(2, min_match_count)) AND-groups,
+    plus the n single terms at level 1.
+    """
+    if n_terms <= 0:
+        return 0
+    if n_terms == 1:
+        return 1
+    r = max(2, min_match_count)
+    count = comb(n_terms, r) if r <= n_terms else 0
     if min_match_count == 1:
-        for term in clean_terms:
-            combined_parts.append(_quote(term))
-    
-    return " OR ".join(combined_parts)
+        count += n_terms
+    return count
 
-def build_filter(
-    *,
-    keywords: Optional[List[str]] = None,   # searched in title+abstract
-    abstracts: Optional[List[str]] = None,  # searched in abstract only
-    start_date: Optional[str] = None,       # YYYY-MM-DD
-    end_date: Optional[str] = None,         # YYYY-MM-DD
-    work_types: Optional[List[str]] = None,
-    min_match_count: int = 1,
+def _compose_filter(
+    kw_query: Optional[str],
+    abs_query: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    work_types: Optional[List[str]],
 ) -> str:
-    """
-    Compose an OpenAlex filter string.
-    Keywords use combinatorial AND logic joined by OR.  
-    """
     filters: List[str] = []
 
-    kw_query = _combinatorial_join(keywords, min_match_count=min_match_count)
     if kw_query:
         field = "title_and_abstract.search"
         filters.append(f"{field}:{kw_query}")
 
-    abs_query = _combinatorial_join(abstracts)
     if abs_query:
         field = "abstract.search"
         filters.append(f"{field}:({abs_query})")
@@ -102,6 +126,242 @@ def build_filter(
 
     return ",".join(filters)
 
+def build_filter(
+    *,
+    keywords: Optional[List[str]] = None,   # searched in title+abstract
+    abstracts: Optional[List[str]] = None,  # searched in abstract only
+    start_date: Optional[str] = None,       # YYYY-MM-DD
+    end_date: Optional[str] = None,         # YYYY-MM-DD
+    work_types: Optional[List[str]] = None,
+    min_match_count: int = 1,
+) -> str:
+    """
+    Compose an OpenAlex filter string.
+    Keywords use combinatorial AND logic joined by OR.  
+    """
+    kw_query = _combinatorial_join(keywords, min_match_count=min_match_count)
+    abs_query = _combinatorial_join(abstracts)
+    return _compose_filter(kw_query, abs_query, start_date, end_date, work_types)
+
+
+# --------- query planning ---------------------------------------------------
+@dataclass
+class QueryPlan:
+    """
+    One logical OpenAlex query, possibly split into several filter strings.
+    The union of the results of `filters` equals the results of the unsplit query.
+    """
+    filters: List[str] = field(default_factory=list)
+    original_clause_count: int = 0     # clauses the naive combinatorial expansion would send
+    clause_count: int = 0              # clauses after rewriting to the minimal form
+    estimated_url_length: int = 0      # longest single request
+    dropped_terms: List[str] = field(default_factory=list)  # trailing terms left out to stay within max_requests
+
+def estimate_url_length(filter_str: str, extra_params: Optional[Dict[str, object]] = None) -> int:
+    params = dict(extra_params or {})
+    params["filter"] = filter_str
+    return len(str(settings.base_url).rstrip("/")) + len("/works?") + len(urlencode(params))
+
+def _chunk_groups(
+    groups: List[List[str]],
+    measure: Callable[[List[List[str]]], int],
+    max_len: int,
+) -> List[List[List[str]]]:
+    """
+    Greedily pack groups into chunks whose measured length stays under max_len.
+    """
+    chunks: List[List[List[str]]] = []
+    current: List[List[str]] = []
+    for group in groups:
+        if current and measure(current + [group]) > max_len:
+            chunks.append(current)
+            current = []
+        current.append(group)
+    if current:
+        chunks.append(current)
+    return chunks
+
+def plan_query(
+    *,
+    keywords: Optional[List[str]] = None,
+    abstracts: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    work_types: Optional[List[str]] = None,
+    min_match_count: int = 1,
+    extra_params: Optional[Dict[str, object]] = None,
+    max_url_length: Optional[int] = None,
+    max_requests: Optional[int] = None,
+) -> QueryPlan:
+    """
+    Rewrite the keyword/abstract clauses into their minimal form and, if the URL
+    is still longer than `max_url_length`, split the OR-ed clauses across several
+    requests. Keyword and abstract filters are AND-ed, so the split is the cross
+    product of keyword chunks and abstract chunks.
+
+    If that takes more than `max_requests` requests, the last term of the list
+    with more chunks is dropped and the query planned again; the dropped terms
+    are recorded in `dropped_terms`.
+    """
+    max_url_length = max_url_length or settings.max_url_length
+    max_requests = max_requests or settings.max_parallel_requests
+
+    kw_groups = _minimal_groups(keywords, min_match_count)
+    abs_groups = _minimal_groups(abstracts, 1)
+
+    def _filter(kw_chunk: List[List[str]], abs_chunk: List[List[str]]) -> str:
+        return _compose_filter(_render_groups(kw_chunk), _render_groups(abs_chunk), start_date, end_date, work_types)
+
+    n_kw = len([t for t in keywords or [] if t and t.strip()])
+    n_abs = len([t for t in abstracts or [] if t and t.strip()])
+    plan = QueryPlan(
+        original_clause_count=estimate_clause_count(n_kw, min_match_count) + estimate_clause_count(n_abs, 1),
+        clause_count=len(kw_groups) + len(abs_groups),
+    )
+
+    full = _filter(kw_groups, abs_groups)
+    plan.estimated_url_length = estimate_url_length(full, extra_params)
+    if plan.estimated_url_length <= max_url_length or plan.clause_count <= 1:
+        plan.filters = [full]
+        return plan
+
+    # Length left for the clauses once the rest of the URL is paid for
+    fixed = estimate_url_length(_filter([], []), extra_params)
+    spare = max(1, max_url_length - fixed)
+    abs_len = estimate_url_length(_filter([], abs_groups), extra_params) - fixed
+
+    if not abs_groups:
+        abs_budget = 0
+    elif not kw_groups:
+        abs_budget = spare
+    else:
+        abs_budget = min(abs_len, spare // 2)
+    kw_budget = max(1, spare - abs_budget)
+
+    kw_chunks = [[]]
+    if kw_groups:
+        kw_chunks = _chunk_groups(
+            kw_groups,
+            lambda c: estimate_url_length(_filter(c, []), extra_params) - fixed,
+            kw_budget,
+        )
+    abs_chunks = [[]]
+    if abs_groups:
+        abs_chunks = _chunk_groups(
+            abs_groups,
+            lambda c: estimate_url_length(_filter([], c), extra_params) - fixed,
+            max(1, abs_budget),
+        )
+
+    if len(kw_chunks) * len(abs_chunks) > max_requests:
+        kept_kw = [t for t in keywords or [] if t and t.strip()]
+        kept_abs = [t for t in abstracts or [] if t and t.strip()]
+        if len(kept_kw) > 1 and (len(kw_chunks) >= len(abs_chunks) or len(kept_abs) <= 1):
+            dropped, kept_kw = kept_kw[-1], kept_kw[:-1]
+        else:
+            dropped, kept_abs = kept_abs[-1], kept_abs[:-1]
+        smaller = plan_query(
+            keywords=kept_kw,
+            abstracts=kept_abs,
+            start_date=start_date,
+            end_date=end_date,
+            work_types=work_types,
+            min_match_count=min_match_count,
+            extra_params=extra_params,
+            max_url_length=max_url_length,
+            max_requests=max_requests,
+        )
+        smaller.original_clause_count = plan.original_clause_count
+        smaller.dropped_terms.append(dropped)
+        return smaller
+
+    plan.filters = [_filter(k, a) for k in kw_chunks for a in abs_chunks]
+    plan.estimated_url_length = max(estimate_url_length(f, extra_params) for f in plan.filters)
+    return plan
+
+def merge_results(result_sets: Iterable[Iterable[Dict]], limit: Optional[int] = None) -> List[Dict]:
+    """
+    Union of several result lists: deduplicate by id (keeping the best
+    relevance_score), then order by relevance_score desc.
+    """
+    merged: Dict[str, Dict] = {}
+    order: List[str] = []
+    for results in result_sets:
+        for r in results:
+            wid = r.get("id")
+            if not wid:
+                continue
+            if wid not in merged:
+                merged[wid] = r
+                order.append(wid)
+            elif (r.get("relevance_score") or 0) > (merged[wid].get("relevance_score") or 0):
+                merged[wid] = r
+
+    rank = {wid: i for i, wid in enumerate(order)}
+    ordered = sorted(order, key=lambda wid: (-(merged[wid].get("relevance_score") or 0), rank[wid]))
+    out = [merged[wid] for wid in ordered]
+    return out[:limit] if limit is not None else out
+
+
+# --------- retrieval profiles ----------------------------------------------
+# Minimal `select` per use. OpenAlex only selects top-level fields, so e.g.
+# `concepts` comes whole even though only display_name is read. Unselected
+# fields are omitted, relevance_score included: the search profile needs it
+# for merging split / sharded results and for the hybrid OpenAlex signal.
+SELECT_PROFILES: Dict[str, str] = {
+    "count": "id",
+    "dedup": "id,display_name",
+    "search": "id,display_name,concepts,abstract_inverted_index,publication_year,relevance_score",
+    "citations": "id,referenced_works,related_works",
+}
+
+
+def select_for(profile: str) -> str:
+    try:
+        return SELECT_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"unknown retrieval profile: {profile}") from None
+
+
+# Work types the searches return by default
+SEARCH_WORK_TYPES: List[str] = ["article", "preprint"]
+
+
+# --------- date shards -------------------------------------------------------
+def date_shards(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    max_shards: int,
+    min_span_years: Optional[int] = None,
+    floor_year: Optional[int] = None,
+    today: Optional[date] = None,
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Split a publication-date range into at most `max_shards` contiguous year
+    buckets, as (from_publication_date, to_publication_date) pairs. Open ends
+    stay open in the first / last bucket; an unset start counts from
+    `floor_year`. Recent years, which hold most works, get the narrower buckets.
+    Ranges shorter than `min_span_years` come back as the single original range.
+    """
+    min_span_years = min_span_years or settings.shard_min_span_years
+    first = int(start_date[:4]) if start_date else (floor_year or settings.shard_floor_year)
+    last = int(end_date[:4]) if end_date else (today or date.today()).year
+    years = last - first + 1
+    if max_shards < 2 or years < max(2, min_span_years):
+        return [(start_date, end_date)]
+
+    n = min(max_shards, years)
+    size, extra = divmod(years, n)
+    shards: List[Tuple[Optional[str], Optional[str]]] = []
+    y0 = first
+    for i in range(n):
+        y1 = y0 + size - 1 + (1 if i < extra else 0)
+        lo = f"{y0}-01-01" if i else start_date
+        hi = f"{y1}-12-31" if i < n - 1 else end_date
+        shards.append((lo, hi))
+        y0 = y1 + 1
+    return shards
+
 
 # --------- single-page + iterator -------------------------------------------
 def works_page(
@@ -110,18 +370,24 @@ def works_page(
     filter_str: Optional[str] = None,
     page: int = 1,
     per_page: int = 20,
-    sort: str = "relevance_score:desc",
+    sort: Optional[str] = "relevance_score:desc",
     select_fields: Optional[str] = None,
+    deadline: Optional[float] = None,
 ) -> Dict:
     """
     Fetch a single page from /works. Provide either `filter_str` and/or `search`.
     Returns the raw response dict with 'meta' and 'results'.
+    `deadline` (time.monotonic()) bounds the rate-limit wait and retries.
     """
-    params: Dict[str, object] = {"page": page, "per-page": per_page, "sort": sort}
+    params: Dict[str, object] = {"page": page, "per-page": per_page}
+    if sort:
+        params["sort"] = sort
     if filter_str:
         params["filter"] = filter_str
     if select_fields:
         params["select"] = select_fields
+    if deadline is not None:
+        return client.get_json("works", params, deadline=deadline)
     return client.get_json("works", params)
 
 
@@ -133,11 +399,13 @@ def iterate_works(
     sort: str = "relevance_score:desc",
     max_pages: int = 1,  # safety cap
     select_fields: Optional[str] = None,
+    start_page: int = 1,
 ) -> Iterable[Dict]:
     """
-    Yield Work records across pages until the last short page (or `max_pages`).
+    Yield Work records across pages until the last short page (or `max_pages`),
+    starting at `start_page`.
     """
-    page = 1
+    page = start_page
     fetched = 0
     while True:
         data = works_page(
@@ -161,36 +429,267 @@ def iterate_works(
 
 
 # --------- convenience: build + iterate in one call --------------------------
-def search_from_lists(
+@dataclass
+class SearchPage:
+    """
+    One page of a search that may take several requests (split filters, date
+    shards): the union of their pages, deduplicated and ordered by relevance.
+    """
+    results: List[Dict] = field(default_factory=list)
+    full: bool = False      # some request came back full, so the next page may hold more
+    dropped_terms: List[str] = field(default_factory=list)  # left out to stay within max_requests
+
+
+def search_page(
     client: OpenAlexClient,
     *,
     keywords: Optional[List[str]] = None,
     abstracts: Optional[List[str]] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    page: int = 1,
     per_page: int = 20,
     sort: str = "relevance_score:desc",
-    max_pages: int = 1,
     select_fields: Optional[str] = None,
-    work_types: List[str] = ["article", "preprint"],
+    work_types: List[str] = SEARCH_WORK_TYPES,
     min_match_count: int = 1,
-) -> Iterable[Dict]:
+    max_date_shards: int = 1,
+) -> SearchPage:
     """
-    Build a fielded-search filter from lists, then stream results.
+    Page `page` of a fielded search built from lists. An oversized filter is
+    split by `plan_query` and its parts are fetched in parallel, each at the
+    same page. The union is returned whole, so it can hold more than
+    `per_page` works: paging every part in step serves each work once.
+
+    With `max_date_shards` > 1, a wide (or open) date range is searched as
+    year shards in parallel (see `date_shards`), each asked for its share of
+    `per_page` at the same page, so the union needs no truncation either.
     """
-    filt = build_filter(
+    shards = date_shards(start_date, end_date, max_date_shards) if max_date_shards > 1 else []
+    if len(shards) > 1:
+        quota = -(-per_page // len(shards))
+
+        def _fetch_shard(shard: Tuple[Optional[str], Optional[str]]) -> SearchPage:
+            return search_page(
+                client,
+                keywords=keywords,
+                abstracts=abstracts,
+                start_date=shard[0],
+                end_date=shard[1],
+                page=page,
+                per_page=quota,
+                sort=sort,
+                select_fields=select_fields,
+                work_types=work_types,
+                min_match_count=min_match_count,
+            )
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            shard_pages = list(pool.map(_fetch_shard, shards))
+        # round-robin first, so equal (or missing) relevance scores alternate between shards
+        interleaved = [r for row in zip_longest(*(p.results for p in shard_pages)) for r in row if r is not None]
+        return SearchPage(
+            results=merge_results([interleaved]),
+            full=any(p.full for p in shard_pages),
+            dropped_terms=list(dict.fromkeys(t for p in shard_pages for t in p.dropped_terms)),
+        )
+
+    plan = plan_query(
         keywords=keywords,
         abstracts=abstracts,
         start_date=start_date,
         end_date=end_date,
         work_types=work_types,
         min_match_count=min_match_count,
+        extra_params={"page": page, "per-page": per_page, "sort": sort, "select": select_fields or ""},
     )
-    yield from iterate_works(
-        client,
-        filter_str=filt,
-        per_page=per_page,
-        sort=sort,
-        max_pages=max_pages,
-        select_fields=select_fields,
+    if plan.dropped_terms:
+        logger.warning("Query too long for %d requests; left out: %s", settings.max_parallel_requests, plan.dropped_terms)
+
+    def _fetch(filter_str: str) -> List[Dict]:
+        data = works_page(
+            client,
+            filter_str=filter_str,
+            page=page,
+            per_page=per_page,
+            sort=sort,
+            select_fields=select_fields,
+        )
+        return data.get("results", []) or []
+
+    if len(plan.filters) == 1:
+        results = _fetch(plan.filters[0])
+        return SearchPage(results=results, full=len(results) >= per_page, dropped_terms=plan.dropped_terms)
+
+    with ThreadPoolExecutor(max_workers=len(plan.filters)) as pool:
+        result_sets = list(pool.map(_fetch, plan.filters))
+    return SearchPage(
+        results=merge_results(result_sets),
+        full=any(len(results) >= per_page for results in result_sets),
+        dropped_terms=plan.dropped_terms,
     )
+
+
+def search_from_lists(
+    client: OpenAlexClient,
+    *,
+    keywords: Optional[List[str]] = None,
+    abstracts: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    per_page: int = 20,
+    sort: str = "relevance_score:desc",
+    max_pages: int = 1,
+    select_fields: Optional[str] = None,
+    work_types: List[str] = SEARCH_WORK_TYPES,
+    min_match_count: int = 1,
+    start_page: int = 1,
+    max_date_shards: int = 1,
+) -> Iterable[Dict]:
+    """
+    Build a fielded-search filter from lists, then stream results page by
+    page (see `search_page`, which also handles `max_date_shards`) until a
+    page with no full request, or `max_pages`.
+    """
+    for page in range(start_page, start_page + max_pages):
+        result = search_page(
+            client,
+            keywords=keywords,
+            abstracts=abstracts,
+            start_date=start_date,
+            end_date=end_date,
+            page=page,
+            per_page=per_page,
+            sort=sort,
+            select_fields=select_fields,
+            work_types=work_types,
+            min_match_count=min_match_count,
+            max_date_shards=max_date_shards,
+        )
+        yield from result.results
+        if not result.full:
+            break
+
+
+# --------- id lookups -------------------------------------------------------
+MAX_IDS_PER_FILTER = 50  # OpenAlex limit on OR-ed values in one filter
+
+
+def _short_id(work_id: str) -> str:
+    # "https://openalex.org/W123" -> "W123", keeps the filter short
+    return work_id.rstrip("/").rsplit("/", 1)[-1]
+
+
+def fetch_works_by_ids(
+    client: OpenAlexClient,
+    ids: Iterable[str],
+    *,
+    select_fields: Optional[str] = None,
+    timeout_s: Optional[float] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    work_types: Optional[List[str]] = None,
+) -> List[Dict]:
+    """
+    Records for `ids`, in no particular order: openalex_id filters of up to
+    50 OR-ed ids, fetched concurrently. The date range and work types, when
+    given, are added to each filter, so ids outside them are not returned.
+
+    With `timeout_s`, batches that are not back in time are dropped; a request
+    already on the wire is left to finish, but neither it nor the queued
+    batches wait for rate-limit tokens or retry past the deadline.
+    """
+    unique = list(dict.fromkeys(_short_id(i) for i in ids if i))
+    batches = [unique[i:i + MAX_IDS_PER_FILTER] for i in range(0, len(unique), MAX_IDS_PER_FILTER)]
+    if not batches:
+        return []
+    deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+    clauses = _compose_filter(None, None, start_date, end_date, work_types)
+
+    def _fetch(batch: List[str]) -> List[Dict]:
+        data = works_page(
+            client,
+            filter_str="openalex_id:" + "|".join(batch) + (f",{clauses}" if clauses else ""),
+            per_page=len(batch),
+            sort=None,
+            select_fields=select_fields,
+            deadline=deadline,
+        )
+        return data.get("results", []) or []
+
+    pool = ThreadPoolExecutor(max_workers=min(len(batches), settings.max_parallel_requests))
+    futures = [pool.submit(_fetch, batch) for batch in batches]
+    done, _ = wait(futures, timeout=timeout_s)
+    pool.shutdown(wait=False, cancel_futures=True)
+    out: List[Dict] = []
+    for future in futures:
+        if future in done and not isinstance(future.exception(), OpenAlexDeadlineError):
+            out.extend(future.result())
+    return out
+
+
+# --------- cheap count probes -----------------------------------------------
+def count_works(client: OpenAlexClient, *, filter_str: str) -> int:
+    """
+    meta.count for a filter, without downloading records (per-page=1, select=id).
+    """
+    data = works_page(client, filter_str=filter_str, page=1, per_page=1, select_fields=SELECT_PROFILES["count"])
+    return int((data.get("meta") or {}).get("count") or 0)
+
+
+def probe_match_counts(
+    client: OpenAlexClient,
+    *,
+    levels: Iterable[int],
+    keywords: Optional[List[str]] = None,
+    abstracts: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    work_types: List[str] = SEARCH_WORK_TYPES,
+) -> Dict[int, int]:
+    """
+    Result counts for every min_match_count level, probed in parallel.
+    For a split plan the per-filter counts are summed, so the count is an
+    upper bound when the split filters overlap.
+    """
+    plans = {
+        level: plan_query(
+            keywords=keywords,
+            abstracts=abstracts,
+            start_date=start_date,
+            end_date=end_date,
+            work_types=work_types,
+            min_match_count=level,
+            extra_params={"page": 1, "per-page": 1, "sort": "relevance_score:desc", "select": SELECT_PROFILES["count"]},
+        )
+        for level in levels
+    }
+    for level, plan in plans.items():
+        if plan.dropped_terms:
+            logger.warning("Probe of match count %d left out: %s", level, plan.dropped_terms)
+    jobs = [(level, f) for level, plan in plans.items() for f in plan.filters]
+    if not jobs:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(len(jobs), settings.max_parallel_requests)) as pool:
+        counts = list(pool.map(lambda job: count_works(client, filter_str=job[1]), jobs))
+
+    totals: Dict[int, int] = {level: 0 for level in plans}
+    for (level, _), count in zip(jobs, counts):
+        totals[level] += count
+    return totals
+
+
+def pick_match_levels(counts: Dict[int, int], target: int) -> List[int]:
+    """
+    Non-empty levels, strictest first, down to the first one that reaches
+    `target` on its own (a looser level's results include the stricter ones).
+    """
+    levels: List[int] = []
+    for level in sorted(counts, reverse=True):
+        if counts[level] <= 0:
+            continue
+        levels.append(level)
+        if counts[level] >= target:
+            break
+    return levels
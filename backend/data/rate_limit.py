@@ -0,0 +1,174 @@
+# data/rate_limit.py
+from __future__ import annotations
+
+import logging
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: the bucket is per process only
+    fcntl = None
+
+from .config import settings
+
+logger = logging.getLogger("openalex")
+
+# bucket state: tokens, last refill (epoch s), blocked until (epoch s)
+_STATE = struct.Struct("<ddd")
+
+
+@dataclass
+class ThrottleStats:
+    acquired: int = 0
+    waits: int = 0
+    throttled_s: float = 0.0
+    rate_limited: int = 0          # 429 responses reported through penalize()
+    blocked_s: float = 0.0         # Retry-After time imposed on all workers
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "acquired": self.acquired,
+            "waits": self.waits,
+            "throttled_s": round(self.throttled_s, 3),
+            "rate_limited": self.rate_limited,
+            "blocked_s": round(self.blocked_s, 3),
+        }
+
+
+class TokenBucket:
+    """
+    Token bucket in front of every OpenAlex request.
+
+    The state lives in a small file guarded by flock, so all worker processes on
+    the host draw from one budget, and a Retry-After seen by one worker pauses
+    the others too. Waits get random jitter so workers do not retry in lockstep.
+    Stats are per process.
+    """
+
+    def __init__(self, rate_per_s: float, burst: float, path: Optional[str] = None, jitter_s: float = 0.05) -> None:
+        self.rate_per_s = rate_per_s
+        self.burst = max(1.0, burst)
+        self.jitter_s = jitter_s
+        self.path = path
+        self.stats = ThrottleStats()
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._local = (self.burst, time.time(), 0.0)
+        if path is not None and fcntl is not None:
+            try:
+                self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError as exc:
+                logger.warning("Cannot open rate-limit state %s (%s); throttling this process only", path, exc)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # --------- shared state -------------------------------------------------
+    def _read(self):
+        if self._fd is None:
+            return self._local
+        raw = os.pread(self._fd, _STATE.size, 0)
+        if len(raw) < _STATE.size:
+            return (self.burst, time.time(), 0.0)
+        return _STATE.unpack(raw)
+
+    def _write(self, state) -> None:
+        if self._fd is None:
+            self._local = state
+        else:
+            os.pwrite(self._fd, _STATE.pack(*state), 0)
+
+    def _update(self, fn):
+        """
+        Run fn(tokens, updated_at, blocked_until, now) -> (new state, result)
+        under the in-process lock and the cross-process file lock.
+        """
+        with self._lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                state, result = fn(*self._read(), now)
+                self._write(state)
+                return result
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    # --------- public -------------------------------------------------------
+    def _try_take(self, tokens: float, updated_at: float, blocked_until: float, now: float):
+        tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate_per_s)
+        if blocked_until > now:
+            return (tokens, now, blocked_until), blocked_until - now
+        if self.rate_per_s <= 0:
+            # throttling disabled; a Retry-After block above still applies
+            return (tokens, now, blocked_until), 0.0
+        if tokens >= 1.0:
+            return (tokens - 1.0, now, blocked_until), 0.0
+        return (tokens, now, blocked_until), (1.0 - tokens) / self.rate_per_s
+
+    def acquire(self, timeout_s: Optional[float] = None) -> Optional[float]:
+        """
+        Block until a request may be sent; returns the time spent waiting, or
+        None (no token taken) when that would take longer than `timeout_s`.
+        """
+        waited = 0.0
+        while True:
+            wait = self._update(self._try_take)
+            if wait <= 0:
+                break
+            wait += random.uniform(0, self.jitter_s)
+            if timeout_s is not None and waited + wait > timeout_s:
+                return None
+            time.sleep(wait)
+            waited += wait
+        with self._lock:
+            self.stats.acquired += 1
+            if waited:
+                self.stats.waits += 1
+                self.stats.throttled_s += waited
+        return waited
+
+    def penalize(self, retry_after_s: float) -> None:
+        """
+        Stop every worker from sending requests for `retry_after_s` (after a 429).
+        """
+        def block(tokens, updated_at, blocked_until, now):
+            return (0.0, now, max(blocked_until, now + retry_after_s)), None
+
+        self._update(block)
+        with self._lock:
+            self.stats.rate_limited += 1
+            self.stats.blocked_s += retry_after_s
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> TokenBucket:
+    # One bucket per process, all backed by the same state file
+    path = settings.rate_limit_state_path
+    if path is None:
+        # per user: another user's 0600 file in the shared temp dir cannot be opened
+        user = os.getuid() if hasattr(os, "getuid") else "local"
+        path = os.path.join(tempfile.gettempdir(), f"research-finder-openalex-{user}.bucket")
+    return TokenBucket(
+        rate_per_s=settings.rate_limit_per_s,
+        burst=settings.rate_limit_burst,
+        path=path,
+    )
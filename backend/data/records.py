@@ -0,0 +1,69 @@
+# data/records.py
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+
+def inverted_index_to_abstract(inverted_index: Optional[dict]) -> str:
+    if not inverted_index:
+        return ""
+
+    positions = [(idx, word) for word, indices in inverted_index.items() for idx in indices]
+    words = [""] * (max(idx for idx, _ in positions) + 1)
+    for idx, word in positions:
+        words[idx] = word
+    return " ".join(words)
+
+
+def concepts_to_keywords(concepts: Optional[list]) -> str:
+    if not concepts:
+        return ""
+    return ", ".join(c["display_name"] for c in concepts if "display_name" in c)
+
+
+class WorkRecord:
+    """
+    Thin view over one decoded OpenAlex work.
+
+    Only the scalar fields are read eagerly; the abstract (rebuilt from the
+    inverted index) and the concept keywords are built on first access, so
+    records dropped by deduplication or the pool cap never pay for them.
+    """
+
+    __slots__ = ("raw", "_abstract", "_keywords")
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.raw = raw
+        self._abstract: Optional[str] = None
+        self._keywords: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        return self.raw.get("id") or ""
+
+    @property
+    def title(self) -> str:
+        return self.raw.get("display_name") or ""
+
+    @property
+    def publication_year(self) -> Optional[int]:
+        return self.raw.get("publication_year")
+
+    @property
+    def relevance_score(self) -> Optional[float]:
+        return self.raw.get("relevance_score")
+
+    @property
+    def abstract(self) -> str:
+        if self._abstract is None:
+            self._abstract = inverted_index_to_abstract(self.raw.get("abstract_inverted_index"))
+        return self._abstract
+
+    @property
+    def keywords(self) -> str:
+        if self._keywords is None:
+            self._keywords = concepts_to_keywords(self.raw.get("concepts"))
+        return self._keywords
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.raw.get(key, default)
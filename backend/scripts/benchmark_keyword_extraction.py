@@ -0,0 +1,74 @@
+"""
+Phrase-vocabulary keyword extraction vs KeyBERT.
+
+For every fixture abstract, extracts --top-n keywords with KeyBERT (as
+works_service did before) and with the prebuilt phrase vocabulary, and
+reports mean / p95 latency per abstract, how often the vocabulary found no
+candidates (KeyBERT fallback), and the agreement of the two keyword lists
+(overlap@n, counting a vocabulary phrase as agreeing when it contains a
+KeyBERT keyword). Build the vocabulary first with
+scripts/build_phrase_vocab.py; note that mining it from the same fixture
+flatters its coverage.
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_keyword_extraction --top-n 10
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .rerank_eval import load_dataset
+from ..app.services.phrase_vocab_service import get_phrase_vocabulary
+from ..app.services.works_service import get_keybert_model
+
+
+def overlap(vocab_keywords: List[str], keybert_keywords: List[str]) -> float:
+    if not keybert_keywords:
+        return float("nan")
+    hits = sum(any(k in phrase.split() or k == phrase for phrase in vocab_keywords) for k in keybert_keywords)
+    return hits / len(keybert_keywords)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-n", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    vocab = get_phrase_vocabulary()
+    if vocab is None:
+        parser.error("no phrase vocabulary; run python -m backend.scripts.build_phrase_vocab first")
+    keybert = get_keybert_model()
+    abstracts = [p["abstract"] for p in load_dataset() if len((p.get("abstract") or "").split()) >= 3]
+
+    # warm both paths (model load, first memmap page-in)
+    keybert.extract_keywords(abstracts[0], top_n=args.top_n)
+    vocab.extract(abstracts[0], top_n=args.top_n)
+
+    keybert_ms, vocab_ms, overlaps, misses = [], [], [], 0
+    for text in abstracts:
+        started = time.perf_counter()
+        kb = [k for k, _ in keybert.extract_keywords(text, top_n=args.top_n)]
+        keybert_ms.append((time.perf_counter() - started) * 1000.0)
+
+        started = time.perf_counter()
+        vk = vocab.extract(text, top_n=args.top_n)
+        vocab_ms.append((time.perf_counter() - started) * 1000.0)
+        misses += not vk
+        overlaps.append(overlap(vk, kb))
+
+    print(f"{len(abstracts)} abstracts, top_n={args.top_n}, vocabulary: {len(vocab)} phrases, n-grams {vocab.ngram_range}\n")
+    print(f"{'extractor':>10} {'mean ms':>9} {'p95 ms':>9}")
+    for name, ms in (("keybert", keybert_ms), ("vocabulary", vocab_ms)):
+        print(f"{name:>10} {np.mean(ms):>9.2f} {np.percentile(ms, 95):>9.2f}")
+    print(f"\nspeedup (mean): {np.mean(keybert_ms) / max(np.mean(vocab_ms), 1e-9):.1f}x")
+    print(f"no vocabulary candidates (KeyBERT fallback): {misses}/{len(abstracts)}")
+    print(f"KeyBERT keywords covered by vocabulary phrases: {np.nanmean(overlaps):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
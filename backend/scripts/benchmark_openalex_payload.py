@@ -0,0 +1,66 @@
+"""
+Bytes per work and decode time of OpenAlex responses, per retrieval profile.
+
+Fetches one page of /works for a keyword filter with each `select` profile
+(plus the previous select set, for comparison), then times, over the raw
+body: stdlib json vs orjson (when installed), and building WorkRecords with
+and without rebuilding every abstract.
+
+Usage (from the repository root; needs network):
+    python -m backend.scripts.benchmark_openalex_payload --keywords "graph neural network,drug discovery"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, List, Optional
+
+from ..data.client import OpenAlexClient, orjson
+from ..data.fetch import SELECT_PROFILES, build_filter
+from ..data.records import WorkRecord
+
+PREVIOUS_SELECT = "id,display_name,concepts,abstract_inverted_index,publication_year,authorships"
+
+
+def time_ms(fn: Callable[[], object], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000.0 / repeat
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", default="molecular communication,nanonetworks")
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    client = OpenAlexClient()
+    filter_str = build_filter(keywords=[k.strip() for k in args.keywords.split(",") if k.strip()])
+    profiles = dict(SELECT_PROFILES, previous=PREVIOUS_SELECT)
+
+    print(f"{'profile':>10} {'works':>6} {'bytes/work':>11} {'json ms':>9} {'orjson ms':>10} {'records ms':>11} {'+abstracts ms':>14}")
+    for name, select in profiles.items():
+        client.rate_limiter.acquire()
+        resp = client.session.get(
+            client._url("works"),
+            params={"filter": filter_str, "per-page": args.per_page, "select": select},
+            timeout=client.timeout_s,
+        )
+        resp.raise_for_status()
+        body = resp.content
+        results = json.loads(body).get("results", [])
+        n = max(1, len(results))
+
+        json_ms = time_ms(lambda: json.loads(body), args.repeat)
+        orjson_ms = time_ms(lambda: orjson.loads(body), args.repeat) if orjson is not None else float("nan")
+        records_ms = time_ms(lambda: [WorkRecord(r).id for r in results], args.repeat)
+        full_ms = time_ms(lambda: [(WorkRecord(r).abstract, WorkRecord(r).keywords) for r in results], args.repeat)
+        print(f"{name:>10} {len(results):>6} {len(body) / n:>11.0f} {json_ms:>9.3f} {orjson_ms:>10.3f} {records_ms:>11.3f} {full_ms:>14.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""
+Recall and memory of the reduced-precision embedding representations.
+
+Embeds the Birkan fixture and its queries with the bi-encoder, grows the
+corpus to --size with perturbed copies (so the scan sizes are realistic),
+then for every storage precision reports, per query:
+  - recall@k of the exact scan over the dequantized matrix vs exact float32 cosine
+  - recall@k of the two-stage search (Hamming prefilter + rescore) per --rescore-k
+  - mean search latency
+  - memory per vector and per million works (matrix, and matrix + binary codes)
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_quantization
+    python -m backend.scripts.benchmark_quantization --size 200000 --k 10 --rescore-k 100,500,2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .rerank_eval import QUERY_VARIANTS, build_query, load_dataset, pick_query_papers, to_summary
+from ..app.quantization import EMBEDDING_DTYPES, EmbeddingIndex, bytes_per_vector
+from ..app.schemas import WorksSearchResponse
+from ..app.services.semantic_rerank_service import (
+    build_query_space_representation,
+    build_search_space_representation,
+    get_sentence_transformer,
+)
+
+MILLION = 1_000_000
+
+
+def grow(emb: np.ndarray, size: int, noise: float, seed: int = 13) -> np.ndarray:
+    if size <= len(emb):
+        return emb
+    rng = np.random.default_rng(seed)
+    extra = emb[rng.integers(0, len(emb), size - len(emb))]
+    extra = extra + rng.normal(0, noise, extra.shape).astype(np.float32)
+    return np.vstack([emb, extra]).astype(np.float32)
+
+
+def recall(found: List[int], truth: List[int]) -> float:
+    return len(set(found) & set(truth)) / max(1, len(truth))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-k", default="100,500,2000")
+    parser.add_argument("--noise", type=float, default=0.02, help="std of the perturbation of synthetic copies")
+    args = parser.parse_args(argv)
+    rescore_ks = [int(x) for x in args.rescore_k.split(",") if x.strip()]
+
+    dataset = load_dataset()
+    corpus = WorksSearchResponse(results=[to_summary(p) for p in dataset])
+    model = get_sentence_transformer()
+    doc_emb = model.encode(list(build_search_space_representation(corpus).values()), convert_to_numpy=True)
+    doc_emb = grow(doc_emb.astype(np.float32), args.size, args.noise)
+    queries = [
+        model.encode(build_query_space_representation(build_query(qp, v)), convert_to_numpy=True)
+        for v in QUERY_VARIANTS for _, qp in pick_query_papers(dataset)
+    ]
+    dim = doc_emb.shape[1]
+    print(f"corpus: {len(doc_emb)} works x {dim} dims, {len(queries)} queries, k={args.k}\n")
+
+    truth = EmbeddingIndex([str(i) for i in range(len(doc_emb))], doc_emb, "float32")
+    exact = [truth.exact(q, args.k) for q in queries]
+
+    print(f"{'dtype':>8} {'search':>12} {'recall@k':>9} {'ms/query':>9} {'B/vector':>9} {'MB/1M works':>12}")
+    code_bytes = bytes_per_vector(dim, "binary")
+    for dtype in EMBEDDING_DTYPES:
+        index = truth if dtype == "float32" else EmbeddingIndex(truth.ids, doc_emb, dtype)
+        vec_bytes = bytes_per_vector(dim, dtype)
+
+        started = time.perf_counter()
+        found = [index.exact(q, args.k) for q in queries]
+        ms = (time.perf_counter() - started) * 1000.0 / len(queries)
+        r = float(np.mean([recall(f, t) for f, t in zip(found, exact)]))
+        print(f"{dtype:>8} {'full scan':>12} {r:>9.3f} {ms:>9.2f} {vec_bytes:>9} {vec_bytes * MILLION / 1e6:>12.0f}")
+
+        for rescore_k in rescore_ks:
+            started = time.perf_counter()
+            found = [index.search(q, args.k, rescore_k) for q in queries]
+            ms = (time.perf_counter() - started) * 1000.0 / len(queries)
+            r = float(np.mean([recall(f, t) for f, t in zip(found, exact)]))
+            total = vec_bytes + code_bytes
+            print(f"{dtype:>8} {f'two-stage@{rescore_k}':>12} {r:>9.3f} {ms:>9.2f} {total:>9} {total * MILLION / 1e6:>12.0f}")
+
+    print(f"\nbinary codes alone: {code_bytes} B/vector, {code_bytes * MILLION / 1e6:.0f} MB per million works")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
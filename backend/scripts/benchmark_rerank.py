@@ -0,0 +1,213 @@
+"""
+Offline retrieval/rerank benchmark.
+
+Replays the Birkan fixture (and synthetic scaled-up copies of it) against every
+ranking mode and reports, per (corpus size, mode):
+  - latency p50 / p95 / p99 per query, documents scored per second
+  - peak RSS of the process
+  - P@k, MRR and nDCG@k (k = relevant papers in the query's group)
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_rerank
+    python -m backend.scripts.benchmark_rerank --sizes fixture,1000,10000 --modes bm25,bi_encoder
+    python -m backend.scripts.benchmark_rerank --save-baseline backend/scripts/bench_baseline.json
+    python -m backend.scripts.benchmark_rerank --baseline backend/scripts/bench_baseline.json
+
+Model-backed modes (bi-encoder, hybrid, cascade, cross-encoder) score every
+work against every query, so --max-pairs skips them on corpora where
+works x queries would take too long.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .rerank_eval import (
+    QUERY_VARIANTS,
+    build_query,
+    load_dataset,
+    ndcg_at_k,
+    paper_group,
+    pick_query_papers,
+    precision_at_k,
+    ranking_modes,
+    reciprocal_rank,
+    relevance_flags,
+    scale_corpus,
+    search_space_for,
+)
+
+# modes that run a model over works x queries; --max-pairs applies to them
+MODEL_MODES = {"bi_encoder", "hybrid", "cascade", "cross_encoder"}
+
+# metric -> (direction, tolerance); "higher" metrics regress when they drop
+REGRESSION_RULES = {
+    "latency_p95_ms": ("lower", 0.20),   # relative
+    "docs_per_s": ("higher", 0.20),      # relative
+    "peak_rss_mb": ("lower", 0.20),      # relative
+    "p_at_k": ("higher", 0.02),          # absolute
+    "mrr": ("higher", 0.02),             # absolute
+    "ndcg": ("higher", 0.02),            # absolute
+}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_one(mode: str, size: Optional[int], max_queries: Optional[int]) -> Dict:
+    dataset = load_dataset()
+    groups_by_id = {p["id"]: paper_group(p) for p in dataset}
+    corpus = scale_corpus(dataset, size) if size else dataset
+    rank = ranking_modes()[mode]
+
+    cases = [(g, qp, v) for g, qp in pick_query_papers(dataset) for v in QUERY_VARIANTS]
+    if max_queries:
+        cases = cases[:max_queries]
+
+    # warm-up: model loading must not count as query latency
+    g, qp, v = cases[0]
+    rank(build_query(qp, v), search_space_for(qp["id"], dataset))
+
+    latencies: List[float] = []
+    docs_scored = 0
+    p_at, mrr, ndcg = [], [], []
+    for group, qp, variant in cases:
+        works = search_space_for(qp["id"], corpus)
+        query = build_query(qp, variant)
+
+        started = time.perf_counter()
+        ranked = rank(query, works)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        docs_scored += len(works.results)
+
+        flags = relevance_flags([w.id for w in ranked.results], group, groups_by_id)
+        k = sum(flags)
+        p_at.append(precision_at_k(flags, k))
+        mrr.append(reciprocal_rank(flags))
+        ndcg.append(ndcg_at_k(flags, k))
+
+    lat = np.asarray(latencies)
+    return {
+        "mode": mode,
+        "size": len(corpus),
+        "queries": len(cases),
+        "latency_p50_ms": float(np.percentile(lat, 50)),
+        "latency_p95_ms": float(np.percentile(lat, 95)),
+        "latency_p99_ms": float(np.percentile(lat, 99)),
+        "docs_per_s": docs_scored / (lat.sum() / 1000.0) if lat.sum() > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "p_at_k": float(np.mean(p_at)),
+        "mrr": float(np.mean(mrr)),
+        "ndcg": float(np.mean(ndcg)),
+    }
+
+
+def _run_isolated(args) -> Dict:
+    return run_one(*args)
+
+
+def run_benchmark(modes: List[str], sizes: List[Optional[int]], max_queries: Optional[int], max_pairs: int, isolate: bool) -> List[Dict]:
+    rows = []
+    ctx = mp.get_context("spawn")
+    for size in sizes:
+        corpus_len = size or len(load_dataset())
+        for mode in modes:
+            n_queries = max_queries or 16
+            if mode in MODEL_MODES and corpus_len * n_queries > max_pairs:
+                print(f"[SKIP] {mode} @ {corpus_len}: {corpus_len * n_queries} pairs > --max-pairs {max_pairs}")
+                continue
+            if isolate:
+                # a fresh process per cell, so peak RSS belongs to that mode alone
+                with ctx.Pool(1) as pool:
+                    row = pool.apply(_run_isolated, ((mode, size, max_queries),))
+            else:
+                row = run_one(mode, size, max_queries)
+            rows.append(row)
+            print(format_row(row))
+    return rows
+
+
+def format_row(row: Dict) -> str:
+    return (
+        f"{row['mode']:>14} n={row['size']:>6} "
+        f"p50={row['latency_p50_ms']:8.1f}ms p95={row['latency_p95_ms']:8.1f}ms p99={row['latency_p99_ms']:8.1f}ms "
+        f"docs/s={row['docs_per_s']:9.0f} rss={row['peak_rss_mb']:7.0f}MB "
+        f"P@k={row['p_at_k']:.3f} MRR={row['mrr']:.3f} nDCG={row['ndcg']:.3f}"
+    )
+
+
+def compare_to_baseline(rows: List[Dict], baseline: List[Dict]) -> List[str]:
+    base = {(r["mode"], r["size"]): r for r in baseline}
+    regressions = []
+    for row in rows:
+        ref = base.get((row["mode"], row["size"]))
+        if ref is None:
+            continue
+        for metric, (direction, tol) in REGRESSION_RULES.items():
+            new, old = row[metric], ref[metric]
+            relative = metric not in ("p_at_k", "mrr", "ndcg")
+            limit = tol * abs(old) if relative else tol
+            worse = (new - old) if direction == "lower" else (old - new)
+            if worse > limit:
+                regressions.append(f"{row['mode']} @ {row['size']}: {metric} {old:.3f} -> {new:.3f}")
+    return regressions
+
+
+def parse_sizes(raw: str) -> List[Optional[int]]:
+    return [None if s.strip() == "fixture" else int(s) for s in raw.split(",") if s.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="openalex,bm25,bi_encoder,hybrid,cascade,cross_encoder")
+    parser.add_argument("--sizes", default="fixture,1000,10000,100000",
+                        help="comma separated corpus sizes; 'fixture' is the unscaled fixture")
+    parser.add_argument("--max-queries", type=int, default=None, help="cap query cases per cell")
+    parser.add_argument("--max-pairs", type=int, default=200_000, help="skip model-backed modes above this many (work, query) pairs")
+    parser.add_argument("--isolate", action="store_true", help="run every cell in its own process")
+    parser.add_argument("--out", type=Path, default=None, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare against this report")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    known = ranking_modes()
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in known]
+    if unknown:
+        parser.error(f"unknown modes: {unknown}; choose from {sorted(known)}")
+
+    rows = run_benchmark(modes, parse_sizes(args.sizes), args.max_queries, args.max_pairs, args.isolate)
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": rows}
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[OK] wrote report to {args.out}")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[OK] saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare_to_baseline(rows, baseline)
+        if regressions:
+            print(f"[REGRESSION] {len(regressions)} metric(s) worse than baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("[OK] no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
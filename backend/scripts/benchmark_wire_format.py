@@ -0,0 +1,66 @@
+"""
+Payload size and server-side parse time of the rerank request encodings.
+
+For growing candidate sets (synthetic copies of the Birkan fixture) it encodes
+one RerankOnlyPayload as JSON, msgpack, Arrow IPC and id-only JSON, then times
+what the endpoint does with the body: decode + RerankOnlyPayload validation.
+No model is loaded.
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_wire_format --sizes 20,200,2000 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, List, Optional
+
+from .rerank_eval import build_query, load_dataset, scale_corpus, to_summary
+from ..app.api.test_rerank import RerankOnlyPayload
+from ..app.schemas import WorksSearchResponse
+from ..app.wire import ARROW, JSON, MSGPACK, decode_payload, encode_works_arrow, msgpack, pa
+
+
+def time_ms(fn: Callable[[], object], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000.0 / repeat
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="20,200,2000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    dataset = load_dataset()
+    query = build_query(dataset[0], "kw_plus_abs")
+
+    print(f"{'works':>6} {'format':>8} {'bytes':>10} {'parse_ms':>9}")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        works = WorksSearchResponse(results=[to_summary(p) for p in scale_corpus(dataset, size)])
+        body = {"query": query.model_dump(), "works": works.model_dump()}
+
+        encodings = {JSON: json.dumps(body).encode("utf-8")}
+        if msgpack is not None:
+            encodings[MSGPACK] = msgpack.packb(body, use_bin_type=True)
+        if pa is not None:
+            encodings[ARROW] = encode_works_arrow(works, {"query": json.dumps(body["query"])})
+        ids_body = json.dumps({"query": body["query"], "work_ids": [w.id for w in works.results]}).encode("utf-8")
+
+        for media_type, raw in encodings.items():
+            parse = lambda: RerankOnlyPayload.model_validate(decode_payload(raw, media_type))
+            print(f"{size:>6} {media_type.rsplit('/', 1)[-1]:>8} {len(raw):>10} {time_ms(parse, args.repeat):>9.2f}")
+        # the id-only request still has to be hydrated from the store, which this does not time
+        parse_ids = lambda: RerankOnlyPayload.model_validate(decode_payload(ids_body, JSON))
+        print(f"{size:>6} {'ids':>8} {len(ids_body):>10} {time_ms(parse_ids, args.repeat):>9.2f}")
+
+    if msgpack is None or pa is None:
+        print("[NOTE] install msgpack / pyarrow to include the compact formats")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
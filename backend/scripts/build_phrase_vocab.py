@@ -0,0 +1,54 @@
+"""
+Build the phrase vocabulary behind the fast keyword extractor.
+
+Mines n-gram phrases (KeyBERT's tokenization: CountVectorizer, English stop
+words) that occur in at least --min-df abstracts of the Birkan fixture and,
+with --work-store, of every work the server has harvested; embeds them once
+with the bi-encoder and writes phrases.json + embeddings.npy (memory-mapped
+at request time) to the vocabulary directory. The server only uses it with
+KEYWORD_EXTRACTOR=auto or =vocabulary.
+
+Usage (from the repository root):
+    python -m backend.scripts.build_phrase_vocab --work-store
+    python -m backend.scripts.build_phrase_vocab --ngram-max 3 --min-df 3 --out /tmp/vocab
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .rerank_eval import load_dataset
+from ..app.cache import get_phrase_vocab_dir
+from ..app.config import app_settings
+from ..app.services.phrase_vocab_service import build_vocabulary, mine_phrases
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", type=Path, default=None, help="default: keyword_vocab_path or <cache>/phrase_vocab")
+    parser.add_argument("--work-store", action="store_true", help="also mine the abstracts in the work store")
+    parser.add_argument("--ngram-max", type=int, default=2)
+    parser.add_argument("--min-df", type=int, default=2)
+    parser.add_argument("--max-phrases", type=int, default=50000)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    args = parser.parse_args(argv)
+    out = args.out or Path(app_settings.keyword_vocab_path or get_phrase_vocab_dir())
+
+    texts = [p["abstract"] for p in load_dataset() if p.get("abstract")]
+    if args.work_store:
+        from ..app.work_store import get_work_store
+        texts.extend(w.abstract for w in get_work_store().iter_works() if w.abstract)
+    print(f"Mining phrases from {len(texts)} abstracts")
+
+    ngram_range = (1, args.ngram_max)
+    phrases = mine_phrases(texts, ngram_range=ngram_range, min_df=args.min_df, max_phrases=args.max_phrases)
+    started = time.perf_counter()
+    build_vocabulary(out, phrases, ngram_range, dtype=args.dtype)
+    print(f"[OK] {len(phrases)} phrases embedded in {time.perf_counter() - started:.1f}s -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+"""
+Open-loop load generator for the /api/works/* endpoints.
+
+Sends requests at a fixed target rate (request i is due at start + i / qps,
+whether or not earlier ones have finished) so a slow server shows up as
+latency instead of a lower offered load. Payloads cycle through the Birkan
+fixture queries (both variants), endpoints round-robin. Reports per endpoint
+and overall: achieved throughput, latency p50/p95/p99 (from the scheduled
+send time, so queueing in the generator counts) and errors by kind.
+
+Run it against a server whose Settings.base_url points at the recorded
+OpenAlex stand-in (scripts/openalex_standin.py) for reproducible numbers:
+    python -m backend.scripts.load_generate --qps 5 --duration 60 \\
+        --endpoints search,rerank_search_sentence_transformer
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+
+from .rerank_eval import QUERY_VARIANTS, build_query, load_dataset, pick_query_papers
+
+ENDPOINTS = [
+    "search",
+    "rerank_search_sentence_transformer",
+    "rerank_search_cross_encoder",
+    "rerank_search_hybrid",
+]
+
+
+def fixture_payloads() -> List[dict]:
+    dataset = load_dataset()
+    return [
+        build_query(qp, variant).model_dump(exclude_none=True)
+        for variant in QUERY_VARIANTS
+        for _, qp in pick_query_papers(dataset)
+    ]
+
+
+def error_kind(status: Optional[int], exc: Optional[BaseException]) -> Optional[str]:
+    if exc is not None:
+        return type(exc).__name__
+    if status is None or status < 400:
+        return None
+    return str(status)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": float("nan"), "p95": float("nan"), "p99": float("nan")}
+    arr = np.asarray(values)
+    return {f"p{q}": float(np.percentile(arr, q)) for q in (50, 95, 99)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", default="search")
+    parser.add_argument("--qps", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoint(s): {', '.join(sorted(unknown))}")
+    payloads = fixture_payloads()
+    n_requests = int(args.qps * args.duration)
+
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, Counter] = defaultdict(Counter)
+    sent: Counter = Counter()
+    local = threading.local()
+
+    def session() -> requests.Session:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def fire(endpoint: str, payload: dict, due: float) -> None:
+        status, exc = None, None
+        try:
+            resp = session().post(f"{args.base_url.rstrip('/')}/api/works/{endpoint}", json=payload, timeout=args.timeout)
+            status = resp.status_code
+        except requests.RequestException as e:
+            exc = e
+        elapsed_ms = (time.perf_counter() - due) * 1000.0
+        kind = error_kind(status, exc)
+        with lock:
+            if kind is None:
+                latencies[endpoint].append(elapsed_ms)
+            else:
+                errors[endpoint][kind] += 1
+
+    print(f"{n_requests} requests at {args.qps} qps over {args.duration:.0f}s to {', '.join(endpoints)}")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i in range(n_requests):
+            due = started + i / args.qps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            endpoint = endpoints[i % len(endpoints)]
+            sent[endpoint] += 1
+            pool.submit(fire, endpoint, payloads[i % len(payloads)], due)
+    wall_s = time.perf_counter() - started
+
+    print(f"\n{'endpoint':>36} {'sent':>6} {'ok':>6} {'ok/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>6}  errors")
+    all_ok: List[float] = []
+    total_errors: Counter = Counter()
+    for endpoint in endpoints + ["(all)"]:
+        if endpoint == "(all)":
+            ok, errs, n_sent = all_ok, total_errors, sum(sent.values())
+        else:
+            ok, errs, n_sent = latencies[endpoint], errors[endpoint], sent[endpoint]
+            all_ok.extend(ok)
+            total_errors.update(errs)
+        p = percentiles(ok)
+        err_pct = 100.0 * sum(errs.values()) / n_sent if n_sent else 0.0
+        detail = ", ".join(f"{k}: {v}" for k, v in errs.most_common()) or "-"
+        print(f"{endpoint:>36} {n_sent:>6} {len(ok):>6} {len(ok) / wall_s:>7.2f} "
+              f"{p['p50']:>9.1f} {p['p95']:>9.1f} {p['p99']:>9.1f} {err_pct:>6.1f}  {detail}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
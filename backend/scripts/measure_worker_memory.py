@@ -0,0 +1,47 @@
+"""
+Per-worker memory of a running multi-worker server.
+
+Reads /proc for the server's parent process and each of its workers and
+prints RSS, PSS, USS and shared bytes. With preload-then-fork serving
+(python -m backend.app.serve) the model weights appear as shared pages, so
+USS per worker stays well below RSS; with `uvicorn --workers` every worker's
+USS includes its own copy of the models.
+
+Usage (Linux):
+    python -m backend.scripts.measure_worker_memory --pid <server parent pid>
+"""
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional
+
+from ..app.memory import child_pids, memory_usage
+
+MB = 1024 * 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pid", type=int, required=True, help="parent process of the workers")
+    args = parser.parse_args(argv)
+
+    workers = child_pids(args.pid)
+    rows = [("parent", args.pid)] + [(f"worker {i}", pid) for i, pid in enumerate(workers)]
+    print(f"{'process':>10} {'pid':>8} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'shared MB':>10}")
+    total_uss = 0
+    for name, pid in rows:
+        usage = memory_usage(pid)
+        if not usage:
+            print(f"{name:>10} {pid:>8}  (no /proc data)")
+            continue
+        total_uss += usage["uss"]
+        print(f"{name:>10} {pid:>8} {usage['rss'] / MB:>9.1f} {usage['pss'] / MB:>9.1f} {usage['uss'] / MB:>9.1f} {usage['shared'] / MB:>10.1f}")
+
+    if workers:
+        worker_uss = [memory_usage(pid).get("uss", 0) for pid in workers]
+        print(f"\nmean worker USS: {sum(worker_uss) / len(worker_uss) / MB:.1f} MB, total USS: {total_uss / MB:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+"""
+Local stand-in for the OpenAlex API, for reproducible load tests.
+
+  record  forwards every GET to the real API (--upstream) and saves the
+          response under --dir, one JSON file per (path, query)
+  replay  answers from the saved responses only; unknown requests get 404
+          (or an empty result page with --empty-on-miss)
+
+Both modes can add latency (--latency-ms +- --jitter-ms) and answer a share
+of requests (--rate-429) with 429 + Retry-After, to exercise the client's
+rate limiting. Point the backend at it through Settings.base_url:
+
+    python -m backend.scripts.openalex_standin --mode record --dir /tmp/openalex-rec
+    python -m backend.scripts.openalex_standin --mode replay --dir /tmp/openalex-rec --latency-ms 80 --rate-429 0.02
+    BASE_URL=http://127.0.0.1:8100 python -m backend.app.serve --workers 2
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# parameters that do not change the answer
+IGNORED_PARAMS = {"mailto"}
+EMPTY_PAGE = {"meta": {"count": 0, "page": 1, "per_page": 0}, "results": []}
+
+
+def recording_key(path: str, query: str) -> str:
+    params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in IGNORED_PARAMS)
+    canonical = json.dumps([path.rstrip("/"), params])
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class Recordings:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, path: str, query: str) -> Optional[Tuple[int, bytes]]:
+        f = self._file(recording_key(path, query))
+        if not f.exists():
+            return None
+        saved = json.loads(f.read_text(encoding="utf-8"))
+        return saved["status"], saved["body"].encode("utf-8")
+
+    def put(self, path: str, query: str, status: int, body: bytes) -> None:
+        saved = {"path": path, "query": query, "status": status, "body": body.decode("utf-8")}
+        tmp = self._file(recording_key(path, query)).with_suffix(".tmp")
+        tmp.write_text(json.dumps(saved), encoding="utf-8")
+        tmp.replace(self._file(recording_key(path, query)))
+
+
+class StandinStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counts = {"served": 0, "recorded": 0, "misses": 0, "injected_429": 0}
+
+    def bump(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+
+def make_handler(
+    recordings: Recordings,
+    mode: str,
+    upstream: str,
+    latency_ms: float,
+    jitter_ms: float,
+    rate_429: float,
+    retry_after_s: int,
+    empty_on_miss: bool,
+    stats: StandinStats,
+):
+    session = None
+    if mode == "record":
+        import requests
+        session = requests.Session()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: bytes, headers: Optional[dict] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if latency_ms or jitter_ms:
+                time.sleep(max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000.0)
+            if rate_429 and random.random() < rate_429:
+                stats.bump("injected_429")
+                self._send(429, b'{"error": "rate limited (injected)"}', {"Retry-After": str(retry_after_s)})
+                return
+
+            parts = urlsplit(self.path)
+            saved = recordings.get(parts.path, parts.query)
+            if saved is None and mode == "record":
+                resp = session.get(upstream.rstrip("/") + self.path, timeout=30)
+                saved = (resp.status_code, resp.content)
+                if resp.ok:
+                    recordings.put(parts.path, parts.query, resp.status_code, resp.content)
+                    stats.bump("recorded")
+            if saved is None:
+                stats.bump("misses")
+                if empty_on_miss:
+                    self._send(200, json.dumps(EMPTY_PAGE).encode("utf-8"))
+                else:
+                    self._send(404, b'{"error": "no recording for this request"}')
+                return
+            stats.bump("served")
+            self._send(*saved)
+
+        def log_message(self, fmt: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def make_server(
+    directory: Path,
+    mode: str = "replay",
+    host: str = "127.0.0.1",
+    port: int = 8100,
+    upstream: str = "https://api.openalex.org",
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    rate_429: float = 0.0,
+    retry_after_s: int = 1,
+    empty_on_miss: bool = False,
+) -> Tuple[ThreadingHTTPServer, StandinStats]:
+    stats = StandinStats()
+    handler = make_handler(
+        Recordings(directory), mode, upstream, latency_ms, jitter_ms, rate_429, retry_after_s, empty_on_miss, stats
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--dir", type=Path, required=True, help="recordings directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--upstream", default="https://api.openalex.org")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of injected 429s, seconds")
+    parser.add_argument("--empty-on-miss", action="store_true")
+    args = parser.parse_args(argv)
+
+    server, stats = make_server(
+        args.dir, args.mode, args.host, args.port, args.upstream,
+        args.latency_ms, args.jitter_ms, args.rate_429, args.retry_after, args.empty_on_miss,
+    )
+    print(f"OpenAlex stand-in ({args.mode}) on http://{args.host}:{args.port}, recordings in {args.dir}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"stats: {stats.counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
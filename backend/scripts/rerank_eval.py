@@ -0,0 +1,210 @@
+"""
+Shared pieces for the offline rerank evaluation scripts: the Birkan fixture,
+its query cases (groups and query papers; app/tests/test_rerank_endpoints.py
+imports them from here, so both always agree), synthetic scaled-up corpora,
+the ranking modes and the quality metrics.
+
+Run the scripts from the repository root, e.g.
+    python -m backend.scripts.benchmark_rerank
+"""
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..app.schemas import WorkSummary, WorksSearchRequest, WorksSearchResponse
+
+__all__ = [
+    "GROUPS", "QUERY_VARIANTS", "FIXTURE_PATH",
+    "load_dataset", "paper_group", "pick_two_queries_per_group", "query_to_keywords_list",
+    "pick_query_papers", "build_query", "to_summary",
+    "source_id", "scale_corpus", "search_space_for", "ranking_modes",
+    "relevance_flags", "precision_at_k", "reciprocal_rank", "ndcg_at_k",
+]
+
+ROOT = Path(__file__).resolve().parents[1]  # backend/
+FIXTURE_PATH = ROOT / "app" / "tests" / "fixtures" / "birkan_papers.json"
+
+
+# --------- fixture ----------------------------------------------------------
+def load_dataset(path: Path = FIXTURE_PATH) -> List[dict]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for p in data:
+        p.setdefault("title", "")
+        p.setdefault("abstract", "")
+        p.setdefault("keywords", "")
+        p.setdefault("query", "")
+        p.setdefault("index", 10**9)
+    return data
+
+
+# --------- query cases ------------------------------------------------------
+# every paper belongs to exactly one group, by its index range
+QUERY_VARIANTS = ["kw_only", "kw_plus_abs"]
+
+GROUPS: List[Tuple[str, int, int]] = [
+    ("G1_01_07", 1, 7),
+    ("G2_08_14", 8, 14),
+    ("G3_15_20", 15, 20),
+    ("G4_21_30", 21, 30),
+]
+
+
+def paper_group(p: dict) -> str:
+    idx = p.get("index")
+    if not isinstance(idx, int):
+        pid = str(p.get("id", ""))
+        m = re.search(r"(\d+)$", pid)
+        idx = int(m.group(1)) if m else 10**9
+
+    for gname, lo, hi in GROUPS:
+        if lo <= idx <= hi:
+            return gname
+
+    raise AssertionError(f"Paper index out of supported ranges: id={p.get('id')} index={idx}")
+
+
+def pick_two_queries_per_group(dataset: List[dict]) -> Dict[str, List[dict]]:
+    grouped: Dict[str, List[dict]] = {g[0]: [] for g in GROUPS}
+
+    for p in dataset:
+        grouped[paper_group(p)].append(p)
+
+    for g in grouped:
+        grouped[g] = sorted(grouped[g], key=lambda x: (x.get("index", 10**9), x.get("title", "")))
+
+    missing = [g for g, arr in grouped.items() if len(arr) < 2]
+    if missing:
+        counts = {g: len(grouped[g]) for g in grouped}
+        raise AssertionError(f"Some groups have <2 papers: {missing}. Counts={counts}")
+
+    return {g: grouped[g][:2] for g in grouped}
+
+
+def query_to_keywords_list(q: str) -> List[str]:
+    # "MC + Nanonet + Channel Modeling (7)" -> ["MC", "Nanonet", "Channel Modeling"]
+    q = (q or "").strip()
+    if not q:
+        return []
+    q = re.sub(r"\(\s*\d+\s*\)\s*$", "", q).strip()
+    parts = [p.strip() for p in q.split("+")]
+    return [p for p in parts if p]
+
+
+def pick_query_papers(dataset: List[dict]) -> List[Tuple[str, dict]]:
+    # (group, query paper) for the two query papers per group the endpoint tests use
+    return [(g, p) for g, papers in pick_two_queries_per_group(dataset).items() for p in papers]
+
+
+def build_query(qp: dict, variant: str) -> WorksSearchRequest:
+    abstracts: List[str] = []
+    if variant == "kw_plus_abs":
+        abs_text = (qp.get("abstract") or "").strip()
+        abstracts = [abs_text] if abs_text else []
+    elif variant != "kw_only":
+        raise ValueError(f"Unknown variant: {variant}")
+    return WorksSearchRequest(keywords=query_to_keywords_list(qp.get("query", "")), abstracts=abstracts)
+
+
+def to_summary(p: dict) -> WorkSummary:
+    return WorkSummary(
+        id=p["id"],
+        title=p.get("title") or "",
+        keywords=p.get("keywords") or "",
+        abstract=p.get("abstract") or "",
+        publication_year=p.get("year") or p.get("publication_year"),
+    )
+
+
+# --------- synthetic corpora ------------------------------------------------
+def source_id(work_id: str) -> str:
+    """Fixture id a (possibly synthetic) work was derived from."""
+    return work_id.split("#", 1)[0]
+
+
+def scale_corpus(dataset: List[dict], size: int, seed: int = 13) -> List[dict]:
+    """
+    Grow the fixture to `size` works by sampling papers and perturbing their
+    abstracts (sentence shuffle + drop). Synthetic ids are "<fixture id>#<n>",
+    so every work keeps its source paper's group.
+    """
+    if size <= len(dataset):
+        return list(dataset[:size])
+
+    rng = random.Random(seed)
+    corpus = list(dataset)
+    n = 0
+    while len(corpus) < size:
+        src = rng.choice(dataset)
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+", src.get("abstract") or "") if s]
+        rng.shuffle(sentences)
+        keep = sentences[: max(1, int(len(sentences) * rng.uniform(0.5, 1.0)))]
+        n += 1
+        corpus.append({
+            **src,
+            "id": f"{src['id']}#{n}",
+            "abstract": " ".join(keep),
+        })
+    return corpus
+
+
+def search_space_for(query_id: str, corpus: List[dict]) -> WorksSearchResponse:
+    # the query paper and all of its synthetic copies are left out of the search space
+    return WorksSearchResponse(results=[
+        to_summary(p) for p in corpus if source_id(p["id"]) != query_id
+    ])
+
+
+# --------- ranking modes ----------------------------------------------------
+def ranking_modes() -> Dict[str, Callable[[WorksSearchRequest, WorksSearchResponse], WorksSearchResponse]]:
+    from ..app.services.semantic_rerank_service import (
+        rerank_works_by_query_sentence_transformer,
+        rerank_works_by_query_cross_encoder,
+        sort_works_by_scores,
+    )
+    from ..app.services.hybrid_rerank_service import rerank_works_by_query_hybrid, score_works_bm25
+    from ..app.services.adaptive_rerank_service import rerank_works_by_query_cascade
+
+    def bm25(q, works):
+        scores = score_works_bm25(q, works)
+        return sort_works_by_scores(works, scores) if scores else works
+
+    return {
+        "openalex": lambda q, works: works,
+        "bm25": bm25,
+        "bi_encoder": rerank_works_by_query_sentence_transformer,
+        "hybrid": rerank_works_by_query_hybrid,
+        "cascade": lambda q, works: rerank_works_by_query_cascade(q, works, top_k=20),
+        "cross_encoder": rerank_works_by_query_cross_encoder,
+    }
+
+
+# --------- quality metrics --------------------------------------------------
+def relevance_flags(ranked_ids: List[str], group: str, groups_by_id: Dict[str, str]) -> List[bool]:
+    return [groups_by_id.get(source_id(wid)) == group for wid in ranked_ids]
+
+
+def precision_at_k(flags: List[bool], k: int) -> float:
+    if k <= 0:
+        return 0.0
+    return sum(flags[:k]) / k
+
+
+def reciprocal_rank(flags: List[bool]) -> float:
+    for i, rel in enumerate(flags):
+        if rel:
+            return 1.0 / (i + 1)
+    return 0.0
+
+
+def ndcg_at_k(flags: List[bool], k: int, n_relevant: Optional[int] = None) -> float:
+    if k <= 0:
+        return 0.0
+    dcg = sum(1.0 / math.log2(i + 2) for i, rel in enumerate(flags[:k]) if rel)
+    ideal_hits = min(k, sum(flags) if n_relevant is None else n_relevant)
+    idcg = sum(1.0 / math.log2(i + 2) for i in range(ideal_hits))
+    return dcg / idcg if idcg > 0 else 0.0
@@ -0,0 +1,233 @@
+"""
+Batched evaluation of the rerank test matrix.
+
+Computes the same rows as app/tests/test_rerank_endpoints.py (and the same CSV
+columns conftest.py writes), without going through HTTP:
+  - bi-encoder: the fixture corpus and all query strings are embedded once,
+    and every query/variant/group case is scored from one similarity matrix
+  - cross-encoder: every distinct (query, document) pair is predicted once,
+    optionally split across several worker processes (--workers)
+  - hybrid: fused per case over its own search space (the fusion normalizes
+    per candidate set); embeddings come from the work store after the first case
+The query paper is masked out of each case, as the tests drop it from the search space.
+The CSV goes to scripts/rerank_eval_results.csv by default, so the file the
+test suite writes is left alone.
+
+Usage (from the repository root):
+    python -m backend.scripts.run_rerank_eval
+    python -m backend.scripts.run_rerank_eval --models cross_encoder --workers 4 --out /tmp/rerank.csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import multiprocessing as mp
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .rerank_eval import (
+    GROUPS,
+    QUERY_VARIANTS,
+    build_query,
+    load_dataset,
+    paper_group,
+    pick_query_papers,
+    to_summary,
+)
+from ..app.schemas import WorksSearchResponse
+from ..app.services.semantic_rerank_service import (
+    build_cross_encoder_queries,
+    build_query_space_representation,
+    build_search_space_representation,
+)
+
+P_THRESHOLD = 0.6
+CSV_COLUMNS = ["model", "variant", "group", "query_id", "k", "hit_in_top_k", "missing_in_top_k", "p_at_k", "threshold", "pass"]
+DEFAULT_OUT = Path(__file__).resolve().parent / "rerank_eval_results.csv"
+
+# (group, query paper, variant)
+Case = Tuple[str, dict, str]
+
+
+# --------- bi-encoder -------------------------------------------------------
+def score_cases_sentence_transformer(cases: List[Case], doc_ids: List[str], corpus: WorksSearchResponse) -> np.ndarray:
+    """
+    (n_cases, n_docs) mean cosine similarity, from one encode of the corpus and
+    one encode of every query string.
+    """
+    from ..app.services.semantic_rerank_service import get_sentence_transformer
+
+    model = get_sentence_transformer()
+    search_space = build_search_space_representation(corpus)
+    doc_emb = model.encode([search_space[i] for i in doc_ids], convert_to_numpy=True, normalize_embeddings=True)
+
+    query_texts: List[str] = []
+    owners: List[int] = []
+    for c, (_, qp, variant) in enumerate(cases):
+        for text in build_query_space_representation(build_query(qp, variant)):
+            query_texts.append(text)
+            owners.append(c)
+    query_emb = model.encode(query_texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    sims = query_emb @ doc_emb.T                      # (n_query_texts, n_docs)
+    return _mean_by_owner(sims, np.asarray(owners), len(cases))
+
+
+# --------- cross-encoder ----------------------------------------------------
+_worker_model = None
+
+
+def _init_cross_encoder_worker(torch_threads: int) -> None:
+    global _worker_model
+    import torch
+    from ..app.services.semantic_rerank_service import get_cross_encoder
+
+    torch.set_num_threads(torch_threads)
+    _worker_model = get_cross_encoder()
+
+
+def _predict_chunk(pairs: List[List[str]]) -> np.ndarray:
+    return np.asarray(_worker_model.predict(pairs))
+
+
+def predict_pairs(pairs: List[List[str]], workers: int) -> np.ndarray:
+    if workers <= 1:
+        from ..app.services.semantic_rerank_service import get_cross_encoder
+        return np.asarray(get_cross_encoder().predict(pairs))
+
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    size = -(-len(pairs) // workers)
+    chunks = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_cross_encoder_worker, initargs=(torch_threads,)) as pool:
+        return np.concatenate(pool.map(_predict_chunk, chunks))
+
+
+def score_cases_cross_encoder(cases: List[Case], doc_ids: List[str], corpus: WorksSearchResponse, workers: int) -> np.ndarray:
+    """
+    (n_cases, n_docs) mean cross-encoder score; each distinct query string is paired
+    with each document once, even when several cases share it.
+    """
+    docs_by_id = {w.id: f"{w.title or ''} {w.abstract or ''}".strip() for w in corpus.results}
+    doc_texts = [docs_by_id[i] for i in doc_ids]
+
+    query_rows: Dict[str, int] = {}
+    owners: List[Tuple[int, int]] = []
+    for c, (_, qp, variant) in enumerate(cases):
+        for text in build_cross_encoder_queries(build_query(qp, variant)):
+            row = query_rows.setdefault(text, len(query_rows))
+            owners.append((c, row))
+
+    pairs = [[q, d] for q in query_rows for d in doc_texts]
+    scores = predict_pairs(pairs, workers).reshape(len(query_rows), len(doc_texts))
+
+    case_rows = np.asarray([row for _, row in owners])
+    return _mean_by_owner(scores[case_rows], np.asarray([c for c, _ in owners]), len(cases))
+
+
+# --------- hybrid -----------------------------------------------------------
+def score_cases_hybrid(cases: List[Case], doc_ids: List[str], corpus: WorksSearchResponse) -> np.ndarray:
+    """
+    (n_cases, n_docs) fused hybrid score, each case over the corpus without its
+    query paper. A case with no lexical match keeps the corpus order, as the route does.
+    """
+    from ..app.services.hybrid_rerank_service import score_works_hybrid
+
+    col = {d: i for i, d in enumerate(doc_ids)}
+    scores = np.tile(-np.arange(len(doc_ids), dtype=np.float64), (len(cases), 1))
+    for c, (_, qp, variant) in enumerate(cases):
+        space = WorksSearchResponse(results=[w for w in corpus.results if w.id != qp["id"]])
+        fused = score_works_hybrid(build_query(qp, variant), space)
+        if fused:
+            scores[c] = -np.inf
+            for work_id, score in fused.items():
+                scores[c, col[work_id]] = score
+    return scores
+
+
+# --------- shared -----------------------------------------------------------
+def _mean_by_owner(rows: np.ndarray, owners: np.ndarray, n_cases: int) -> np.ndarray:
+    sums = np.zeros((n_cases, rows.shape[1]), dtype=np.float64)
+    np.add.at(sums, owners, rows)
+    counts = np.bincount(owners, minlength=n_cases).astype(np.float64)
+    counts[counts == 0] = 1.0
+    return sums / counts[:, None]
+
+
+def evaluate(model_name: str, scores: np.ndarray, cases: List[Case], doc_ids: List[str], dataset: List[dict]) -> List[Dict]:
+    groups = np.asarray([paper_group(p) for p in dataset])
+    group_counts = {g[0]: int((groups == g[0]).sum()) for g in GROUPS}
+    doc_index = {d: i for i, d in enumerate(doc_ids)}
+
+    rows = []
+    for c, (group, qp, variant) in enumerate(cases):
+        case_scores = scores[c].copy()
+        case_scores[doc_index[qp["id"]]] = -np.inf     # query paper is not in the search space
+        order = np.argsort(-case_scores, kind="stable")[:-1]
+
+        k = min(group_counts[group] - 1, len(order))
+        top = order[:k]
+        hit = int((groups[top] == group).sum())
+        pk = hit / k if k > 0 else 0.0
+
+        relevant = {doc_ids[i] for i in np.flatnonzero(groups == group)} - {qp["id"]}
+        missing = sorted(relevant - {doc_ids[i] for i in top})
+
+        rows.append({
+            "model": model_name,
+            "variant": variant,
+            "group": group,
+            "query_id": qp["id"],
+            "k": k,
+            "hit_in_top_k": hit,
+            "missing_in_top_k": ";".join(missing),
+            "p_at_k": pk,
+            "threshold": P_THRESHOLD,
+            "pass": pk >= P_THRESHOLD,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", default="sentence_transformer,cross_encoder,hybrid")
+    parser.add_argument("--workers", type=int, default=1, help="processes for cross-encoder prediction")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    args = parser.parse_args(argv)
+
+    dataset = load_dataset()
+    corpus = WorksSearchResponse(results=[to_summary(p) for p in dataset])
+    doc_ids = [w.id for w in corpus.results]
+    cases: List[Case] = [(g, qp, v) for v in QUERY_VARIANTS for g, qp in pick_query_papers(dataset)]
+
+    rows: List[Dict] = []
+    for model_name in [m.strip() for m in args.models.split(",") if m.strip()]:
+        started = time.perf_counter()
+        if model_name == "sentence_transformer":
+            scores = score_cases_sentence_transformer(cases, doc_ids, corpus)
+        elif model_name == "cross_encoder":
+            scores = score_cases_cross_encoder(cases, doc_ids, corpus, args.workers)
+        elif model_name == "hybrid":
+            scores = score_cases_hybrid(cases, doc_ids, corpus)
+        else:
+            parser.error(f"unknown model: {model_name}")
+        model_rows = evaluate(model_name, scores, cases, doc_ids, dataset)
+        rows.extend(model_rows)
+        passed = sum(r["pass"] for r in model_rows)
+        print(f"{model_name}: {passed}/{len(model_rows)} cases pass, {time.perf_counter() - started:.1f}s")
+
+    with args.out.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        w.writeheader()
+        for r in rows:
+            w.writerow(r)
+    print(f"[OK] Wrote rerank results CSV to: {args.out}")
+    return 0 if all(r["pass"] for r in rows) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())